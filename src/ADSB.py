@@ -1,7 +1,102 @@
+import bisect
 import math
 
+import numpy as np
+
+import Kinematics
 import utils
 
+# Mode S CRC-24 generator polynomial (x^24 term implied)
+CRC_GENERATOR = 0xFFF409
+# [m], length of a CPR latitude zone (360 NM). Local decoding picks the solution within half a zone of the reference,
+# an aircraft farther away is decoded a whole zone off
+CPR_ZONE_LENGTH = 666720
+# [m/s], fastest ground speed of a tracked aircraft, bounds its distance from its last decoded position
+MAX_AIRCRAFT_SPEED = 450
+# [m], resolution of the CPR coordinates and the distance the aircraft moved before the last fix was sent
+LOCAL_DECODING_MARGIN = 1000
+
+
+def _crcTable():
+    table = []
+    for byte in range(256):
+        crc = byte << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= 0x1000000 | CRC_GENERATOR
+        table.append(crc)
+    return table
+
+
+CRC_TABLE = _crcTable()
+CRC_TABLE_NP = np.array(CRC_TABLE, dtype=np.uint32)
+
+
+# number of longitude zones at a latitude, trigonometric definition
+def _trigonometricNL(lat):
+    nZ = 15
+    if lat == 0:
+        return 59
+    elif lat == 87 or lat == -87:
+        return 2
+    elif lat > 87 or lat < -87:
+        return 1
+    else:
+        return math.floor(2 * math.pi / (
+            math.acos(1 - ((1 - math.cos(math.pi / (2 * nZ))) / (pow(math.cos(math.pi / 180 * lat), 2))))))
+
+
+# absolute latitudes at which the number of longitude zones drops from 59 to 58, 58 to 57, ... 2 to 1
+def _nlTransitions():
+    nZ = 15
+    transitions = []
+    for nl in range(59, 2, -1):
+        lat = math.degrees(math.acos(math.sqrt((1 - math.cos(math.pi / (2 * nZ))) / (1 - math.cos(2 * math.pi / nl)))))
+        # move to the first float where the trigonometric definition gives less zones
+        while _trigonometricNL(lat) < nl:
+            lat = math.nextafter(lat, 0)
+        while _trigonometricNL(lat) >= nl:
+            lat = math.nextafter(lat, 90)
+        transitions.append(lat)
+    transitions.append(math.nextafter(87, 90))
+    return transitions
+
+
+NL_TRANSITIONS = _nlTransitions()
+NL_TRANSITIONS_NP = np.array(NL_TRANSITIONS)
+
+
+# number of longitude zones at a latitude
+def calculateNL(lat):
+    return 59 - bisect.bisect_right(NL_TRANSITIONS, abs(lat))
+
+
+# number of longitude zones for a numpy array of latitudes
+def calculateNLArray(lats):
+    return 59 - np.searchsorted(NL_TRANSITIONS_NP, np.abs(lats), side='right')
+
+
+# byte-wise table-driven CRC-24 of an integer with numBytes bytes (default: the 88 data bits of a frame)
+# with the data bits of a frame it returns the parity, with the whole 112-bit frame the remainder (0 if valid)
+def calculateCRC24(data, numBytes=11):
+    crc = 0
+    for byte in data.to_bytes(numBytes, 'big'):
+        crc = ((crc << 8) & 0xFFFFFF) ^ CRC_TABLE[(crc >> 16) ^ byte]
+    return crc
+
+
+# CRC-24 remainder of many frames at once
+# frames: uint8 array of shape (N, 14) (bytes) or (N, 112) (bits); returns uint32 array, 0 for valid frames
+def calculateCRC24Batch(frames):
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.shape[1] == 112:
+        frames = np.packbits(frames, axis=1)
+    crc = np.zeros(frames.shape[0], dtype=np.uint32)
+    for column in frames.T:
+        crc = ((crc << 8) & 0xFFFFFF) ^ CRC_TABLE_NP[(crc >> 16) ^ column]
+    return crc
+
 
 # can encode, decode and print the message part of an ADSB position transmission
 class ADSB_positional_msg:
@@ -23,38 +118,32 @@ class ADSB_positional_msg:
         self.decodedLat = 0
         self.decodedLon = 0
         self.latLonDecoded = False
+        self.decodedLocally = False
 
     def calculateNL(self, lat):
-        nZ = 15
-        if lat == 0:
-            return 59
-        elif lat == 87 or lat == -87:
-            return 2
-        elif lat > 87 or lat < -87:
-            return 1
-        else:
-            return math.floor(2 * math.pi / (
-                math.acos(1 - ((1 - math.cos(math.pi / (2 * nZ))) / (pow(math.cos(math.pi / 180 * lat), 2))))))
+        return calculateNL(lat)
 
     def decodeMessage(self, msg):
-        msgBin = bin(int(msg, 16))[2:]
-        while (len(msgBin) < 56):
-            msgBin = "0" + msgBin
+        return self.decodeFields(int(msg, 16))
+
+    # decode the 56 bit message field given as integer
+    def decodeFields(self, me):
         # determine wether altitude is barometric or from GNSS
-        self.typeCode = int(msgBin[:5], 2)
+        self.typeCode = me >> 51
 
         # determine surveillance status
-        self.surveillanceStatus = int(msgBin[5:7], 2)
+        self.surveillanceStatus = (me >> 49) & 0x3
 
         # single antenna flag
-        self.singleAntennaFlag = int(msgBin[7], 2)
+        self.singleAntennaFlag = (me >> 48) & 0x1
 
-        # determine altitude
-        altiBin = msgBin[8:20]
-        if altiBin[7] == '1':
-            self.altitude = 25 * (int(altiBin[:7] + altiBin[8:], 2)) - 1000
+        # determine altitude, bit 4 of the altitude field is the Q-bit
+        altitudeBits = (me >> 36) & 0xFFF
+        altitudeValue = ((altitudeBits >> 5) << 4) | (altitudeBits & 0xF)
+        if altitudeBits & 0x10:
+            self.altitude = 25 * altitudeValue - 1000
         else:
-            self.altitude = 100 * (int(altiBin[:7] + altiBin[8:], 2)) - 1000
+            self.altitude = 100 * altitudeValue - 1000
         # convert altitude to m
         self.altitude /= 3.281
 
@@ -65,52 +154,27 @@ class ADSB_positional_msg:
             self.altitudeSource = "GNSS"
 
         # timeflag
-        self.time = int(msgBin[20], 2)
+        self.time = (me >> 35) & 0x1
 
         # CPR format
-        self.cprFormat = int(msgBin[21], 2)
+        self.cprFormat = (me >> 34) & 0x1
 
         # latitude and longitude (CPR format)
-        self.latCPR = int(msgBin[22:39], 2)
-        self.lonCPR = int(msgBin[39:], 2)
+        self.latCPR = (me >> 17) & 0x1FFFF
+        self.lonCPR = me & 0x1FFFF
 
         return self
 
-    # determine the real position of plane with given ICAO based on old messages
-    def determineTruePosition(self, ICAOaddress, messages, noPrint=False):
-        # first, determine if latest message was even or odd
-        latCPReven = 0
-        latCPRodd = 0
-        lonCPReven = 0
-        lonCPRodd = 0
-        Teven = 0
-        Todd = 0
-        messageFound = False
-        # find last messages that was odd if current one is even and vice versa
-        if (messages[-1].cprFormat == 0):
-            latCPReven = messages[-1].latCPR
-            lonCPReven = messages[-1].lonCPR
-            Teven = messages[-1].time
-        else:
-            latCPRodd = messages[-1].latCPR
-            lonCPRodd = messages[-1].lonCPR
-            Todd = messages[-1].time
-        for msg in reversed(messages):
-            if msg.ICAOaddress == ICAOaddress and msg.cprFormat != messages[-1].cprFormat:
-                if (messages[-1].cprFormat == 0):
-                    latCPRodd = msg.latCPR
-                    lonCPRodd = msg.lonCPR
-                    Todd = msg.time
-                else:
-                    latCPReven = msg.latCPR
-                    lonCPReven = msg.lonCPR
-                    Teven = msg.time
-                messageFound = True
-                break
-        if (messageFound == False):
-            if (noPrint == False):
-                print("Not enough data available to determine accurate position.")
-            return
+    # determine the real position of the plane from the latest even and odd message and their receive times.
+    # Teven, Todd: receive times [s], the position of the later message is returned. The messages' own time flag
+    # bit (UTC synchronization) cannot order them.
+    # The odd longitude zones are NL(lat) - 1 as in the CPR specification, not NL(lat - 1) which gives a wrong
+    # longitude for odd messages wherever the two differ
+    def determineTruePosition(self, evenMSG, oddMSG, Teven, Todd, noPrint=False):
+        latCPReven = evenMSG.latCPR
+        lonCPReven = evenMSG.lonCPR
+        latCPRodd = oddMSG.latCPR
+        lonCPRodd = oddMSG.lonCPR
 
         # calculate actual lat and lon
         nZ = 15
@@ -138,8 +202,8 @@ class ADSB_positional_msg:
         nodd = 1
         if self.calculateNL(latitude) > 1:
             neven = self.calculateNL(latitude)
-        if self.calculateNL(latitude - 1) > 1:
-            nodd = self.calculateNL(latitude - 1)
+        if self.calculateNL(latitude) - 1 > 1:
+            nodd = self.calculateNL(latitude) - 1
         dLoneven = 360 / neven
         dLonodd = 360 / nodd
         lonEven = dLoneven * (m % neven + lonCPReven / pow(2, 17))
@@ -159,8 +223,45 @@ class ADSB_positional_msg:
         if (noPrint == False):
             print("Decoded Longitude: ", longitude, "\nDecoded Latitude: ", latitude)
 
+    # determine the position from this message alone, using a reference position within 180NM (half a latitude zone)
+    # maxDistance: [m] the position is discarded if it is farther from the reference, None to keep every position
+    def determineLocalPosition(self, refLat, refLon, noPrint=False, maxDistance=None):
+        latCPR = self.latCPR / pow(2, 17)
+        lonCPR = self.lonCPR / pow(2, 17)
+
+        dLat = 360 / (60 - self.cprFormat)
+        j = math.floor(refLat / dLat) + math.floor(0.5 + (refLat % dLat) / dLat - latCPR)
+        latitude = dLat * (j + latCPR)
+
+        numLongitudes = self.calculateNL(latitude) - self.cprFormat
+        if numLongitudes < 1:
+            numLongitudes = 1
+        dLon = 360 / numLongitudes
+        m = math.floor(refLon / dLon) + math.floor(0.5 + (refLon % dLon) / dLon - lonCPR)
+        longitude = dLon * (m + lonCPR)
+        if longitude >= 180:
+            longitude = longitude - 360
+        if maxDistance is not None and Kinematics.EARTH_RADIUS * Kinematics.centralAngle(
+                (refLon, refLat), (longitude, latitude)) > maxDistance:
+            if (noPrint == False):
+                print("Locally decoded position too far from the reference; Position discarded")
+            return
+
+        self.decodedLat = latitude
+        self.decodedLon = longitude
+        self.latLonDecoded = True
+        self.decodedLocally = True
+        if (noPrint == False):
+            print("Locally decoded Longitude: ", longitude, "\nLocally decoded Latitude: ", latitude)
+
     def encodeMessage(self, surveillanceStatus, singleAntennaFlag, altitude, latitude, longitude, time, typeCode,
                       cprFormat):
+        return hex(self.encodeFields(surveillanceStatus, singleAntennaFlag, altitude, latitude, longitude, time,
+                                     typeCode, cprFormat))
+
+    # encode the 56 bit message field as integer
+    def encodeFields(self, surveillanceStatus, singleAntennaFlag, altitude, latitude, longitude, time, typeCode,
+                     cprFormat):
         self.surveillanceStatus = surveillanceStatus
         self.singleAntennaFlag = singleAntennaFlag
         self.altitude = altitude
@@ -168,60 +269,34 @@ class ADSB_positional_msg:
         self.typeCode = typeCode
         self.cprFormat = cprFormat
 
-        # type code
-        typeCodeBits = bin(typeCode)[2:]
-        while len(typeCodeBits) < 5:
-            typeCodeBits = "0" + typeCodeBits
-
-        # surveillance status
-        surveillanceStatusBits = bin(surveillanceStatus)[2:]
-        while len(surveillanceStatusBits) < 2:
-            surveillanceStatusBits = "0" + surveillanceStatusBits
-
-        # single antenna flag is already binary, as are time and cpr formats
-
         # encode altitude
-        altitudeBits = ""
         altitudeFt = altitude * 3.281
         altitudeFt = 38000
         if altitudeFt > 50000:
-            altitudeBits = bin(int((altitudeFt + 1000.0) // 100.0))[2:]
-            while (len(altitudeBits) < 11):
-                altitudeBits = "0" + altitudeBits
-            altitudeBits = altitudeBits[0:7] + "0" + altitudeBits[8:]
+            altitudeValue = int((altitudeFt + 1000.0) // 100.0)
+            altitudeBits = ((altitudeValue >> 4) << 5) | (altitudeValue & 0xF)
         else:
-            altitudeBits = bin(int((altitudeFt + 1000.0) // 25.0))[2:]
-            while (len(altitudeBits) < 11):
-                altitudeBits = "0" + altitudeBits
-            altitudeBits = altitudeBits[0:7] + "1" + altitudeBits[7:]
+            altitudeValue = int((altitudeFt + 1000.0) // 25.0)
+            altitudeBits = ((altitudeValue >> 4) << 5) | 0x10 | (altitudeValue & 0xF)
 
         # encode latitude and longitude
         # for latitude, globe is divided in 60 equally sized zones, each zone divided in 2^17 bins and only the bins are transmitted
         dLat = 360 / (60 - cprFormat)
-        latCPR = math.floor(latitude % dLat * (1.00 / dLat) * pow(2, 17) + 0.5)
+        latCPR = math.floor(latitude % dLat * (1.00 / dLat) * pow(2, 17) + 0.5) & 0x1FFFF
         self.latCPR = latCPR
-        latCPRbits = bin(latCPR)[2:]
-        while (len(latCPRbits)) < 17:
-            latCPRbits = "0" + latCPRbits
 
         # longitude
-        if (longitude < 0):
-            longitude + 360
-
         numLongitudes = self.calculateNL(latitude) - cprFormat
         if numLongitudes < 1:
             numLongitudes = 1
 
         dLon = 360 / numLongitudes
 
-        lonCPR = math.floor(longitude % dLon * (1.00 / dLon) * pow(2, 17) + 0.5)
+        lonCPR = math.floor(longitude % dLon * (1.00 / dLon) * pow(2, 17) + 0.5) & 0x1FFFF
         self.lonCPR = lonCPR
-        lonCPRbits = bin(lonCPR)[2:]
-        while (len(lonCPRbits)) < 17:
-            lonCPRbits = "0" + lonCPRbits
 
-        return hex(int(typeCodeBits + surveillanceStatusBits + str(singleAntennaFlag) + altitudeBits + str(time) + str(
-            cprFormat) + latCPRbits + lonCPRbits, 2))
+        return (typeCode << 51) | (surveillanceStatus << 49) | (singleAntennaFlag << 48) | (altitudeBits << 36) | (
+                time << 35) | (cprFormat << 34) | (latCPR << 17) | lonCPR
 
     def printMessage(self):
         dataStr = ""
@@ -251,43 +326,35 @@ class ADSB_identification_msg:
         self.callSign = ""
 
     def decodeMessage(self, msg):
-        msgBin = bin(int(msg, 16))
-        self.typeCode = int(msgBin[0:5], 2)
-        self.vortexCategory = int(msgBin[5:8], 2)
+        return self.decodeFields(int(msg, 16))
+
+    # decode the 56 bit message field given as integer
+    def decodeFields(self, me):
+        self.typeCode = me >> 51
+        self.vortexCategory = (me >> 48) & 0x7
 
         # callSign
         for i in range(8):
-            self.callSign += utils.adsb_int_to_char(int(msgBin[8 + i * 6:8 + i * 6 + 6], 2))
+            self.callSign += utils.adsb_int_to_char((me >> (42 - i * 6)) & 0x3F)
 
         return self
 
     def encodeMessage(self, vortexCategory, callSign, typeCode):
+        return hex(self.encodeFields(vortexCategory, callSign, typeCode))
+
+    # encode the 56 bit message field as integer
+    def encodeFields(self, vortexCategory, callSign, typeCode):
 
         self.vortexCategory = vortexCategory
         self.callSign = callSign
         self.typeCode = typeCode
 
-        # type code
-        typeCodeBits = bin(typeCode)[2:]
-        while len(typeCodeBits) < 5:
-            typeCodeBits = "0" + typeCodeBits
-
-        # vortex category
-        vortexCategoryBits = bin(vortexCategory)[2:]
-        while len(vortexCategoryBits) < 3:
-            vortexCategoryBits = "0" + vortexCategoryBits
+        # callSign (convert every char to int), add spaces to the end
+        callSignBits = 0
+        for char in callSign.ljust(8)[:8]:
+            callSignBits = (callSignBits << 6) | utils.adsb_char_to_int(char)
 
-        # callSign (convert every char to int, from there to binary and hex)
-        callSignBits = ""
-        for char in callSign:
-            binaryChar = bin(utils.adsb_char_to_int(char))[2:]
-            while len(binaryChar) < 6:
-                binaryChar = "0" + binaryChar
-            callSignBits += binaryChar
-        while len(callSignBits) < 48:
-            callSignBits = callSignBits + "100000"  # add spaces to the end
-
-        return hex(int(typeCodeBits + vortexCategoryBits + callSignBits, 2))
+        return (typeCode << 51) | (vortexCategory << 48) | callSignBits
 
     def printMessage(self):
         dataStr = ""
@@ -300,103 +367,297 @@ class ADSB_identification_msg:
         print(dataStr)
 
 
+# can encode, decode and print the message part of an ADSB airborne velocity transmission (type code 19).
+# Ground speed subtypes 1 (subsonic) and 2 (supersonic, 4 kt steps), the airspeed subtypes 3 and 4 are not decoded.
+# velocityEW, velocityNS: [kt] positive to the east and north, verticalRate: [ft/min] positive climbing,
+# None if not available
+class ADSB_velocity_msg:
+
+    def __init__(self, downlinkFormat, transponderCapability, ICAOaddress):
+        self.downlinkFormat = downlinkFormat
+        self.transponderCapability = transponderCapability
+        self.ICAOaddress = ICAOaddress
+        self.rawMSGbin = ""
+        self.typeCode = 0
+        self.subtype = 0
+        self.navigationAccuracy = 0
+        self.velocityEW = None
+        self.velocityNS = None
+        self.verticalRateSource = 0
+        self.verticalRate = None
+
+    # ground speed [kt] and true track [deg clockwise from north]
+    def groundSpeed(self):
+        return math.hypot(self.velocityEW, self.velocityNS)
+
+    def track(self):
+        return math.degrees(math.atan2(self.velocityEW, self.velocityNS)) % 360
+
+    def decodeMessage(self, msg):
+        return self.decodeFields(int(msg, 16))
+
+    # decode the 56 bit message field given as integer
+    def decodeFields(self, me):
+        self.typeCode = me >> 51
+        self.subtype = (me >> 48) & 0x7
+        self.navigationAccuracy = (me >> 43) & 0x7
+        if self.subtype in (1, 2):
+            factor = 1 if self.subtype == 1 else 4
+            self.velocityEW = self._decodeComponent((me >> 42) & 0x1, (me >> 32) & 0x3FF, factor)
+            self.velocityNS = self._decodeComponent((me >> 31) & 0x1, (me >> 21) & 0x3FF, factor)
+        self.verticalRateSource = (me >> 20) & 0x1
+        self.verticalRate = self._decodeComponent((me >> 19) & 0x1, (me >> 10) & 0x1FF, 64)
+        return self
+
+    def encodeMessage(self, velocityEW, velocityNS, verticalRate, typeCode=19):
+        return hex(self.encodeFields(velocityEW, velocityNS, verticalRate, typeCode))
+
+    # encode the 56 bit message field as integer, subtype 1 up to 1022 kt per component and subtype 2 above
+    def encodeFields(self, velocityEW, velocityNS, verticalRate, typeCode=19):
+        self.typeCode = typeCode
+        self.subtype = 1 if max(abs(velocityEW), abs(velocityNS)) <= 1022 else 2
+        self.velocityEW = velocityEW
+        self.velocityNS = velocityNS
+        self.verticalRate = verticalRate
+        factor = 1 if self.subtype == 1 else 4
+
+        signEW, valueEW = self._encodeComponent(velocityEW, factor, 0x3FF)
+        signNS, valueNS = self._encodeComponent(velocityNS, factor, 0x3FF)
+        signVR, valueVR = self._encodeComponent(verticalRate, 64, 0x1FF)
+        return (typeCode << 51) | (self.subtype << 48) | (self.navigationAccuracy << 43) | (signEW << 42) | (
+                valueEW << 32) | (signNS << 31) | (valueNS << 21) | (self.verticalRateSource << 20) | (
+                signVR << 19) | (valueVR << 10)
+
+    # sign bit and magnitude field of a velocity component in steps of factor, 0 means no information
+    @staticmethod
+    def _encodeComponent(value, factor, maxValue):
+        if value is None:
+            return 0, 0
+        return int(value < 0), min(int(abs(value) / factor + 0.5) + 1, maxValue)
+
+    @staticmethod
+    def _decodeComponent(sign, value, factor):
+        if value == 0:
+            return None
+        return (value - 1) * factor * (-1 if sign else 1)
+
+    def printMessage(self):
+        dataStr = ""
+        dataStr += "Downlink Format: " + str(self.downlinkFormat) + "\n"
+        dataStr += "Transponder Capability: " + str(self.transponderCapability) + "\n"
+        dataStr += "ICAO Address: " + str(self.ICAOaddress) + "\n"
+        dataStr += "Type Code: " + str(self.typeCode) + "\n"
+        dataStr += "Subtype: " + str(self.subtype) + "\n"
+        dataStr += "Velocity East-West (kt): " + str(self.velocityEW) + "\n"
+        dataStr += "Velocity North-South (kt): " + str(self.velocityNS) + "\n"
+        dataStr += "Vertical Rate (ft/min): " + str(self.verticalRate) + "\n"
+        print(dataStr)
+
+
 class ADSB_coder:
 
-    def __init__(self):
-        # lists for decoded messages
-        self.decPosMSGS = []
-        self.decIdentMSGS = []
+    # cprTTL: seconds a position message can be paired, aircraft without messages for that long are forgotten
+    # referencePosition: lon-lat of the receiver, enables local decoding of single position messages received directly
+    # referenceRange: [m] distance up to which aircraft are received directly, None for the 180NM of local decoding
+    def __init__(self, cprTTL=10.0, referencePosition=None, referenceRange=None):
+        # latest even and odd position message with receive time and the last decoded lon-lat with its time per
+        # ICAO address: {ICAO: [(msg, t), (msg, t), (lon, lat, t)]}
+        self.cprFrames = {}
+        self.cprTTL = cprTTL
+        self.referencePosition = referencePosition
+        # an aircraft up to referenceRange away is decoded a zone off at the zone length minus its distance or more,
+        # positions beyond both are ambiguous and discarded
+        if referenceRange is None:
+            self.referenceDistance = CPR_ZONE_LENGTH / 2
+        else:
+            self.referenceDistance = min(referenceRange, CPR_ZONE_LENGTH - referenceRange)
+        self.lastEviction = 0.0
+
+        # latest identification message with receive time per ICAO address, forgotten like the position messages:
+        # {ICAO: (msg, t)}
+        self.identifications = {}
+        # latest velocity message with receive time per ICAO address, forgotten the same way: {ICAO: (msg, t)}
+        self.velocities = {}
 
-        # lists for encoded messages
-        self.encPosMSGS = []
-        self.encIdentMSGS = []
+        # cpr format of the last encoded position message per ICAO address
+        self.encCprFormats = {}
 
+    # msg: hex string of the 88 data bits, returns the 24 parity bits as hex string
     def calculateCRC(self, msg):
-        generator = "1111111111111010000001001"
-        binMSG = bin(int(msg, 16))[2:]
-        # fill up with zeroes
-        binMSG = binMSG.ljust(112, '0')
-
-        # calculate the parity using generator and data (CRC)
-        for i in range(88):
-            if binMSG[i] == '1':
-                xor = bin(int(binMSG[i:i + 25], 2) ^ int(generator, 2))[2:]
-                xor = str(xor).zfill(25)
-                # replace part of string
-                binMSG = binMSG[0:i] + xor + binMSG[i + 25:]
-        remainder = binMSG[-24:]
-        return hex(int(remainder, 2))[2:].upper().zfill(6).upper()
-
-    def decode(self, msgHex, noPrint=False):
+        return "%06X" % calculateCRC24(int(msg, 16))
+
+    # frames: numpy array of 112-bit frames, returns True for every frame with a valid checksum
+    def checkCRCBatch(self, frames):
+        return calculateCRC24Batch(frames) == 0
+
+    def decode(self, msgHex, noPrint=False, timestamp=None, fromSatellite=False):
+        return self.decodeFrame(int(msgHex, 16), noPrint, timestamp, fromSatellite=fromSatellite)
+
+    # frame: 112 bit frame as integer or as 14 bytes (bytes, bytearray, memoryview)
+    # timestamp: time of the frame in seconds of simulation time, for relayed frames the time the aircraft sent it.
+    # Required, the pairing and the eviction of the CPR frames compare it with the timestamps of earlier frames
+    # crcChecked: the checksum was already checked, e.g. with checkCRCBatch
+    # fromSatellite: the frame was relayed by a satellite, the aircraft may be far from the receiver
+    def decodeFrame(self, frame, noPrint=False, timestamp=None, crcChecked=False, fromSatellite=False):
+        if timestamp is None:
+            raise ValueError("Missing timestamp of the ADS-B frame")
+        if not isinstance(frame, int):
+            frame = int.from_bytes(frame, 'big')
         # first, check crc
-        if self.calculateCRC(msgHex[:-6]) != msgHex[-6:]:
+        if not crcChecked and calculateCRC24(frame >> 24) != frame & 0xFFFFFF:
             if (noPrint == False):
                 print("Checksum of received ADS-B message does not check out. Aborting")
             return False
         # else:
         # print("Check sum correct!")
-
-        msgBin = bin(int(msgHex, 16))[2:]
-        downlinkFormat = int(msgBin[0:5], 2)
-        transponderCapability = int(msgBin[5:8], 2)
-        ICAOaddress = hex(int(msgBin[8:32], 2))[2:].upper()
-        typeCode = int(msgBin[32:37], 2)
+        if timestamp - self.lastEviction >= self.cprTTL:
+            self.evictStale(timestamp)
+
+        downlinkFormat = frame >> 107
+        transponderCapability = (frame >> 104) & 0x7
+        ICAOaddress = "%X" % ((frame >> 80) & 0xFFFFFF)
+        me = (frame >> 24) & 0xFFFFFFFFFFFFFF
+        typeCode = me >> 51
         if typeCode >= 1 and typeCode <= 4:
             # identification message
             identMSG = ADSB_identification_msg(downlinkFormat, transponderCapability, ICAOaddress)
-            identMSG.rawMSGbin = bin(int(msgHex, 16))
-            identMSG.decodeMessage(msgHex[8:22])
+            identMSG.rawMSGbin = bin(frame)
+            identMSG.decodeFields(me)
             if (noPrint == False):
                 print("Identification-message received.")
                 identMSG.printMessage()
-            self.decIdentMSGS.append(identMSG)
+            self.identifications[ICAOaddress] = (identMSG, timestamp)
             return identMSG
         elif (typeCode >= 9 and typeCode <= 18) or (typeCode >= 20 and typeCode <= 22):
             # position message
             posMSG = ADSB_positional_msg(downlinkFormat, transponderCapability, ICAOaddress)
-            posMSG.rawMSGbin = bin(int(msgHex, 16))
-            posMSG.decodeMessage(msgHex[8:22])
+            posMSG.rawMSGbin = bin(frame)
+            posMSG.decodeFields(me)
             if (noPrint == False):
                 print("Position-message received.")
                 posMSG.printMessage()
-            self.decPosMSGS.append(posMSG)
-            posMSG.determineTruePosition(ICAOaddress, self.decPosMSGS, noPrint)
+            self.updatePosition(posMSG, timestamp, noPrint, fromSatellite)
             return posMSG
+        elif typeCode == 19:
+            # airborne velocity message
+            velocityMSG = ADSB_velocity_msg(downlinkFormat, transponderCapability, ICAOaddress)
+            velocityMSG.rawMSGbin = bin(frame)
+            velocityMSG.decodeFields(me)
+            if (noPrint == False):
+                print("Velocity-message received.")
+                velocityMSG.printMessage()
+            self.velocities[ICAOaddress] = (velocityMSG, timestamp)
+            return velocityMSG
+
+    # store the position message as latest of its format and pair it with the latest message of the other format
+    # without a pair, decode it locally relative to the last position of the aircraft or, if received directly, the
+    # receiver position. Only positions within the distance the aircraft can have flown since its last position or
+    # within the unambiguous distance of the receiver are kept
+    def updatePosition(self, posMSG, timestamp, noPrint=False, fromSatellite=False):
+        frames = self.cprFrames.setdefault(posMSG.ICAOaddress, [None, None, None])
+        frames[posMSG.cprFormat] = (posMSG, timestamp)
+        other = frames[1 - posMSG.cprFormat]
+        if other is not None and timestamp - other[1] <= self.cprTTL:
+            evenMSG, Teven = frames[0]
+            oddMSG, Todd = frames[1]
+            posMSG.determineTruePosition(evenMSG, oddMSG, Teven, Todd, noPrint)
+
+        if not posMSG.latLonDecoded:
+            # the aircraft cannot have flown farther than at its top speed since its last position,
+            # a last position older than the flight across half a zone is ambiguous
+            flown = math.inf if frames[2] is None else \
+                abs(timestamp - frames[2][2]) * MAX_AIRCRAFT_SPEED + LOCAL_DECODING_MARGIN
+            if flown < CPR_ZONE_LENGTH / 2:
+                reference, maxDistance = frames[2], flown
+            elif self.referencePosition is not None and not fromSatellite:
+                reference, maxDistance = self.referencePosition, self.referenceDistance
+            else:
+                if (noPrint == False):
+                    print("Not enough data available to determine accurate position.")
+                return
+            posMSG.determineLocalPosition(reference[1], reference[0], noPrint, maxDistance)
+            if not posMSG.latLonDecoded:
+                return
+        frames[2] = (posMSG.decodedLon, posMSG.decodedLat, timestamp)
+
+    # forget aircraft without position, identification or velocity messages within the last cprTTL seconds
+    def evictStale(self, timestamp):
+        for ICAOaddress, frames in list(self.cprFrames.items()):
+            if max(frame[1] for frame in frames[:2] if frame is not None) < timestamp - self.cprTTL:
+                del self.cprFrames[ICAOaddress]
+        for ICAOaddress, (identMSG, t) in list(self.identifications.items()):
+            if t < timestamp - self.cprTTL:
+                del self.identifications[ICAOaddress]
+        for ICAOaddress, (velocityMSG, t) in list(self.velocities.items()):
+            if t < timestamp - self.cprTTL:
+                del self.velocities[ICAOaddress]
+        self.lastEviction = timestamp
 
     # encode message prefix containing downlink format and transponder capability
     def encodeADSBprefix(self, downlinkFormat, transponderCapability, ICAOaddress):
-        dFcTbin = bin((downlinkFormat << 3) | transponderCapability)[2:]
-        ICAObin = bin(int(ICAOaddress, 16))[2:]
-        while len(ICAObin) < 24:
-            ICAObin = "0" + ICAObin
-        return hex(int(dFcTbin + ICAObin, 2)).upper()
+        return hex(self.encodePrefix(downlinkFormat, transponderCapability, ICAOaddress)).upper()
+
+    # 32 bit prefix as integer
+    def encodePrefix(self, downlinkFormat, transponderCapability, ICAOaddress):
+        return (((downlinkFormat << 3) | transponderCapability) << 24) | int(ICAOaddress, 16)
+
+    # prefix and message field to the 112 bit frame including the crc
+    def encodeFrame(self, prefix, me):
+        data = (prefix << 56) | me
+        return (data << 24) | calculateCRC24(data)
 
     def encodePosition(self, downlinkFormat, transponderCapability, ICAOaddress, surveillanceStatus, singleAntenna,
                        altitude, latitude, longitude, time=0, typeCode=20):
+        return "%028X" % self.encodePositionFrame(downlinkFormat, transponderCapability, ICAOaddress,
+                                                  surveillanceStatus, singleAntenna, altitude, latitude, longitude,
+                                                  time, typeCode)
+
+    # like encodePosition, returns the frame as integer
+    def encodePositionFrame(self, downlinkFormat, transponderCapability, ICAOaddress, surveillanceStatus, singleAntenna,
+                            altitude, latitude, longitude, time=0, typeCode=20):
         while(len(ICAOaddress)<6):
             ICAOaddress = "0" + ICAOaddress
-        prefix = self.encodeADSBprefix(downlinkFormat, transponderCapability, ICAOaddress)[2:]
+        prefix = self.encodePrefix(downlinkFormat, transponderCapability, ICAOaddress)
         posMSG = ADSB_positional_msg(downlinkFormat, transponderCapability, ICAOaddress)
-        cprFormat = 0
         # make cpr format alternate between even and odd
-        if (len(self.encPosMSGS) >= 1 and self.encPosMSGS[-1].cprFormat == 0):
-            cprFormat = 1
-        msgPart = posMSG.encodeMessage(surveillanceStatus, singleAntenna, altitude, latitude, longitude, time, typeCode,
-                                       cprFormat)[2:]
-        crc = self.calculateCRC(prefix + msgPart)
-        posMSG.rawMSGbin = bin(int(prefix + msgPart + crc, 16))
-        self.encPosMSGS.append(posMSG)
-        return (prefix + msgPart + crc).upper()
+        cprFormat = 1 - self.encCprFormats.get(ICAOaddress, 1)
+        self.encCprFormats[ICAOaddress] = cprFormat
+        me = posMSG.encodeFields(surveillanceStatus, singleAntenna, altitude, latitude, longitude, time, typeCode,
+                                 cprFormat)
+        frame = self.encodeFrame(prefix, me)
+        posMSG.rawMSGbin = bin(frame)
+        return frame
 
     def encodeIdentification(self, downlinkFormat, transponderCapability, ICAOaddress, vortexCategory, callSign,
                              typeCode=0):
-        prefix = self.encodeADSBprefix(downlinkFormat, transponderCapability, ICAOaddress)[2:]
+        return "%028X" % self.encodeIdentificationFrame(downlinkFormat, transponderCapability, ICAOaddress,
+                                                        vortexCategory, callSign, typeCode)
+
+    # like encodeIdentification, returns the frame as integer
+    def encodeIdentificationFrame(self, downlinkFormat, transponderCapability, ICAOaddress, vortexCategory, callSign,
+                                  typeCode=0):
+        prefix = self.encodePrefix(downlinkFormat, transponderCapability, ICAOaddress)
         identMSG = ADSB_identification_msg(downlinkFormat, transponderCapability, ICAOaddress)
-        msgPart = identMSG.encodeMessage(vortexCategory, callSign, typeCode)[2:]
-        crc = self.calculateCRC(prefix + msgPart)
-        identMSG.rawMSGbin = bin(int(prefix + msgPart + crc, 16))
-        self.encIdentMSGS.append(identMSG)
-        return (prefix + msgPart + crc).upper()
+        me = identMSG.encodeFields(vortexCategory, callSign, typeCode)
+        frame = self.encodeFrame(prefix, me)
+        identMSG.rawMSGbin = bin(frame)
+        return frame
+
+    # velocityEW, velocityNS: [kt] ground speed to the east and north, verticalRate: [ft/min]
+    def encodeVelocity(self, downlinkFormat, transponderCapability, ICAOaddress, velocityEW, velocityNS,
+                       verticalRate=0, typeCode=19):
+        return "%028X" % self.encodeVelocityFrame(downlinkFormat, transponderCapability, ICAOaddress, velocityEW,
+                                                  velocityNS, verticalRate, typeCode)
+
+    # like encodeVelocity, returns the frame as integer
+    def encodeVelocityFrame(self, downlinkFormat, transponderCapability, ICAOaddress, velocityEW, velocityNS,
+                            verticalRate=0, typeCode=19):
+        prefix = self.encodePrefix(downlinkFormat, transponderCapability, ICAOaddress)
+        velocityMSG = ADSB_velocity_msg(downlinkFormat, transponderCapability, ICAOaddress)
+        me = velocityMSG.encodeFields(velocityEW, velocityNS, verticalRate, typeCode)
+        frame = self.encodeFrame(prefix, me)
+        velocityMSG.rawMSGbin = bin(frame)
+        return frame
 
 # Create coder
 # temp = ADSB_coder()
@@ -0,0 +1,908 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import Parameters  # first, it imports Groundstation and Plane to create the configured instances
+import ADSB
+import Capture
+import CommSat
+import Collision
+import Constellation
+import Groundstation
+import Kinematics
+import Plane
+import Recorder
+import RNG
+import Routes
+import Scheduler
+import SpatialIndex
+import Trajectory
+import Transmission
+import utils
+
+
+# Benchmarks of the simulation components, run `python Benchmark.py` to execute all of them.
+# The behaviour is checked by the tests in the tests directory (`python -m pytest`).
+
+
+def _positionMessages(numMessages):
+    coder = ADSB.ADSB_coder()
+    lats = np.random.uniform(9.4, 23.2, numMessages)
+    lons = np.random.uniform(99.4, 116.5, numMessages)
+    return [coder.encodePosition(17, 5, "ABC123", 0, 1, 1000, lat, lon) for lat, lon in zip(lats, lons)]
+
+
+def _batchDuration(messages, channel_model, SNRdB, carrier_frequency, chunkSize=500):
+    # only the channel simulation is timed, not the construction of the transmissions
+    duration = 0.0
+    for i in range(0, len(messages), chunkSize):
+        transmissions = [Transmission.Transmission(msg, "src", False, "dest", SNRdB=SNRdB, channel_model=channel_model,
+                                                   carrier_frequency=carrier_frequency)
+                         for msg in messages[i:i + chunkSize]]
+        start = time.perf_counter()
+        Transmission.transmitBatch(transmissions)
+        duration += time.perf_counter() - start
+    return duration
+
+
+def _channelDuration(messages, channel_model, SNRdB, carrier_frequency, chunkSize=500):
+    # time of the channel simulation of the bit matrices alone, without the hex strings of the transmissions
+    data, lengths = utils.hex_strings_to_bit_matrix(messages)
+    SNRdBs = np.full(len(messages), float(SNRdB))
+    start = time.perf_counter()
+    for i in range(0, len(messages), chunkSize):
+        Transmission.simulateBatch(channel_model, carrier_frequency, data[i:i + chunkSize], SNRdBs[i:i + chunkSize],
+                                   lengths[i:i + chunkSize])
+    return time.perf_counter() - start
+
+
+def benchmarkSymbolChannels(numMessages=4000, SNRdBs=(6.1, 12, 20)):
+    """
+    Measures the steady-state messages per second of the symbol-level
+    channel modes and of the sampled waveform path. The effective fading
+    tables and bit error rates are built and timed before, they are computed
+    once per process. The speedup is given for transmitBatch() and for the
+    channel simulation of the bit matrices alone, without the conversion of
+    the hex strings all modes share.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of messages transmitted per channel model and SNR
+    SNRdBs : tuple(float)
+        signal to noise ratios in [dB]
+
+    Returns
+    -------
+    dict
+        (fading, SNRdB, level) -> speedup of transmitBatch() over the waveform path
+    """
+
+    messages = _positionMessages(numMessages)
+    sine = Transmission.carrier_table(Parameters.adsb_freq, 48).sine_0_phase
+    start = time.perf_counter()
+    for fading in ('rayleigh', 'rice'):
+        for SNRdB in SNRdBs:
+            Transmission.bit_error_rate(fading, SNRdB, sine)
+    print("Symbol-level channels (" + str(numMessages) + " messages), fading tables built in %.2f s" % (
+        time.perf_counter() - start))
+    speedups = {}
+    for fading in ('rayleigh', 'rice'):
+        for SNRdB in SNRdBs:
+            referenceTime = _batchDuration(messages[:1000], 'bpsk-awgn-' + fading, SNRdB, Parameters.adsb_freq)
+            referenceChannel = _channelDuration(messages[:1000], 'bpsk-awgn-' + fading, SNRdB, Parameters.adsb_freq)
+            for level in ('symbol', 'ber'):
+                duration = _batchDuration(messages, 'bpsk-' + level + '-' + fading, SNRdB, Parameters.adsb_freq)
+                channel = _channelDuration(messages, 'bpsk-' + level + '-' + fading, SNRdB, Parameters.adsb_freq)
+                speedups[(fading, SNRdB, level)] = referenceTime * numMessages / 1000 / duration
+                print("  %-8s %5.1f dB  waveform %5.0f msg/s  %-6s %6.0f msg/s  speedup %5.1fx, channel alone %5.1fx" % (
+                    fading, SNRdB, 1000 / referenceTime, level, numMessages / duration,
+                    speedups[(fading, SNRdB, level)], referenceChannel * numMessages / 1000 / channel))
+    return speedups
+
+
+def benchmarkTransmissionConstruction(numTransmissions=5000):
+    """
+    Measures how many Transmission objects and waveform channels can be
+    constructed per second with the shared carrier tables.
+
+    Parameters
+    ----------
+    numTransmissions : int
+        number of transmissions constructed per measurement
+
+    Returns
+    -------
+    tuple(float, float)
+        transmissions and channels constructed per second
+    """
+
+    msg = _positionMessages(1)[0]
+
+    start = time.perf_counter()
+    for _ in range(numTransmissions):
+        Transmission.Transmission(msg, "src", False, "dest", SNRdB=Parameters.plane_to_groundstation_SNRdB,
+                                  carrier_frequency=Parameters.adsb_freq)
+    transmissions = numTransmissions / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(numTransmissions):
+        Transmission.BPSK_AWGN_Rayleigh_Channel(utils.hex_string_to_bit_array(msg), Parameters.plane_to_groundstation_SNRdB,
+                                                Parameters.adsb_freq)
+    channels = numTransmissions / (time.perf_counter() - start)
+
+    print("Transmission construction: %.0f transmissions/s, %.0f channels/s" % (transmissions, channels))
+    return transmissions, channels
+
+
+def _randomFrames(numFrames):
+    # random 88 data bits with the first bit set (as in every DF17 frame) plus their parity
+    coder = ADSB.ADSB_coder()
+    data = [hex((1 << 87) | int.from_bytes(np.random.bytes(11), 'big'))[2:].upper() for _ in range(numFrames)]
+    return [msg + coder.calculateCRC(msg) for msg in data]
+
+
+def benchmarkCRC(numMessages=20000):
+    """
+    Measures how many messages per second the CRC checks.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of checked messages
+
+    Returns
+    -------
+    tuple(float, float)
+        messages per second of the table-driven CRC and the batch check
+    """
+
+    coder = ADSB.ADSB_coder()
+    frames = _randomFrames(numMessages)
+
+    start = time.perf_counter()
+    for frame in frames:
+        coder.calculateCRC(frame[:-6]) == frame[-6:]
+    table = numMessages / (time.perf_counter() - start)
+
+    byteFrames = utils.hex_strings_to_byte_matrix(frames, 14)
+    start = time.perf_counter()
+    coder.checkCRCBatch(byteFrames)
+    batch = numMessages / (time.perf_counter() - start)
+
+    print("CRC-24 check: %.0f msg/s table, %.0f msg/s batch" % (table, batch))
+    return table, batch
+
+
+def benchmarkCodec(numFrames=20000):
+    """
+    Measures how many frames per second are encoded and decoded, through the
+    integer frame API and through the hex string API.
+
+    Parameters
+    ----------
+    numFrames : int
+        number of position frames encoded and decoded
+
+    Returns
+    -------
+    dict
+        frames per second of every measurement
+    """
+
+    lats = np.random.uniform(9.4, 23.2, numFrames)
+    lons = np.random.uniform(99.4, 116.5, numFrames)
+    results = {}
+
+    for api in ('int', 'hex'):
+        encoder = ADSB.ADSB_coder()
+        encode = encoder.encodePositionFrame if api == 'int' else encoder.encodePosition
+        start = time.perf_counter()
+        frames = [encode(17, 5, "ABC123", 0, 1, 1000, lat, lon) for lat, lon in zip(lats, lons)]
+        results[api + ' encode'] = numFrames / (time.perf_counter() - start)
+
+        decoder = ADSB.ADSB_coder()
+        decode = decoder.decodeFrame if api == 'int' else decoder.decode
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            decode(frame, True, i * 0.5)
+        results[api + ' decode'] = numFrames / (time.perf_counter() - start)
+
+    print("ADS-B codec: " + ", ".join("%s %.0f frames/s" % item for item in results.items()))
+    return results
+
+
+def benchmarkCPRDecoding(numMessages=20000):
+    """
+    Compares the cost of global (even/odd pair) and local (reference position)
+    CPR position decoding.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of decoded position messages
+
+    Returns
+    -------
+    tuple(float, float)
+        microseconds per global and per local position decode
+    """
+
+    encoder = ADSB.ADSB_coder()
+    lats = np.random.uniform(10.0, 12.0, numMessages)
+    lons = np.random.uniform(105.0, 107.0, numMessages)
+    messages = [encoder.decodeFrame(encoder.encodePositionFrame(17, 5, "ABC123", 0, 1, 1000, lat, lon), True, i * 0.5)
+                for i, (lat, lon) in enumerate(zip(lats, lons))]
+
+    start = time.perf_counter()
+    for evenMSG, oddMSG in zip(messages[::2], messages[1::2]):
+        oddMSG.determineTruePosition(evenMSG, oddMSG, 0.0, 0.5, True)
+    globalCost = (time.perf_counter() - start) / (numMessages // 2) * 1e6
+
+    start = time.perf_counter()
+    for msg in messages:
+        msg.determineLocalPosition(11.0, 106.0, True)
+    localCost = (time.perf_counter() - start) / numMessages * 1e6
+
+    print("CPR decoding: %.2f us global, %.2f us local per position" % (globalCost, localCost))
+    return globalCost, localCost
+
+
+def benchmarkNL(numLatitudes=2000001):
+    """
+    Measures how many numbers of longitude zones per second the
+    trigonometric definition, the table lookup and the vectorized lookup
+    compute.
+
+    Parameters
+    ----------
+    numLatitudes : int
+        number of latitudes between -90 and 90 degrees
+
+    Returns
+    -------
+    tuple(float, float, float)
+        latitudes per second of the trigonometric definition, the table and the vectorized table
+    """
+
+    lats = np.linspace(-90, 90, numLatitudes)
+
+    start = time.perf_counter()
+    for lat in lats[:numLatitudes // 10].tolist():
+        ADSB._trigonometricNL(lat)
+    trigonometric = (numLatitudes // 10) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for lat in lats.tolist():
+        ADSB.calculateNL(lat)
+    lookup = numLatitudes / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ADSB.calculateNLArray(lats)
+    batch = numLatitudes / (time.perf_counter() - start)
+
+    print("NL: %.0f/s trigonometric, %.0f/s table, %.0f/s vectorized" % (trigonometric, lookup, batch))
+    return trigonometric, lookup, batch
+
+
+def benchmarkExecutionBackends(numMessages=20000, workers=None, chunkSize=1000, seed=0):
+    """
+    Simulates the same seeded transmissions one by one, as one batch and with
+    every execution backend and measures the messages per second.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of transmitted messages
+    workers : int
+        number of worker threads or processes, None for the number of CPUs
+    chunkSize : int
+        number of messages simulated by one worker call
+    seed : int
+        root seed of the transmissions
+
+    Returns
+    -------
+    dict
+        messages per second of every execution mode
+    """
+
+    messages = _positionMessages(numMessages)
+    results = {}
+    for mode in ('transmit', 'batch', 'serial', 'thread', 'process'):
+        rng = RNG.RNGService(seed)
+        transmissions = [Transmission.Transmission(msg, "src", False, "dest", SNRdB=Parameters.plane_to_groundstation_SNRdB,
+                                                   channel_model='bpsk-awgn-rayleigh', carrier_frequency=Parameters.adsb_freq,
+                                                   seed=rng.nextSeed('link', "src", "dest"))
+                         for msg in messages]
+        executor = Transmission.ChannelExecutor(mode, workers, chunkSize) if mode not in ('transmit', 'batch') else None
+        start = time.perf_counter()
+        if mode == 'transmit':
+            [element.transmit() for element in transmissions]
+        else:
+            Transmission.transmitBatch(transmissions, executor)
+        results[mode] = numMessages / (time.perf_counter() - start)
+        if executor is not None:
+            executor.close()
+
+    print("Execution modes: " + ", ".join("%s %.0f msg/s" % item for item in results.items()))
+    return results
+
+def benchmarkRicianSampler(numMessages=2000, samplesPerMessage=112 * 48, K=0.5):
+    """
+    Measures the import time of scipy.stats and compares drawing the fading
+    samples of numMessages messages with scipy.stats.rice, with the NumPy
+    Rician sampler per message and with the NumPy sampler for all messages
+    at once.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of messages
+    samplesPerMessage : int
+        number of fading samples of one message
+    K : float
+        Rician K-factor
+
+    Returns
+    -------
+    tuple(float, float, float)
+        messages per second of scipy, the NumPy sampler per message and the NumPy sampler in one batch
+    """
+
+    start = time.perf_counter()
+    from scipy.stats import rice
+    importTime = time.perf_counter() - start
+    rng = np.random.default_rng(0)
+    b = np.sqrt(2 * K)  # shape of scipy's rice with the scale 1 for the K-factor
+
+    start = time.perf_counter()
+    for _ in range(numMessages):
+        rice.rvs(b, size=samplesPerMessage, random_state=rng)
+    scipyRate = numMessages / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(numMessages):
+        Transmission.rician(samplesPerMessage, K, rng)
+    numpyRate = numMessages / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Transmission.rician((numMessages, samplesPerMessage), K, rng)
+    batchRate = numMessages / (time.perf_counter() - start)
+
+    print("Rician fading: scipy.stats import %.0f ms, %.0f msg/s scipy, %.0f msg/s numpy, %.0f msg/s numpy batch" % (
+        importTime * 1000, scipyRate, numpyRate, batchRate))
+    return scipyRate, numpyRate, batchRate
+
+
+def benchmarkAWGN(numMessages=2000, samplesPerMessage=112 * 48):
+    """
+    Measures how many messages per second get noise added by awgn() per
+    message and by awgn() in place on a 2-D batch.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of messages
+    samplesPerMessage : int
+        number of samples of one message
+
+    Returns
+    -------
+    tuple(float, float)
+        messages per second of the per message and the batch noise stage
+    """
+
+    rng = np.random.default_rng(0)
+    signals = rng.standard_normal((numMessages, samplesPerMessage))
+    SNRdB = np.full(numMessages, Parameters.plane_to_groundstation_SNRdB)
+
+    start = time.perf_counter()
+    for signal in signals:
+        Transmission.awgn(Parameters.plane_to_groundstation_SNRdB, signal, rng=rng)
+    single = numMessages / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Transmission.awgn(SNRdB, signals, rng=rng, out=signals)
+    batch = numMessages / (time.perf_counter() - start)
+
+    print("AWGN: %.0f msg/s per message, %.0f msg/s in-place batch" % (single, batch))
+    return single, batch
+
+
+def _randomPlanes(numPlanes, numWaypoints=20):
+    # planes flying random routes over the simulated region
+    planes = []
+    for i in range(numPlanes):
+        lons = np.random.uniform(100.0, 116.0, numWaypoints + 1)
+        lats = np.random.uniform(10.0, 23.0, numWaypoints + 1)
+        planes.append(Plane.Plane("Plane_" + str(i), position=(lons[0], lats[0]), speed=np.random.uniform(150, 300),
+                                  waypoints=list(zip(lons[1:], lats[1:]))))
+    return planes
+
+
+def benchmarkKinematics(numPlanes=10000, numSteps=20):
+    """
+    Measures how many plane position updates per second Plane.updatePos and
+    the fleet perform, and how long the arc-length tables of the routes take
+    to build with spherical and with geodesic distances.
+
+    Parameters
+    ----------
+    numPlanes : int
+        number of planes
+    numSteps : int
+        number of simulation timesteps of the fleet
+
+    Returns
+    -------
+    tuple(float, float)
+        plane updates per second of Plane.updatePos and of the fleet
+    """
+
+    planes = _randomPlanes(numPlanes)
+    fleet = Kinematics.Fleet(planes)
+
+    start = time.perf_counter()
+    for plane in planes[:numPlanes // 10]:
+        plane.updatePos(Parameters.sim_timestep)
+    perPlane = (numPlanes // 10) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(numSteps):
+        fleet.updatePos(Parameters.sim_timestep)
+    fleetRate = numPlanes * numSteps / (time.perf_counter() - start)
+
+    routes = {}
+    for geodesic in (False, True):
+        start = time.perf_counter()
+        for plane in planes[:100]:
+            Kinematics.Route(plane.position, plane.waypoints, geodesic)
+        routes[geodesic] = (time.perf_counter() - start) / 100 * 1000
+
+    print("Kinematics (%d planes): %.0f updates/s Plane.updatePos, %.0f updates/s fleet, "
+          "route tables %.2f ms spherical / %.2f ms geodesic per route" % (
+              numPlanes, perPlane, fleetRate, routes[False], routes[True]))
+    return perPlane, fleetRate
+
+def _randomGroundstations(numGroundstations):
+    # groundstations spread over the simulated region with ranges between 50 and 370 km
+    return [Groundstation.Groundstation("GS_" + str(i), (np.random.uniform(100.0, 116.0), np.random.uniform(10.0, 23.0)),
+                                        "GS_" + str(i), np.random.uniform(50000, 370000))
+            for i in range(numGroundstations)]
+
+
+def benchmarkReceiverIndex(numGroundstations=300, numPlanes=10000):
+    """
+    Measures how many plane positions per second get their groundstations in
+    range with Plane.inRange for every groundstation and with the spatial
+    index (spherical and geodesic).
+
+    Parameters
+    ----------
+    numGroundstations : int
+        number of groundstations
+    numPlanes : int
+        number of plane positions
+
+    Returns
+    -------
+    tuple(float, float, float)
+        positions per second of Plane.inRange, the spherical and the geodesic index
+    """
+
+    groundstations = _randomGroundstations(numGroundstations)
+    planes = _randomPlanes(numPlanes, 1)
+    positions = np.array([plane.position for plane in planes])
+
+    start = time.perf_counter()
+    for plane in planes[:numPlanes // 1000 or 1]:
+        plane.receiversInRange(groundstations)
+    perPlane = (numPlanes // 1000 or 1) / (time.perf_counter() - start)
+
+    rates = []
+    for geodesic in (False, True):
+        index = SpatialIndex.ReceiverIndex(groundstations, geodesic=geodesic)
+        start = time.perf_counter()
+        index.query(positions)
+        rates.append(numPlanes / (time.perf_counter() - start))
+
+    print("Range checks (%d groundstations): %.0f positions/s Plane.inRange, %.0f positions/s index, "
+          "%.0f positions/s geodesic index" % (numGroundstations, perPlane, rates[0], rates[1]))
+    return perPlane, rates[0], rates[1]
+
+
+def benchmarkScheduler(numPlanes=10000, duration=20.0, window=0.5):
+    """
+    Measures how many squitter events per second pass through the event
+    scheduler, scheduled with the configured rates and jitter and popped one
+    reception window at a time.
+
+    Parameters
+    ----------
+    numPlanes : int
+        number of planes
+    duration : float
+        simulated time in [s]
+    window : float
+        reception window in [s]
+
+    Returns
+    -------
+    tuple(float, dict)
+        events per second and mean squitters per second and plane per type
+    """
+
+    rng = np.random.default_rng(0)
+    scheduler = Scheduler.EventScheduler()
+    for i in range(numPlanes):
+        for kind, rate in Parameters.squitter_rates.items():
+            scheduler.schedule(rng.uniform(0, 1 / rate), (kind, i))
+
+    counts = dict.fromkeys(Parameters.squitter_rates, 0)
+    numEvents = 0
+    start = time.perf_counter()
+    t = 0.0
+    while t < duration:
+        for eventTime, (kind, i) in scheduler.popUntil(t + window):
+            counts[kind] += 1
+            interval = (1 + Parameters.squitter_jitter * rng.uniform(-1, 1)) / Parameters.squitter_rates[kind]
+            scheduler.schedule(eventTime + interval, (kind, i))
+            numEvents += 1
+        t += window
+    eventsPerSecond = numEvents / (time.perf_counter() - start)
+
+    rates = {kind: count / (numPlanes * duration) for kind, count in counts.items()}
+    print("Scheduler: %.0f events/s, squitters per plane: %s" % (
+        eventsPerSecond, ", ".join("%s %.3f Hz" % item for item in rates.items())))
+    return eventsPerSecond, rates
+
+
+def benchmarkCollisions(frameRate=5000.0, duration=60.0, window=0.5):
+    """
+    Measures how many frames per second the collision model resolves at one
+    receiver, one reception window at a time.
+
+    Parameters
+    ----------
+    frameRate : float
+        frames per second arriving at the receiver
+    duration : float
+        simulated time in [s]
+    window : float
+        reception window in [s]
+
+    Returns
+    -------
+    float
+        frames per second
+    """
+
+    rng = np.random.default_rng(0)
+    numFrames = int(frameRate * duration)
+    times = np.sort(rng.uniform(0, duration, numFrames))
+    levels = rng.normal(0, 6, numFrames)
+    bounds = np.searchsorted(times, np.arange(0, duration + window, window))
+
+    model = Collision.CollisionModel(Parameters.adsb_frame_duration, Parameters.capture_ratio_dB)
+    numClear = 0
+    start = time.perf_counter()
+    for first, end in zip(bounds[:-1], bounds[1:]):
+        numClear += int(np.count_nonzero(model.resolve(times[first:end], levels[first:end])))
+    framesPerSecond = numFrames / (time.perf_counter() - start)
+
+    print("Collisions: %.0f frames/s resolved, %.1f%% of %.0f frames/s decodable" % (
+        framesPerSecond, 100 * numClear / numFrames, frameRate))
+    return framesPerSecond
+
+
+def benchmarkTrajectories(numPlanes=50, numPoints=2000, maxPoints=500):
+    """
+    Measures recording and grouping the flightpaths of several planes per
+    ICAO address for plotting with Trajectory.Trajectories, full and
+    decimated.
+
+    Parameters
+    ----------
+    numPlanes : int
+        number of planes
+    numPoints : int
+        number of positions per plane
+    maxPoints : int
+        number of positions per decimated flightpath
+
+    Returns
+    -------
+    tuple(float, float)
+        seconds of the full and of the decimated flightpaths
+    """
+
+    rng = np.random.default_rng(0)
+    icaos = ["%06x" % icao for icao in rng.integers(1, 16777214, numPlanes)]
+    positions = rng.uniform(0, 1, (numPoints, numPlanes, 2)).tolist()
+
+    times = []
+    for decimation in (None, maxPoints):
+        start = time.perf_counter()
+        trajectories = Trajectory.Trajectories()
+        for step in positions:
+            for (lon, lat), icao in zip(step, icaos):
+                trajectories.append(lon, lat, icao)
+        paths = {icao: trajectories.trajectory(icao, decimation) for icao in trajectories.icaos()}
+        times.append(time.perf_counter() - start)
+
+    print("Trajectories (%d planes x %d positions): %.3f s arrays, %.3f s decimated to %d" % (
+        numPlanes, numPoints, times[0], times[1], len(paths[icaos[0]])))
+    return times[0], times[1]
+
+
+def benchmarkRouteLoading(numTracks=1000, numPoints=500):
+    """
+    Measures loading flightradar24 style CSV tracks with Routes.RouteStore,
+    parsing the files into the cache and memory-mapping the cache.
+
+    Parameters
+    ----------
+    numTracks : int
+        number of track files
+    numPoints : int
+        number of points per track
+
+    Returns
+    -------
+    tuple(float, float)
+        seconds to parse the tracks and to load the cache
+    """
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(numTracks):
+            with open(os.path.join(directory, "track%d.csv" % i), "w") as file:
+                file.write("Timestamp,UTC,Callsign,Position,Altitude,Speed,Direction\n")
+                for t, (lon, lat) in enumerate(rng.uniform((99.4, 9.4), (116.5, 23.2), (numPoints, 2)).tolist()):
+                    file.write('%d,,TEST,"%r,%r",10000,450,0\n' % (t, lat, lon))
+
+        start = time.perf_counter()
+        Routes.RouteStore(directory)
+        parseTime = time.perf_counter() - start
+        start = time.perf_counter()
+        Routes.RouteStore(directory)
+        cacheTime = time.perf_counter() - start
+
+    print("Routes (%d tracks x %d points): %.3f s parsing, %.4f s from the cache" % (
+        numTracks, numPoints, parseTime, cacheTime))
+    return parseTime, cacheTime
+
+
+def benchmarkRecorder(numRows=500000, chunkSize=65536):
+    """
+    Measures recording truth positions with Recorder.Recorder and reading
+    them back with the chunk iterator.
+
+    Parameters
+    ----------
+    numRows : int
+        number of recorded positions
+    chunkSize : int
+        number of rows per segment
+
+    Returns
+    -------
+    tuple(float, float)
+        rows per second recorded and read
+    """
+
+    rng = np.random.default_rng(0)
+    lons = rng.uniform(99.4, 116.5, numRows)
+    lats = rng.uniform(9.4, 23.2, numRows)
+    icaos = ["%06x" % icao for icao in rng.integers(1, 16777214, 100)]
+    rows = list(zip(np.arange(numRows, dtype=float).tolist(), (icaos[i % 100] for i in range(numRows)),
+                    lons.tolist(), lats.tolist()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = Recorder.Recorder(directory, chunkSize)
+        start = time.perf_counter()
+        for row in rows:
+            recorder.record('truth', *row)
+        recorder.flush()
+        recordRate = numRows / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        chunks = list(Recorder.readChunks(directory, 'truth'))
+        readRate = numRows / (time.perf_counter() - start)
+
+    print("Recorder: %.0f rows/s recorded, %.0f rows/s read in %d segments" % (recordRate, readRate, len(chunks)))
+    return recordRate, readRate
+
+
+def benchmarkReplay(numFrames=200000, numPlanes=100, corruptionRate=0.5):
+    """
+    Measures capturing frames, reading them back and replaying them into a
+    groundstation without channel simulation, for the AVR and the Beast
+    format, compared with decoding the frames one by one.
+
+    Parameters
+    ----------
+    numFrames : int
+        number of captured frames
+    numPlanes : int
+        number of planes transmitting position frames
+    corruptionRate : float
+        share of frames with a flipped bit
+
+    Returns
+    -------
+    dict
+        frames per second of every measurement
+    """
+
+    rng = np.random.default_rng(0)
+    coders = [ADSB.ADSB_coder() for _ in range(numPlanes)]
+    icaos = ["%06X" % icao for icao in rng.integers(1, 16777214, numPlanes)]
+    planes = rng.integers(0, numPlanes, numFrames).tolist()
+    lons = rng.uniform(105, 107, numFrames).tolist()
+    lats = rng.uniform(20, 22, numFrames).tolist()
+    frames = [coders[i].encodePositionFrame(17, 5, icaos[i], 0, 1, 10000, lat, lon)
+              for i, lat, lon in zip(planes, lats, lons)]
+    flips = rng.integers(0, 112, numFrames).tolist()
+    frames = [frame ^ (1 << bit) if corrupt else frame
+              for frame, bit, corrupt in zip(frames, flips, (rng.random(numFrames) < corruptionRate).tolist())]
+    times = np.arange(numFrames) * 0.5 / numPlanes
+
+    results = {}
+    reference = Groundstation.Groundstation("Replay_ID", (106.0, 21.0), "Replay", 370000)
+    start = time.perf_counter()
+    for frame, t in zip(frames, times.tolist()):
+        reference._process(reference.adsb_coder.decodeFrame(frame, True, t), t, "", False)
+    results['decode'] = numFrames / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for format in ('avr', 'beast'):
+            path = os.path.join(directory, "capture." + format)
+            start = time.perf_counter()
+            with Capture.FrameWriter(path) as writer:
+                for frame, t in zip(frames, times.tolist()):
+                    writer.write(t, frame)
+            results[format + ' write'] = numFrames / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Capture.readFrames(path)
+            results[format + ' read'] = numFrames / (time.perf_counter() - start)
+
+            groundstation = Groundstation.Groundstation("Replay_ID", (106.0, 21.0), "Replay", 370000)
+            start = time.perf_counter()
+            Capture.replay(path, groundstation)
+            results[format + ' replay'] = numFrames / (time.perf_counter() - start)
+
+    print("Capture: " + ", ".join("%s %.0f frames/s" % item for item in results.items()))
+    return results
+
+
+def benchmarkRelay(numMessages=50000, messageRate=40.0, bitrates=(2400, 4800, 9600), window=0.5):
+    """
+    Offers messages at a fixed rate to the store-and-forward satellite and
+    measures the relayed messages, the queueing latency and the dropped
+    messages per downlink bitrate, and the messages per second of wall time
+    the relay model handles.
+
+    Parameters
+    ----------
+    numMessages : int
+        number of messages received by the satellite
+    messageRate : float
+        messages per second of simulated time
+    bitrates : tuple(int)
+        downlink bitrates [bit/s]
+    window : float
+        reception window in [s]
+
+    Returns
+    -------
+    dict
+        bitrate -> (forwarded messages, mean latency [s], dropped messages, messages per second of wall time)
+    """
+
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.uniform(0, numMessages / messageRate, numMessages))
+    messages = _positionMessages(numMessages)
+    bounds = np.searchsorted(times, np.arange(0, times[-1] + window, window))
+    groundstations = [Parameters.hanoiAirport]
+
+    results = {}
+    for bitrate in bitrates:
+        Parameters.satellite_downlink_bitrate, default = bitrate, Parameters.satellite_downlink_bitrate
+        satellite = CommSat.CommSat()
+        satellite.channel = None  # the messages are not placed on the 1090 MHz channel
+        transmissions = [Transmission.Transmission(message, "Plane_ID", False, satellite.id,
+                                                   channel_model='bpsk-ber-rayleigh', time=t)
+                         for message, t in zip(messages, times.tolist())]
+        for transmission in transmissions:
+            transmission.received = transmission.data  # no channel simulation
+
+        start = time.perf_counter()
+        for i, (first, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+            satellite.transmit(groundstations, i * window, window)
+            satellite.receive(transmissions[first:end], i * window)
+        elapsed = time.perf_counter() - start
+        Parameters.satellite_downlink_bitrate = default
+
+        results[bitrate] = (satellite.numForwardedMessages,
+                            satellite.totalLatency / max(satellite.numForwardedMessages, 1),
+                            satellite.numDroppedMessages, numMessages / elapsed)
+        print("Relay at %d bit/s, %.0f messages/s offered: %d forwarded, latency mean %.2f s, %d dropped, "
+              "%.0f messages/s" % ((bitrate, messageRate) + results[bitrate]))
+    return results
+
+
+def benchmarkConstellation(numPlanes=5000, duration=3600.0, timestep=10.0):
+    """
+    Measures the visibility cache of the 66 satellite constellation: the
+    grid steps per second of wall time when planes and satellites are
+    propagated and matched, and the uplink lookups per second.
+
+    Parameters
+    ----------
+    numPlanes : int
+        number of planes flying random routes
+    duration : float
+        simulated time covered by the cache in [s]
+    timestep : float
+        time between the grid times in [s]
+
+    Returns
+    -------
+    tuple(float, float)
+        grid steps per second and uplink lookups per second
+    """
+
+    np.random.seed(0)
+    planes = _randomPlanes(numPlanes)
+    fleet = Kinematics.Fleet(planes)
+    constellation = Constellation.Constellation(altitude=Parameters.satellite_altitude,
+                                                minElevation=Parameters.satellite_min_elevation)
+    numSteps = int(duration / timestep)
+    visibility = Constellation.VisibilityCache(constellation, fleet, [Parameters.hanoiAirport, Parameters.saigonAirport],
+                                               timestep, blockSize=numSteps)
+
+    start = time.perf_counter()
+    visibility.uplinkSatellites([0.0], [0])
+    visibility.downlinkStations(0.0)
+    stepRate = numSteps / (time.perf_counter() - start)
+
+    # the squitters of all planes in a 0.5 s window, 4.2 per second and plane
+    rng = np.random.default_rng(0)
+    numLookups = int(numPlanes * 4.2 * 0.5)
+    times = rng.uniform(0, duration - timestep, 200 * numLookups)
+    planeIndices = rng.integers(0, numPlanes, len(times))
+    start = time.perf_counter()
+    for first in range(0, len(times), numLookups):
+        visibility.uplinkSatellites(times[first:first + numLookups], planeIndices[first:first + numLookups])
+    lookupRate = len(times) / (time.perf_counter() - start)
+
+    print("Constellation of %d satellites and %d planes: %.0f visibility steps/s, %.0f uplink lookups/s" % (
+        len(constellation.satellites), numPlanes, stepRate, lookupRate))
+    return stepRate, lookupRate
+
+
+if __name__ == "__main__":
+    benchmarkSymbolChannels()
+    benchmarkTransmissionConstruction()
+    benchmarkCRC()
+    benchmarkCodec()
+    benchmarkCPRDecoding()
+    benchmarkNL()
+    benchmarkExecutionBackends()
+    benchmarkRicianSampler()
+    benchmarkAWGN()
+    benchmarkKinematics()
+    benchmarkReceiverIndex()
+    benchmarkScheduler()
+    benchmarkCollisions()
+    benchmarkTrajectories()
+    benchmarkRouteLoading()
+    benchmarkRecorder()
+    benchmarkReplay()
+    benchmarkRelay()
+    benchmarkConstellation()
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+
+CLOCK = 12e6  # [Hz] of the 48 bit timestamps of the AVR (MLAT) and Beast formats
+FRAME_BYTES = 14  # extended squitter, the simulation only transmits 112 bit frames
+BEAST_ESCAPE = 0x1a
+BEAST_LONG_FRAME = 0x33  # '3': Mode S long frame, '2' (short frame) and '1' (Mode A/C) are skipped when read
+BEAST_SHORT_FRAME = 0x32
+BEAST_MODE_AC = 0x31
+BEAST_PAYLOAD = {BEAST_MODE_AC: 6 + 1 + 2, BEAST_SHORT_FRAME: 6 + 1 + 7, BEAST_LONG_FRAME: 6 + 1 + 14}
+
+
+class FrameWriter:
+    # writes timestamped frames to a capture file, in the format 'avr' (text lines "@<timestamp><frame>;", the AVR
+    # format with MLAT timestamp) or 'beast' (binary messages 0x1a '3' <timestamp> <signal> <frame>, 0x1a in the
+    # message doubled). Timestamps are ticks of a 12 MHz clock since the start of the simulation.
+    # format: None chooses 'beast' for the extensions .beast and .bin, otherwise 'avr'
+    def __init__(self, path, format=None):
+        self.format = format or formatOf(path)
+        if self.format not in ('avr', 'beast'):
+            raise ValueError("Unknown capture format: " + str(self.format))
+        self.file = open(path, 'w' if self.format == 'avr' else 'wb')
+        self.numFrames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # time: [s], frame: hex string or integer of a 112 bit frame, signal: level 0-255 (Beast only)
+    def write(self, time, frame, signal=0):
+        ticks = int(round((time or 0.0) * CLOCK)) & 0xFFFFFFFFFFFF
+        if isinstance(frame, str):
+            frame = int(frame, 16)
+        if self.format == 'avr':
+            self.file.write("@%012X%028X;\n" % (ticks, frame))
+        else:
+            message = ticks.to_bytes(6, 'big') + bytes([signal]) + frame.to_bytes(FRAME_BYTES, 'big')
+            self.file.write(bytes([BEAST_ESCAPE, BEAST_LONG_FRAME]) + message.replace(b'\x1a', b'\x1a\x1a'))
+        self.numFrames += 1
+
+    def close(self):
+        self.file.close()
+
+
+# 'beast' for the extensions .beast and .bin, otherwise 'avr'
+def formatOf(path):
+    return 'beast' if os.path.splitext(path)[1].lower() in ('.beast', '.bin') else 'avr'
+
+
+# reads the 112 bit frames of a capture file. returns the times [s] (nan for AVR lines "*<frame>;" without
+# timestamp) and the frames as uint8 array of shape (N, 14). Shorter frames are skipped
+def readFrames(path, format=None):
+    if (format or formatOf(path)) == 'avr':
+        times = []
+        frames = []
+        with open(path) as file:
+            for line in file:
+                line = line.strip()
+                if line.startswith('@') and len(line) == 1 + 12 + 28 + 1:
+                    times.append(int(line[1:13], 16) / CLOCK)
+                    frames.append(line[13:-1])
+                elif line.startswith('*') and len(line) == 1 + 28 + 1:
+                    times.append(np.nan)
+                    frames.append(line[1:-1])
+        return np.array(times, dtype=float), \
+            np.frombuffer(bytes.fromhex(''.join(frames)), dtype=np.uint8).reshape(-1, FRAME_BYTES)
+
+    with open(path, 'rb') as file:
+        data = file.read()
+    times = []
+    frames = []
+    i = data.find(BEAST_ESCAPE)
+    while 0 <= i < len(data) - 1:
+        length = BEAST_PAYLOAD.get(data[i + 1])
+        if length is None:
+            i = data.find(BEAST_ESCAPE, i + 1)  # not a message start, resynchronize
+            continue
+        # payload without escapes, most messages contain no 0x1a
+        end = i + 2 + length
+        message = data[i + 2:end]
+        if BEAST_ESCAPE in message:
+            message, end = _unescape(data, i + 2, length)
+        if data[i + 1] == BEAST_LONG_FRAME and len(message) == length:
+            times.append(int.from_bytes(message[:6], 'big') / CLOCK)
+            frames.append(message[7:])
+        i = data.find(BEAST_ESCAPE, end)
+    return np.array(times, dtype=float), np.frombuffer(b''.join(frames), dtype=np.uint8).reshape(-1, FRAME_BYTES)
+
+
+# feeds the frames of a capture file into a groundstation (Groundstation.receiveFrames) without channel simulation,
+# frames without timestamp get the latest time before them. returns the number of frames
+def replay(path, groundstation, format=None):
+    times, frames = readFrames(path, format)
+    if len(times) and np.isnan(times).any():
+        times = np.fmax.accumulate(np.nan_to_num(times, nan=0.0))
+    groundstation.receiveFrames(frames, times)
+    return len(frames)
+
+
+# length bytes of the Beast message payload starting at data[start], doubled escape bytes are read once.
+# returns the payload and the index behind it
+def _unescape(data, start, length):
+    payload = bytearray()
+    i = start
+    while len(payload) < length and i < len(data):
+        if data[i] == BEAST_ESCAPE:
+            if i + 1 >= len(data) or data[i + 1] != BEAST_ESCAPE:
+                break  # start of the next message, the payload is truncated
+            i += 1
+        payload.append(data[i])
+        i += 1
+    return bytes(payload), i
@@ -0,0 +1,79 @@
+import numpy as np
+
+SPEED_OF_LIGHT = 299792458  # [m/s]
+
+
+class CollisionModel:
+    # shared 1090 MHz channel at one receiver. Frames of frameDuration [s] that overlap at the receiver are garbled,
+    # unless a frame is captureRatio [dB] stronger than every frame it overlaps with (capture effect), None: every
+    # overlap garbles. The frames of one reception window are resolved at once: sorted by arrival time, the frames
+    # overlapping every frame are found with two binary searches. The frames of the previous window that can
+    # still overlap with later arrivals are kept as interference, their own result is not revised.
+    def __init__(self, frameDuration=120e-6, captureRatio=3.0):
+        self.frameDuration = frameDuration
+        self.captureRatio = captureRatio
+        self.tailTimes = np.zeros(0)
+        self.tailLevels = np.zeros(0)
+
+    # times: arrival times [s], levels: received power [dB] of the frames of one window, not earlier than the
+    # frames of the previous window. returns True for every frame that is not garbled
+    def resolve(self, times, levels):
+        times = np.asarray(times, dtype=float).reshape(-1)
+        levels = np.broadcast_to(np.asarray(levels, dtype=float), times.shape)
+        byTime = np.argsort(times, kind='stable')
+        numTail = len(self.tailTimes)
+        allTimes = np.concatenate([self.tailTimes, times[byTime]])
+        merged = np.argsort(allTimes, kind='stable')
+        allTimes = allTimes[merged]
+        allLevels = np.concatenate([self.tailLevels, levels[byTime]])[merged]
+
+        # interval sweep: frame i overlaps the frames starting less than frameDuration before or after it
+        first = np.searchsorted(allTimes, allTimes - self.frameDuration, 'right')
+        end = np.searchsorted(allTimes, allTimes + self.frameDuration, 'left')
+        counts = end - first
+        clear = counts == 1
+        if self.captureRatio is not None:
+            # strongest other frame overlapping every busy frame
+            busy = np.flatnonzero(counts > 1)
+            pairs = counts[busy]
+            frame = np.repeat(busy, pairs)
+            other = np.repeat(first[busy], pairs) + np.arange(len(frame)) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+            isOther = frame != other
+            interference = np.full(len(allTimes), -np.inf)
+            np.maximum.at(interference, frame[isOther], allLevels[other[isOther]])
+            clear[busy] = allLevels[busy] >= interference[busy] + self.captureRatio
+
+        # frames that can overlap with frames arriving after the latest one
+        if len(allTimes):
+            tail = allTimes > allTimes[-1] - self.frameDuration
+            self.tailTimes = allTimes[tail]
+            self.tailLevels = allLevels[tail]
+
+        # results of the new frames in the order of times
+        result = np.empty(len(times), dtype=bool)
+        result[byTime] = clear[merged >= numTail]
+        return result
+
+    # splits the transmissions received in one window into decodable and garbled ones, see arrivals()
+    def receive(self, transmissions, timestamp=0.0):
+        if not transmissions:
+            return [], []  # idle receiver, e.g. a satellite of a constellation with no plane in view
+        times, levels = arrivals(transmissions, timestamp)
+        clear = self.resolve(times, levels)
+        decodable = [element for element, c in zip(transmissions, clear) if c]
+        garbled = [element for element, c in zip(transmissions, clear) if not c]
+        return decodable, garbled
+
+
+# arrival times [s] and relative received power [dB] of transmissions: the start of the transmission (timestamp if
+# unknown) plus the propagation delay, and the free-space path loss of the distance. Transmissions without a
+# distance arrive without delay at 0 dB
+def arrivals(transmissions, timestamp=0.0):
+    times = np.array([timestamp if element.time is None else element.time for element in transmissions], dtype=float)
+    distances = np.array([np.nan if element.distance is None else element.distance for element in transmissions],
+                         dtype=float)
+    known = ~np.isnan(distances)
+    times[known] += distances[known] / SPEED_OF_LIGHT
+    levels = np.zeros(len(transmissions))
+    levels[known] = -20 * np.log10(np.maximum(distances[known], 1.0))
+    return times, levels
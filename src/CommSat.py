@@ -1,27 +1,114 @@
+import collections
+import math
+
+import numpy as np
+
+import Collision
+import Kinematics
 import Parameters
 import Transmission
 
 
 class CommSat:
-    def __init__(self):
-        self.id = "Sat_ID"
-        self.data = []
+    # store-and-forward relay: received messages wait in a bounded queue until the downlink to the groundstation
+    # with the highest elevation has time for them. The downlink transmits one message after the other at
+    # Parameters.satellite_downlink_bitrate, messages of a full queue are dropped by Parameters.satellite_drop_policy.
+    # position: lon-lat [deg] of the subsatellite point, altitude: [m]
+    def __init__(self, id="Sat_ID", position=None, altitude=None):
+        self.id = id
+        self.position = Parameters.satellite_position if position is None else position
+        self.altitude = Parameters.satellite_altitude if altitude is None else altitude
+        # ring buffer of (time the aircraft sent the message [s], message)
+        self.queue = collections.deque(maxlen=Parameters.satellite_queue_size)
+        self.dropPolicy = Parameters.satellite_drop_policy
+        if self.dropPolicy not in ('oldest', 'newest'):
+            raise ValueError("Unknown drop policy: " + str(self.dropPolicy))
+        self.downlinkFree = 0.0  # [s] end of the last downlink transmission
+        # 1090 MHz channel shared by all planes in view, None if transmissions do not interfere
+        self.channel = Collision.CollisionModel(Parameters.adsb_frame_duration, Parameters.capture_ratio_dB) \
+            if Parameters.collision_model else None
+        self.numGarbledMessages = 0  # messages lost to overlapping frames
+        self.numDroppedMessages = 0  # messages lost to the full queue
+        self.numForwardedMessages = 0
+        self.totalLatency = 0.0  # [s] from the transmission by the plane to the downlink, of all forwarded messages
+        self.maxLatency = 0.0
+        self.recorder = None  # Recorder.Recorder of the links and the relayed messages, None to record nothing
+
+    # elevation [deg] of the satellite above the horizon of every groundstation
+    def elevations(self, groundstations):
+        positions = np.array([gs.position for gs in groundstations], dtype=float).reshape(-1, 2)
+        angle = Kinematics.centralAngle(np.array([self.position], dtype=float), positions)
+        ratio = Kinematics.EARTH_RADIUS / (Kinematics.EARTH_RADIUS + self.altitude)
+        return np.degrees(np.arctan2(np.cos(angle) - ratio, np.sin(angle)))
+
+    # groundstation with the highest elevation above Parameters.satellite_min_elevation, None if none sees the satellite
+    def downlinkStation(self, groundstations):
+        if not groundstations:
+            return None
+        elevations = self.elevations(groundstations)
+        best = int(np.argmax(elevations))
+        return groundstations[best] if elevations[best] >= Parameters.satellite_min_elevation else None
 
-    def transmit(self, groundstations):
+    # True if queued messages can be forwarded to one of the groundstations
+    def canForward(self, groundstations):
+        return len(self.queue) > 0 and self.downlinkStation(groundstations) is not None
+
+    # forwards queued messages to the best visible groundstation, as many as the downlink can transmit
+    # between time and time + duration [s] (all of them if duration is None)
+    def transmit(self, groundstations, time=0.0, duration=None):
 
         transmission = []
-        for element in self.data:
-            for gs in groundstations:
-                transmission.append(Transmission.Transmission(element, self.id, True, gs.id, carrier_frequency=Parameters.sat_freq,
-                                                              SNRdB=Parameters.satellite_to_groundstation_SNRdB))
-            self.data.remove(element)
+        gs = self.downlinkStation(groundstations)
+        if gs is None:
+            return transmission
+        start = max(time, self.downlinkFree)
+        end = math.inf if duration is None else time + duration
+        while self.queue and start < end:
+            received, element = self.queue.popleft()
+            transmission.append(Transmission.Transmission(element, self.id, True, gs.id, carrier_frequency=Parameters.sat_freq,
+                                                          channel_model=Parameters.satellite_to_groundstation_channel_model,
+                                                          SNRdB=Parameters.satellite_to_groundstation_SNRdB,
+                                                          seed=Parameters.rng.nextSeed('link', self.id, gs.id),
+                                                          K_factor=Parameters.satellite_to_groundstation_K_factor,
+                                                          time=start, origin_time=received))
+            latency = start - received
+            self.numForwardedMessages += 1
+            self.totalLatency += latency
+            self.maxLatency = max(self.maxLatency, latency)
+            if self.recorder is not None:
+                self.recorder.record('relay', start, self.id, gs.id, latency)
+            start += 4 * len(element) / Parameters.satellite_downlink_bitrate  # 4 bits per hex digit
+        self.downlinkFree = start
 
         return transmission
 
-    def receive(self, transmission):
+    # transmission: transmissions addressed to the satellite, see Transmission.TransmissionDispatcher
+    # timestamp: simulation time of the reception in seconds, used for transmissions without a time
+    def receive(self, transmission, timestamp=None):
+
+        garbled = []
+        if self.channel is not None:
+            transmission, garbled = self.channel.receive(transmission, timestamp or 0.0)
+            self.numGarbledMessages += len(garbled)
+        if self.recorder is not None:
+            for elements, isGarbled in ((transmission, False), (garbled, True)):
+                for element in elements:
+                    self.recorder.record('link', timestamp if element.time is None else element.time, element.src,
+                                         self.id, element.SNRdB, element.channel_model, isGarbled)
 
         for element in transmission:
-            if element.dest == self.id:
-                transmitted = element.transmit()
+            transmitted = element.getReceived()
+
+            if len(self.queue) == self.queue.maxlen:
+                self.numDroppedMessages += 1
+                if self.dropPolicy == 'newest':
+                    continue
+                # the deque drops the oldest message when appending
+            self.queue.append((timestamp if element.time is None else element.time, transmitted))
 
-                self.data.append(transmitted)
+    def printRelayStats(self):
+        meanLatency = "%.2f" % (self.totalLatency / (self.numForwardedMessages + 0.0001))  # prevent div/0
+        print("Satellite " + self.id + " forwarded " + str(self.numForwardedMessages) + " messages, latency mean "
+              + meanLatency + " s, max " + "%.2f" % self.maxLatency + " s.")
+        print("  dropped " + str(self.numDroppedMessages) + " messages at the full queue, " + str(len(self.queue))
+              + " still queued, lost " + str(self.numGarbledMessages) + " messages to collisions.")
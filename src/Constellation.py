@@ -0,0 +1,129 @@
+import numpy as np
+
+import CommSat
+import Kinematics
+
+EARTH_MU = 3.986004418e14  # [m^3/s^2], gravitational parameter of the earth
+EARTH_ROTATION = 7.2921159e-5  # [rad/s]
+
+
+class Constellation:
+    # satellites on circular orbits in a Walker star pattern like Iridium: numOrbits orbital planes with their
+    # ascending nodes spread over raanSpread [deg], satellitesPerOrbit evenly spaced in every plane and every other
+    # plane shifted by half a spacing. The positions of all satellites are propagated at once.
+    # altitude: [m], inclination: [deg], minElevation: [deg] above the horizon to see a satellite
+    def __init__(self, numOrbits=6, satellitesPerOrbit=11, altitude=780000, inclination=86.4, raanSpread=180.0,
+                 minElevation=8.2):
+        orbit, slot = np.divmod(np.arange(numOrbits * satellitesPerOrbit), satellitesPerOrbit)
+        self.raan = np.radians(raanSpread) * orbit / numOrbits
+        self.phase = 2 * np.pi * (slot + 0.5 * (orbit % 2)) / satellitesPerOrbit
+        self.inclination = np.radians(inclination)
+        self.altitude = altitude
+        radius = Kinematics.EARTH_RADIUS + altitude
+        self.meanMotion = np.sqrt(EARTH_MU / radius ** 3)  # [rad/s]
+        # largest central angle between a satellite and a point that sees it above minElevation
+        minElevation = np.radians(minElevation)
+        self.maxAngle = np.arccos(Kinematics.EARTH_RADIUS / radius * np.cos(minElevation)) - minElevation
+        self.satellites = [CommSat.CommSat("Sat_%02d" % i, tuple(position), altitude)
+                           for i, position in enumerate(self.positionsAt(0.0).tolist())]
+
+    # earth fixed unit vectors to all satellites t seconds after the start, shape (satellites, 3)
+    def directionsAt(self, t):
+        u = self.phase + self.meanMotion * t  # argument of latitude
+        x = np.cos(self.raan) * np.cos(u) - np.sin(self.raan) * np.sin(u) * np.cos(self.inclination)
+        y = np.sin(self.raan) * np.cos(u) + np.cos(self.raan) * np.sin(u) * np.cos(self.inclination)
+        z = np.sin(u) * np.sin(self.inclination)
+        # the earth turns below the orbits
+        rotation = -EARTH_ROTATION * t
+        return np.stack([x * np.cos(rotation) - y * np.sin(rotation), x * np.sin(rotation) + y * np.cos(rotation), z],
+                        axis=-1)
+
+    # lon-lat [deg] of the subsatellite points t seconds after the start
+    def positionsAt(self, t):
+        return toPositions(self.directionsAt(t))
+
+    # moves all satellites to their positions t seconds after the start
+    def update(self, t):
+        for satellite, position in zip(self.satellites, self.positionsAt(t).tolist()):
+            satellite.position = tuple(position)
+
+    # index of the target with the highest elevation for every source, -1 if none is above the minimum elevation.
+    # sources, targets: earth fixed unit vectors, the elevation is highest for the smallest central angle
+    def best(self, sources, targets):
+        if len(targets) == 0:
+            return np.full(len(sources), -1, dtype=np.intp)
+        cosAngles = sources @ targets.T
+        best = np.argmax(cosAngles, axis=1)
+        visible = cosAngles[np.arange(len(sources)), best] >= np.cos(self.maxAngle)
+        return np.where(visible, best, -1)
+
+    def printRelayStats(self):
+        forwarded = sum(satellite.numForwardedMessages for satellite in self.satellites)
+        meanLatency = "%.2f" % (sum(satellite.totalLatency for satellite in self.satellites) / (forwarded + 0.0001))  # prevent div/0
+        maxLatency = "%.2f" % max(satellite.maxLatency for satellite in self.satellites)
+        print("Constellation of " + str(len(self.satellites)) + " satellites forwarded " + str(forwarded)
+              + " messages, latency mean " + meanLatency + " s, max " + maxLatency + " s.")
+        print("  dropped " + str(sum(satellite.numDroppedMessages for satellite in self.satellites))
+              + " messages at full queues, " + str(sum(len(satellite.queue) for satellite in self.satellites))
+              + " still queued, lost " + str(sum(satellite.numGarbledMessages for satellite in self.satellites))
+              + " messages to collisions.")
+
+
+class VisibilityCache:
+    # best satellite of every plane and best groundstation of every satellite on a time grid of timestep [s].
+    # The grid is computed in blocks of blockSize steps when first needed, with one matrix product of unit vectors
+    # per step, and the blocks before the previous one are evicted as the simulation time only moves forward.
+    # Lookups take the nearest grid step
+    def __init__(self, constellation, fleet, groundstations, timestep=10.0, blockSize=360):
+        self.constellation = constellation
+        self.fleet = fleet
+        self.groundstations = groundstations
+        self.stations = toDirections(np.array([gs.position for gs in groundstations], dtype=float).reshape(-1, 2))
+        self.timestep = timestep
+        self.blockSize = blockSize
+        self.uplinkBlocks = {}  # block -> (steps, planes) best satellite
+        self.downlinkBlocks = {}  # block -> (steps, satellites) best groundstation
+
+    # indices of the satellites receiving the uplinks of the planes (indices into fleet) at times [s], -1 if no
+    # satellite is visible
+    def uplinkSatellites(self, times, planes):
+        steps = np.rint(np.asarray(times, dtype=float) / self.timestep).astype(np.int64)
+        satellites = np.full(len(steps), -1, dtype=np.intp)
+        for block in np.unique(steps // self.blockSize).tolist():
+            rows = steps // self.blockSize == block
+            grid = self._block(self.uplinkBlocks, block, self._uplinks)
+            satellites[rows] = grid[steps[rows] % self.blockSize, np.asarray(planes)[rows]]
+        return satellites
+
+    # groundstation of the downlink of every satellite at time t [s], None if the satellite sees none
+    def downlinkStations(self, t):
+        step = int(round(t / self.timestep))
+        grid = self._block(self.downlinkBlocks, step // self.blockSize, self._downlinks)
+        return [self.groundstations[i] if i >= 0 else None for i in grid[step % self.blockSize].tolist()]
+
+    def _block(self, blocks, block, compute):
+        if block not in blocks:
+            for old in [old for old in blocks if old < block - 1]:
+                del blocks[old]
+            times = (block * self.blockSize + np.arange(self.blockSize)) * self.timestep
+            blocks[block] = np.stack([compute(t) for t in times.tolist()])
+        return blocks[block]
+
+    def _uplinks(self, t):
+        planes = toDirections(self.fleet.positionsAt(t).reshape(-1, 2))
+        return self.constellation.best(planes, self.constellation.directionsAt(t)).astype(np.int16)
+
+    def _downlinks(self, t):
+        return self.constellation.best(self.constellation.directionsAt(t), self.stations).astype(np.int16)
+
+
+# earth fixed unit vectors of lon-lat positions [deg]
+def toDirections(positions):
+    lon, lat = np.radians(positions).T
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+# lon-lat positions [deg] of earth fixed unit vectors
+def toPositions(directions):
+    x, y, z = directions.T
+    return np.degrees(np.stack([np.arctan2(y, x), np.arcsin(np.clip(z, -1, 1))], axis=-1))
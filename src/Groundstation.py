@@ -1,46 +1,109 @@
+import numpy as np
+
 import ADSB
+import Collision
 import Parameters
+import Trajectory
 
 
 class Groundstation:
     def __init__(self, id, position, name, antenna_range):
         self.id = id
         self.name = name
-        self.adsb_coder = ADSB.ADSB_coder()
         self.position = position
+        self.adsb_coder = ADSB.ADSB_coder(referencePosition=position if Parameters.local_cpr_decoding else None,
+                                          referenceRange=antenna_range)
         self.recRange = antenna_range
-        self.receivedPositions = []
+        self.receivedPositions = Trajectory.Trajectories()  # decoded positions per ICAO address
         self.numReceivedMessagesFromPlane = 0
         self.numReceivedMessagesFromSat = 0
         self.numCorruptedMessagesFromPlane = 0
         self.numCorruptedMessagesFromSat = 0
+        self.numGlobalFixes = 0  # positions decoded from an even/odd message pair
+        self.numLocalFixes = 0  # positions decoded from a single message using a reference position
+        # 1090 MHz channel shared by all planes in range, None if transmissions do not interfere
+        self.channel = Collision.CollisionModel(Parameters.adsb_frame_duration, Parameters.capture_ratio_dB) \
+            if Parameters.collision_model else None
+        self.numGarbledMessages = 0  # messages from planes lost to overlapping frames
+        # Recorder.Recorder of the links, decoded positions and CRC failures, None to keep the positions in memory
+        self.recorder = None
+        self.capture = None  # Capture.FrameWriter of the demodulated frames, None to capture nothing
+
+    # transmission: transmissions addressed to this groundstation, see Transmission.TransmissionDispatcher
+    # timestamp: simulation time of the reception in seconds, used for transmissions without a time
+    def receive(self, transmission, timestamp=None):
 
-    def receive(self, transmission):
+        garbled = set()
+        if self.channel is not None:
+            # messages of the satellite arrive on their own frequency
+            _, lost = self.channel.receive([element for element in transmission if element.src_is_satellite == False],
+                                           timestamp or 0.0)
+            self.numGarbledMessages += len(lost)
+            garbled = set(map(id, lost))
+        if self.recorder is not None:
+            for element in transmission:
+                self.recorder.record('link', timestamp if element.time is None else element.time, element.src,
+                                     self.id, element.SNRdB, element.channel_model, id(element) in garbled)
+        transmission = [element for element in transmission if id(element) not in garbled]
 
         for element in transmission:
-            if element.dest == self.id:
-                transmittedData = element.transmit()
-                if(element.src_is_satellite == True):
-                    self.numReceivedMessagesFromSat += 1
+            # time of the transmission if known, otherwise of the reception
+            time = timestamp if element.time is None else element.time
+            transmittedData = element.getReceived()
+            if(element.src_is_satellite == True):
+                self.numReceivedMessagesFromSat += 1
+            else:
+                self.numReceivedMessagesFromPlane += 1
+            if self.capture is not None:
+                self.capture.write(time, transmittedData)
+
+            # Process multiple positions received
+            # to decode msg, use msg = self.adsb_coder.decode(recData[i])
+            # to identify message type, use isinstance(msg, ADSB.ADSB_identification_msg), isinstance(msg, ADSB.ADSB_velocity_msg) or isinstance(msg, ADSB.ADSB_positional_msg)
+            # to get coordinates from positional message, use msg.decodedLat and msg.decodedLon ONLY if msg.latLonDecoded == True
+            # relayed frames are decoded at the time the aircraft sent them, not at the time of the downlink
+            sent = time if element.origin_time is None else element.origin_time
+            msg = self.adsb_coder.decode(transmittedData, True, sent, element.src_is_satellite)
+            self._process(msg, time, element.src, element.src_is_satellite)
+
+    # frames: uint8 array of shape (N, 14) of the 112 bit frames received at times [s], e.g. replayed from a capture
+    # (see Capture.replay). The checksums of all frames are checked at once, only the valid frames are decoded
+    def receiveFrames(self, frames, times, fromSatellite=False):
+        frames = np.asarray(frames, dtype=np.uint8).reshape(-1, 14)
+        valid = self.adsb_coder.checkCRCBatch(frames)
+        if fromSatellite:
+            self.numReceivedMessagesFromSat += len(frames)
+        else:
+            self.numReceivedMessagesFromPlane += len(frames)
+        data = frames.tobytes()
+        for i, (time, ok) in enumerate(zip(np.asarray(times, dtype=float).tolist(), valid.tolist())):
+            msg = self.adsb_coder.decodeFrame(data[14 * i:14 * i + 14], True, time, crcChecked=True,
+                                              fromSatellite=fromSatellite) if ok else False
+            self._process(msg, time, "", fromSatellite)
+
+    # counts and records a decoded message, msg is False if the checksum failed
+    def _process(self, msg, time, src, fromSatellite):
+        if (isinstance(msg, ADSB.ADSB_positional_msg)):
+            # print(self.name, "received")
+            if (msg.latLonDecoded == True):
+                if self.recorder is not None:
+                    self.recorder.record('fix', time, self.id, msg.ICAOaddress, msg.decodedLon, msg.decodedLat,
+                                         msg.decodedLocally)
                 else:
-                    self.numReceivedMessagesFromPlane += 1
-
-                # Process multiple positions received
-                # to decode msg, use msg = self.adsb_coder.decode(recData[i])
-                # to identify message type, use isinstance(msg, ADSB.ADSB_identification_msg) or isinstance(msg, ADSB.ADSB_positional_msg)
-                # to get coordinates from positional message, use msg.decodedLat and msg.decodedLon ONLY if msg.latLonDecoded == True
-                msg = self.adsb_coder.decode(transmittedData, True)
-                if (isinstance(msg, ADSB.ADSB_positional_msg)):
-                    # print(self.name, "received")
-                    if (msg.latLonDecoded == True):
-                        self.receivedPositions.append((msg.decodedLon, msg.decodedLat, msg.ICAOaddress))
-                elif (isinstance(msg, bool)):
-                    if msg == False:
-                        # message checksum failed
-                        if (element.src_is_satellite == True):
-                            self.numCorruptedMessagesFromSat += 1
-                        else:
-                            self.numCorruptedMessagesFromPlane += 1
+                    self.receivedPositions.append(msg.decodedLon, msg.decodedLat, msg.ICAOaddress)
+                if msg.decodedLocally:
+                    self.numLocalFixes += 1
+                else:
+                    self.numGlobalFixes += 1
+        elif (isinstance(msg, bool)):
+            if msg == False:
+                # message checksum failed
+                if self.recorder is not None:
+                    self.recorder.record('crc', time, self.id, src, fromSatellite)
+                if (fromSatellite == True):
+                    self.numCorruptedMessagesFromSat += 1
+                else:
+                    self.numCorruptedMessagesFromPlane += 1
 
     def printCorruptedMessageRate(self):
 
@@ -49,4 +112,16 @@ class Groundstation:
         corruptionRatePlane = "%.2f" % (((self.numCorruptedMessagesFromPlane) / (self.numReceivedMessagesFromPlane+0.0001)) * 100)  # prevent div/0
         print("Groundstation " + self.name + " received " + corruptionRate + "% corrupted messages.")
         print("  Groundstation " + self.name + " received " + corruptionRatePlane + "% corrupted messages from planes. (of " + str(self.numReceivedMessagesFromPlane) + ")")
-        print("  Groundstation " + self.name + " received " + corruptionRateSat + "% corrupted messages from satellites. (of " + str(self.numReceivedMessagesFromSat) + ")")
\ No newline at end of file
+        print("  Groundstation " + self.name + " received " + corruptionRateSat + "% corrupted messages from satellites. (of " + str(self.numReceivedMessagesFromSat) + ")")
+        if self.channel is not None:
+            garbleRate = "%.2f" % (self.numGarbledMessages / (self.numGarbledMessages + self.numReceivedMessagesFromPlane + 0.0001) * 100)  # prevent div/0
+            print("  Groundstation " + self.name + " lost " + garbleRate + "% of the messages from planes to collisions. (" + str(self.numGarbledMessages) + " garbled)")
+
+    # duration: simulated time in seconds
+    def printFixRate(self, duration):
+
+        globalRate = "%.2f" % (self.numGlobalFixes / duration)
+        totalRate = "%.2f" % ((self.numGlobalFixes + self.numLocalFixes) / duration)
+        gain = "%.2f" % (self.numLocalFixes / (self.numGlobalFixes + 0.0001) * 100)  # prevent div/0
+        print("Groundstation " + self.name + " decoded " + totalRate + " positions per second.")
+        print("  " + globalRate + " per second from even/odd pairs, local decoding adds " + gain + "% (" + str(self.numLocalFixes) + " positions)")
@@ -0,0 +1,156 @@
+import geopy.distance
+import numpy as np
+
+EARTH_RADIUS = 6371000  # [m], radius of the spherical earth model (as great_circle_calculator)
+TRACK_LOOKAHEAD = 100.0  # [m] along the route to the point that gives the direction of flight
+
+
+class Route:
+    # flightpath preprocessed once into cumulative distances, so the position after any flown distance is a
+    # binary search plus a great circle interpolation. The waypoint list is not modified.
+    # points: lon-lat [deg] of the start and all waypoints, distances: [m] from the start to every point.
+    # geodesic: segment lengths on the WGS-84 ellipsoid with geopy instead of on the sphere. This only changes the
+    # timing, i.e. when a plane reaches a waypoint. Between waypoints the positions are interpolated along the great
+    # circle of the sphere (intermediatePoint) in both cases, at the fraction of the segment length flown
+    def __init__(self, start, waypoints, geodesic=False):
+        self.points = np.array([start] + list(waypoints), dtype=float).reshape(-1, 2)
+        # central angle of the segment starting at every point, 0 behind the last point
+        self.angles = np.append(centralAngle(self.points[:-1], self.points[1:]), 0.0)
+        if geodesic:
+            # geopy expects lat-lon order
+            segments = [geopy.distance.distance(p[::-1], w[::-1]).m
+                        for p, w in zip(self.points[:-1].tolist(), self.points[1:].tolist())]
+        else:
+            segments = EARTH_RADIUS * self.angles[:-1]
+        self.distances = np.concatenate([[0.0], np.cumsum(segments)])
+        self.length = self.distances[-1]
+
+    # lon-lat position [deg] after the flown distance [m], scalar or array. The position stays at the
+    # last waypoint once the route is completed
+    def positionAt(self, distance):
+        positions = interpolateRoutes(self.points, self.angles, self.distances, self.distances,
+                                      np.asarray(distance, dtype=float), 0.0, 0, len(self.points) - 1)
+        return tuple(positions.tolist()) if positions.ndim == 1 else positions
+
+    # true track [deg clockwise from north] after the flown distance [m], the direction to the point
+    # TRACK_LOOKAHEAD further along the route
+    def trackAt(self, distance):
+        distance = np.asarray(distance, dtype=float)
+        tracks = bearing(self.positionAt(distance), self.positionAt(distance + TRACK_LOOKAHEAD))
+        return float(tracks) if tracks.ndim == 0 else tracks
+
+
+class Fleet:
+    # kinematic state of many planes as arrays, all planes are advanced in one vectorized step.
+    # The routes of all planes are concatenated, every plane's state is the distance flown along its route,
+    # so the fleet can be stepped or looked up at any point in time without touching the routes.
+    # positions: lon-lat [deg], heights: [m], speeds: [m/s], flown: [m]
+    def __init__(self, planes):
+        self.planes = planes
+        self.heights = np.array([plane.height for plane in planes], dtype=float)
+        self.speeds = np.array([plane.speed for plane in planes], dtype=float)
+        self.flown = np.array([plane.distanceFlown for plane in planes], dtype=float)
+        routes = [plane.route for plane in planes]
+        self.lengths = np.array([route.length for route in routes])
+        # first and last point of every route in the concatenated arrays
+        counts = np.array([len(route.points) for route in routes], dtype=np.intp)
+        self.last = np.cumsum(counts) - 1
+        self.first = self.last - counts + 1
+        self.points = np.concatenate([route.points for route in routes]) if routes else np.zeros((0, 2))
+        self.angles = np.concatenate([route.angles for route in routes]) if routes else np.zeros(0)
+        self.distances = np.concatenate([route.distances for route in routes]) if routes else np.zeros(0)
+        # distances shifted by an offset per route so they increase over all routes and one binary search finds
+        # the segment of every plane
+        self.offsets = np.cumsum(self.lengths + 1.0) - (self.lengths + 1.0)
+        self.keys = self.distances + np.repeat(self.offsets, counts)
+        self.positions = self._positions(np.arange(len(planes)))
+
+    # updates the positions of all planes that have not arrived after x seconds, like Plane.updatePos.
+    # returns the indices of the moved planes
+    def updatePos(self, timestep):
+        moving = np.flatnonzero(~self.atDestination())
+        self.flown[moving] += self.speeds[moving] * timestep
+        self.positions[moving] = self._positions(moving)
+        return moving
+
+    # lon-lat positions [deg] of all planes t seconds after the start, without changing the fleet.
+    # planes: indices of the planes to look up, t then may be an array with one time per plane
+    def positionsAt(self, t, planes=None):
+        if planes is None:
+            planes = np.arange(len(self.planes))
+        return interpolateRoutes(self.points, self.angles, self.distances, self.keys, self.speeds[planes] * t,
+                                 self.offsets[planes], self.first[planes], self.last[planes])
+
+    # true tracks [deg clockwise from north] of the planes t seconds after the start, like Route.trackAt
+    def tracksAt(self, t, planes=None):
+        if planes is None:
+            planes = np.arange(len(self.planes))
+        flown = self.speeds[planes] * t
+        ahead = interpolateRoutes(self.points, self.angles, self.distances, self.keys, flown + TRACK_LOOKAHEAD,
+                                  self.offsets[planes], self.first[planes], self.last[planes])
+        return bearing(self.positionsAt(t, planes), ahead)
+
+    # True for every plane (or the planes given by indices) that has completed its route t seconds after the start
+    def arrivedAt(self, t, planes=None):
+        if planes is None:
+            planes = np.arange(len(self.planes))
+        return self.speeds[planes] * t >= self.lengths[planes]
+
+    # True for every plane that has completed its route
+    def atDestination(self):
+        return self.flown >= self.lengths
+
+    def _positions(self, planes):
+        return interpolateRoutes(self.points, self.angles, self.distances, self.keys, self.flown[planes],
+                                 self.offsets[planes], self.first[planes], self.last[planes])
+
+
+# lon-lat positions [deg] after the flown distances along routes stored as concatenated arrays:
+# points[first:last + 1] are the points of a route, distances the cumulative distances from its start,
+# keys the distances plus the offset of every route and angles[i] the central angle from point i to point i + 1.
+# Flown distances past the end of a route give its last point
+def interpolateRoutes(points, angles, distances, keys, flown, offset, first, last):
+    flown = np.minimum(flown, distances[last])
+    # segment start: last point not behind the flown distance, zero length segments are skipped
+    index = np.searchsorted(keys, flown + offset, 'right') - 1
+    index = np.clip(index, first, np.maximum(last - 1, first))
+    end = np.minimum(index + 1, last)
+    segment = distances[end] - distances[index]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(segment > 0, (flown - distances[index]) / segment, 1.0)
+    return intermediatePoint(points[index], points[end], fraction, angles[index] * (end > index))
+
+
+# central angle [rad] between the lon-lat points [deg] of start and end, haversine formula
+def centralAngle(start, end):
+    lon1, lat1 = np.radians(start).T
+    lon2, lat2 = np.radians(end).T
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    a = np.minimum(a, 1)
+    return 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# initial bearing [deg clockwise from north] of the great circles from start to end (lon-lat [deg]), 0 if they coincide
+def bearing(start, end):
+    lon1, lat1 = np.radians(start).T
+    lon2, lat2 = np.radians(end).T
+    x = np.sin(lon2 - lon1) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+    return np.degrees(np.arctan2(x, y)) % 360
+
+
+# lon-lat points [deg] at fraction of the great circles from start to end, fractions > 1 continue past end.
+# delta is the central angle between start and end if already known
+def intermediatePoint(start, end, fraction, delta=None):
+    lon1, lat1 = np.radians(start).T
+    lon2, lat2 = np.radians(end).T
+    delta = centralAngle(start, end) if delta is None else delta
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.sin((1 - fraction) * delta) / np.sin(delta)
+        b = np.sin(fraction * delta) / np.sin(delta)
+    x = a * np.cos(lat1) * np.cos(lon1) + b * np.cos(lat2) * np.cos(lon2)
+    y = a * np.cos(lat1) * np.sin(lon1) + b * np.cos(lat2) * np.sin(lon2)
+    z = a * np.sin(lat1) + b * np.sin(lat2)
+    points = np.degrees(np.stack([np.arctan2(y, x), np.arctan2(z, np.hypot(x, y))], axis=-1))
+    # a plane already at the waypoint stays there
+    return np.where((delta > 0)[..., np.newaxis], points, end)
@@ -1,31 +1,87 @@
+import os
+
 import Groundstation
 import Plane
+import RNG
+import Routes
 
 # Simulation parameters
-sim_timestep = 0.5 # simulation timestep in seconds. 0.5s recommended to match ADS-B position publishing frequency
+sim_timestep = 0.5 # reception window in seconds: squitters within one window are received together and forwarded by the satellite in the next
+# True: route distances and range limits on the WGS-84 ellipsoid (geopy, slower), False: on a sphere.
+# The route distances only change when a plane reaches a waypoint, it flies along the great circle between them
+kinematics_geodesic = False
+
+# Random numbers
+random_seed = None  # root seed of all random streams (ICAO addresses, fading, noise), None for a random seed
+rng = RNG.RNGService(random_seed)
+
+# ADS-B squitters, every plane schedules its own messages at these rates unless its squitterRates override them
+squitter_rates = {'position': 2.0, 'velocity': 2.0, 'identification': 0.2}  # [Hz] per message type
+squitter_jitter = 0.1  # fraction of 1 / rate by which the interval between two squitters varies uniformly
+
+# Execution of the channel simulations of one timestep
+execution_backend = 'serial'  # 'serial' | 'thread' | 'process'
+execution_workers = None  # number of threads / processes, None for the number of CPUs
+execution_chunk_size = 256  # number of messages simulated by one worker call
 
 # Signal to Noise Ratios
 plane_to_satellite_SNRdB = 6.1
 satellite_to_groundstation_SNRdB = 6.1
 plane_to_groundstation_SNRdB = 12
 
+# Channel models per link
+# 'bpsk-awgn-rayleigh' | 'bpsk-awgn-rice' simulate the sampled waveform,
+# 'bpsk-symbol-rayleigh' | 'bpsk-symbol-rice' | 'bpsk-ber-rayleigh' | 'bpsk-ber-rice' are much faster symbol-level
+# equivalents with the same corruption rates
+plane_to_satellite_channel_model = 'bpsk-awgn-rice'
+satellite_to_groundstation_channel_model = 'bpsk-awgn-rayleigh'
+plane_to_groundstation_channel_model = 'bpsk-awgn-rayleigh'
+
+# Rician K-factors per link (power of the line of sight over the scattered power), used by the '*-rice' models.
+# These fade a whole message with one gain against the noise of the transmitted signal, a larger K-factor
+# means fewer deep fades and fewer corrupted messages
+plane_to_satellite_K_factor = 0.5
+satellite_to_groundstation_K_factor = 0.5
+plane_to_groundstation_K_factor = 0.5
+
 # Signal Frequencies
 sat_freq = 1616000000  # 1616MHz (Iridium Frequency)
 adsb_freq = 1090000000  # 1090MHz (ADS-B Frequency)
 
+# Communication satellite, stores the received messages and forwards them to a groundstation in view
+satellite_position = (110.0, 18.0)  # lon-lat [deg] of the subsatellite point
+satellite_altitude = 780000  # [m] (Iridium)
+satellite_min_elevation = 8.2  # [deg] above the horizon of a groundstation to have a downlink
+satellite_queue_size = 10000  # messages stored at most
+satellite_drop_policy = 'oldest'  # 'oldest' | 'newest': message dropped when a message arrives at the full queue
+satellite_downlink_bitrate = 2400  # [bit/s] of the downlink, messages are transmitted one after the other
+
+# Satellite constellation on circular orbits instead of the single satellite above, every uplink goes to the
+# satellite with the highest elevation (satellite_altitude and satellite_min_elevation apply)
+satellite_constellation = False
+constellation_orbits = 6  # orbital planes (Iridium: 6 planes of 11 satellites)
+constellation_satellites_per_orbit = 11
+constellation_inclination = 86.4  # [deg]
+constellation_raan_spread = 180.0  # [deg] over which the ascending nodes of the orbits are spread (Walker star)
+visibility_timestep = 10.0  # [s] of the cached plane-satellite and satellite-groundstation visibility grid
+
+# 1090 MHz channel occupancy at the receivers (groundstations and satellite)
+collision_model = True  # False: every transmission is received independently of the traffic
+adsb_frame_duration = 120e-6  # [s] of an extended squitter
+capture_ratio_dB = 3.0  # an overlapped frame is still decoded if it is this much stronger than every other, None: overlaps always garble
+
 # Groundstations
 ground_station_antenna_range = 370000  # 370km
+local_cpr_decoding = True  # decode single position messages relative to the groundstation / last known position
 hanoiAirport = Groundstation.Groundstation("Hanoi_ID", (105.808817, 21.028511), "Hanoi", ground_station_antenna_range)
 saigonAirport = Groundstation.Groundstation("Saigon_ID", (106.660172, 10.762622), "HCMC", ground_station_antenna_range)
 groundstations = [hanoiAirport, saigonAirport]
 
-# Flightpaths exported from https://www.flightradar24.com
-flightpath_hcm_to_hanoi = [(106.660439, 10.815571),(106.660469, 10.81596),(106.6605, 10.816296),(106.660538, 10.816715),(106.660583, 10.817169),(106.660622, 10.817619),(106.660835, 10.818615),(106.66111, 10.818752),(106.661369, 10.818856),(106.661888, 10.819055),(106.662346, 10.819229),(106.662674, 10.819347),(106.663261, 10.819567),(106.663834, 10.819794),(106.66433, 10.819985),(106.664864, 10.820171),(106.665344, 10.820357),(106.665817, 10.820544),(106.666214, 10.820683),(106.666573, 10.820824),(106.666847, 10.820928),(106.667053, 10.821007),(106.667313, 10.821098),(106.667542, 10.82119),(106.667763, 10.821281),(106.667984, 10.821359),(106.66819, 10.82144),(106.668404, 10.82151),(106.668617, 10.821602),(106.668831, 10.821682),(106.669044, 10.821754),(106.669258, 10.821836),(106.669464, 10.821906),(106.669708, 10.822002),(106.670021, 10.822139),(106.670189, 10.822394),(106.67009, 10.822604),(106.669945, 10.822906),(106.669716, 10.823186),(106.669342, 10.823407),(106.669151, 10.823663),(106.669891, 10.823009),(106.668968, 10.8235),(106.668762, 10.823419),(106.667953, 10.823112),(106.666512, 10.822569),(106.664268, 10.821728),(106.660576, 10.820343),(106.655083, 10.818283),(106.65049, 10.816498),(106.645752, 10.814758),(106.638275, 10.811783),(106.632774, 10.809523),(106.626762, 10.807159),(106.6213, 10.805054),(106.616341, 10.803145),(106.610855, 10.801071),(106.60569, 10.79924),(106.600243, 10.797279),(106.594139, 10.795029),(106.588409, 10.792877),(106.581116, 10.790343),(106.578323, 10.789673),(106.574036, 10.788993),(106.570648, 10.788803),(106.567764, 10.788849),(106.562851, 10.789412),(106.559288, 10.790203),(106.555687, 10.791321),(106.553261, 10.792252),(106.548828, 10.794533),(106.545837, 10.796494),(106.5429, 10.798828),(106.540443, 10.801189),(106.537643, 10.804459),(106.53553, 10.807382),(106.53376, 10.810455),(106.532433, 10.813339),(106.531342, 10.816133),(106.530212, 10.820206),(106.529457, 10.824327),(106.529259, 10.827759),(106.529556, 10.833032),(106.530235, 10.836476),(106.53125, 10.839935),(106.532593, 10.843273),(106.534088, 10.846392),(106.53582, 10.84965),(106.537498, 10.85257),(106.539337, 10.855656),(106.541168, 10.858635),(106.543289, 10.862034),(106.544937, 10.8647),(106.54705, 10.868039),(106.548782, 10.870832),(106.556442, 10.883057),(106.564301, 10.895552),(106.572006, 10.907748),(106.579834, 10.92009),(106.587982, 10.932999),(106.595909, 10.945456),(106.603989, 10.957901),(106.612144, 10.970267),(106.620659, 10.983078),(106.629089, 10.995667),(106.637939, 11.009033),(106.659958, 11.04689),(106.679756, 11.082047),(106.702484, 11.122238),(106.723846, 11.160141),(106.759888, 11.221743),(106.762917, 11.225001),(106.766556, 11.228302),(106.769402, 11.230545),(106.774246, 11.233847),(106.776169, 11.235077),(106.781998, 11.238373),(106.786064, 11.240616),(106.790138, 11.242813),(106.794167, 11.245193),(106.797424, 11.2473),(106.808517, 11.257141),(106.811928, 11.261452),(106.814674, 11.265735),(106.816704, 11.269592),(106.818604, 11.274033),(106.820305, 11.279343),(106.821175, 11.283704),(106.821899, 11.28929),(106.822235, 11.294318),(106.822342, 11.29953),(106.822334, 11.304373),(106.822289, 11.309401),(106.822197, 11.314636),(106.82209, 11.319549),(106.821854, 11.324623),(106.821487, 11.329514),(106.820969, 11.334595),(106.820351, 11.339355),(106.819489, 11.34492),(106.818573, 11.350367),(106.798904, 11.455444),(106.777924, 11.565811),(106.755165, 11.684844),(106.73436, 11.794281),(106.712051, 11.91037),(106.69883, 12.002145),(106.698936, 12.008514),(106.699219, 12.015106),(106.699738, 12.021286),(106.700424, 12.027656),(106.70121, 12.033646),(106.702354, 12.041202),(106.703575, 12.048798),(106.704613, 12.054749),(106.705727, 12.061313),(106.728767, 12.187866),(106.755997, 12.275116),(106.759064, 12.281691),(106.76149, 12.286606),(106.765038, 12.293422),(106.768265, 12.299423),(106.770966, 12.304175),(106.774658, 12.31041),(106.778244, 12.316233),(106.850906, 12.432055),(106.92775, 12.554855),(106.984863, 12.677628),(107.037674, 12.814295),(107.088707, 12.945851),(107.138962, 13.075406),(107.193222, 13.215363),(107.246124, 13.351508),(107.297356, 13.4832),(107.348595, 13.614532),(107.402008, 13.751624),(107.455475, 13.888367),(107.506195, 14.018097),(107.557404, 14.149134),(107.608055, 14.278656),(107.648766, 14.411222),(107.669807, 14.546951),(107.6903, 14.681552),(107.71077, 14.816025),(107.731499, 14.952713),(107.752556, 15.092377),(107.772743, 15.226539),(107.794144, 15.367584),(107.811287, 15.501895),(107.811058, 15.516312),(107.810753, 15.522751),(107.810234, 15.529587),(107.809753, 15.535355),(107.808838, 15.543274),(107.807953, 15.549611),(107.807076, 15.55529),(107.805702, 15.562693),(107.804375, 15.569163),(107.802803, 15.576053),(107.801125, 15.582687),(107.799637, 15.588226),(107.797607, 15.595001),(107.795647, 15.601563),(107.793732, 15.607895),(107.755882, 15.736725),(107.717514, 15.865608),(107.678787, 15.994583),(107.638649, 16.126785),(107.59877, 16.257578),(107.55201, 16.384781),(107.496399, 16.509567),(107.440651, 16.634558),(107.384613, 16.76001),(107.329803, 16.882494),(107.274826, 17.005159),(107.219551, 17.12829),(107.198166, 17.175961),(107.119492, 17.3508),(107.064323, 17.473297),(107.008812, 17.59639),(106.960045, 17.704281),(106.882324, 17.8759),(106.827423, 17.997049),(106.823647, 18.005289),(106.741249, 18.18663),(106.686562, 18.306839),(106.603775, 18.488388),(106.548103, 18.610094),(106.49102, 18.734756),(106.434418, 18.858215),(106.373795, 18.98378),(106.311806, 19.105911),(106.249855, 19.228592),(106.191589, 19.343811),(106.129425, 19.466936),(106.067856, 19.588762),(106.009628, 19.705353),(105.952003, 19.819244),(105.897415, 19.928175),(105.843071, 20.0354),(105.789612, 20.141052),(105.741394, 20.24707),(105.738747, 20.25705),(105.737068, 20.264421),(105.736053, 20.269226),(105.73497, 20.274803),(105.734039, 20.280396),(105.733154, 20.28653),(105.725128, 20.346725),(105.71714, 20.40757),(105.71035, 20.460205),(105.703682, 20.511475),(105.696617, 20.562914),(105.690323, 20.612261),(105.687592, 20.633102),(105.685127, 20.652529),(105.682594, 20.67215),(105.680183, 20.690887),(105.677834, 20.708542),(105.675491, 20.725754),(105.673492, 20.740837),(105.670769, 20.761414),(105.668808, 20.77597),(105.666458, 20.793411),(105.664543, 20.807968),(105.661697, 20.829025),(105.659492, 20.845825),(105.657333, 20.862762),(105.65522, 20.879051),(105.653114, 20.895264),(105.650955, 20.911377),(105.648575, 20.929327),(105.646202, 20.947083),(105.644081, 20.963591),(105.641884, 20.980675),(105.639885, 20.995897),(105.637543, 21.013401),(105.634193, 21.029322),(105.630951, 21.040773),(105.626007, 21.055893),(105.62146, 21.070267),(105.616608, 21.085232),(105.611931, 21.099709),(105.60743, 21.114212),(105.603035, 21.128265),(105.600891, 21.135275),(105.598602, 21.142536),(105.59639, 21.149414),(105.594124, 21.156549),(105.591988, 21.163252),(105.590248, 21.170334),(105.589851, 21.173676),(105.589752, 21.1772),(105.589951, 21.181183),(105.590416, 21.184341),(105.591072, 21.187366),(105.592049, 21.190842),(105.593163, 21.194023),(105.594292, 21.197205),(105.595345, 21.200272),(105.596443, 21.203522),(105.597588, 21.207106),(105.598389, 21.209702),(105.599487, 21.213181),(105.601532, 21.219681),(105.603584, 21.225958),(105.604706, 21.229496),(105.621613, 21.263947),(105.625656, 21.265686),(105.632782, 21.266972),(105.635345, 21.266922),(105.640083, 21.266464),(105.643181, 21.265869),(105.649971, 21.264177),(105.655464, 21.262594),(105.661758, 21.260788),(105.662109, 21.260651),(105.66671, 21.259336),(105.669197, 21.258591),(105.675789, 21.256668),(105.680939, 21.255157),(105.686745, 21.253471),(105.691582, 21.252121),(105.696007, 21.250864),(105.701111, 21.249344),(105.706352, 21.247879),(105.711311, 21.246441),(105.715485, 21.245232),(105.719604, 21.24402),(105.724335, 21.24267),(105.729126, 21.241287),(105.733223, 21.240097),(105.737617, 21.238815),(105.742363, 21.237442),(105.746613, 21.2362),(105.750786, 21.234989),(105.755058, 21.23378),(105.759735, 21.23243),(105.764671, 21.230986),(105.769348, 21.229635),(105.773872, 21.228333),(105.777916, 21.227142),(105.783112, 21.225677),(105.787651, 21.22435),(105.792595, 21.222931),(105.796539, 21.221786),(105.799377, 21.220974),(105.801414, 21.220396),(105.803276, 21.219849),(105.804596, 21.219477),(105.805473, 21.219219),(105.806412, 21.218941),(105.806816, 21.218822),(105.807076, 21.218708),(105.807228, 21.218491),(105.807205, 21.218273),(105.807137, 21.218067),(105.807053, 21.217804),(105.806976, 21.217575),(105.8069, 21.217346),(105.806801, 21.217083),(105.80674, 21.216866),(105.806656, 21.216614),(105.806564, 21.216408),(105.806313, 21.216288),(105.806068, 21.216351),(105.805641, 21.216511),(105.805435, 21.216566),(105.805206, 21.216637),(105.804955, 21.216705),(105.80468, 21.216785),(105.804268, 21.2169),(105.80397, 21.216991),(105.803612, 21.217094),(105.80336, 21.217175),(105.803093, 21.217243),(105.80294, 21.217031),(105.802887, 21.216808),(105.802803, 21.216578),(105.802734, 21.216373),(105.802658, 21.216167),(105.802589, 21.21595),(105.802521, 21.21574)]
-flightpath_hanoi_to_hcmc = [(105.801888, 21.215797),(105.801979, 21.216007),(105.802032, 21.216213),(105.802124, 21.216419),(105.802177, 21.216625),(105.801971, 21.216431),(105.80175, 21.216488),(105.801514, 21.216545),(105.801308, 21.216602),(105.801102, 21.216671),(105.800896, 21.216751),(105.800766, 21.216951),(105.800797, 21.217152),(105.800873, 21.217369),(105.800934, 21.21759),(105.80088, 21.2178),(105.800674, 21.217907),(105.800423, 21.217987),(105.800209, 21.218044),(105.799973, 21.218113),(105.799736, 21.218184),(105.799446, 21.218266),(105.799103, 21.218365),(105.798798, 21.218452),(105.798416, 21.218559),(105.798019, 21.218674),(105.7976, 21.218801),(105.797234, 21.218906),(105.796806, 21.219028),(105.796318, 21.219173),(105.795998, 21.219267),(105.795609, 21.219372),(105.795197, 21.2195),(105.794853, 21.219593),(105.79438, 21.219727),(105.794006, 21.219837),(105.793549, 21.219976),(105.793098, 21.220104),(105.792595, 21.220243),(105.792145, 21.220385),(105.791824, 21.22047),(105.791527, 21.22057),(105.791321, 21.220745),(105.79126, 21.220974),(105.791321, 21.221174),(105.791412, 21.221409),(105.791489, 21.221638),(105.791573, 21.221901),(105.791664, 21.222187),(105.791779, 21.222536),(105.79187, 21.222816),(105.791969, 21.223125),(105.792068, 21.223455),(105.792198, 21.223835),(105.792336, 21.224236),(105.79245, 21.224545),(105.792595, 21.22497),(105.792694, 21.225191),(105.7929, 21.225203),(105.793121, 21.225105),(105.793411, 21.225025),(105.793724, 21.224934),(105.794136, 21.224819),(105.794357, 21.224751),(105.794785, 21.224625),(105.795059, 21.22455),(105.795357, 21.224464),(105.795692, 21.224373),(105.798096, 21.223677),(105.801392, 21.2227),(105.805832, 21.22142),(105.810722, 21.220047),(105.815521, 21.218628),(105.820618, 21.217113),(105.825455, 21.215744),(105.830002, 21.214325),(105.835297, 21.212631),(105.840302, 21.211016),(105.846153, 21.209061),(105.851898, 21.207197),(105.858002, 21.205242),(105.864815, 21.203102),(105.871498, 21.201096),(105.879089, 21.198944),(105.885979, 21.197021),(105.893272, 21.195007),(105.900764, 21.192993),(105.904945, 21.191881),(105.913338, 21.189648),(105.92054, 21.187683),(105.928291, 21.185505),(105.939178, 21.182245),(105.943047, 21.180571),(105.946205, 21.178802),(105.949348, 21.176422),(105.9524, 21.173355),(105.955147, 21.169418),(105.956795, 21.166077),(105.957893, 21.162827),(105.958893, 21.159027),(105.959778, 21.15506),(105.96064, 21.150833),(105.961403, 21.146866),(105.962135, 21.143005),(105.962936, 21.13884),(105.963646, 21.134949),(105.965881, 21.123138),(105.968224, 21.110601),(105.971474, 21.094587),(105.976418, 21.078781),(105.977913, 21.075073),(105.979362, 21.071503),(105.980911, 21.067795),(105.982765, 21.063398),(105.989479, 21.046965),(105.995995, 21.030624),(106.003387, 21.012144),(106.0112, 20.992767),(106.020012, 20.971132),(106.026207, 20.955872),(106.046478, 20.90633),(106.066521, 20.857315),(106.086433, 20.808338),(106.106857, 20.75783),(106.12793, 20.705971),(106.170059, 20.602432),(106.212143, 20.498062),(106.255157, 20.391449),(106.300018, 20.280109),(106.345551, 20.166962),(106.39209, 20.051422),(106.439842, 19.932318),(106.489304, 19.809174),(106.538567, 19.685917),(106.588203, 19.561483),(106.638992, 19.434265),(106.689262, 19.308105),(106.738503, 19.18396),(106.786407, 19.063421),(106.834801, 18.941034),(106.884415, 18.819855),(106.941307, 18.698593),(107.003403, 18.565109),(107.060867, 18.441063),(107.098923, 18.359365),(107.131462, 18.289307),(107.22097, 18.095901),(107.229118, 18.078506),(107.269928, 17.992218),(107.354919, 17.813633),(107.411758, 17.693436),(107.482285, 17.54425),(107.523918, 17.456177),(107.58744, 17.321482),(107.66732, 17.151855),(107.724579, 17.032906),(107.782356, 16.914337),(107.840225, 16.794744),(107.897064, 16.677292),(107.955322, 16.557266),(108.017677, 16.427948),(108.076286, 16.306318),(108.133919, 16.186539),(108.180641, 16.056839),(108.195374, 15.930037),(108.192833, 15.803009),(108.190125, 15.673301),(108.187523, 15.546585),(108.184731, 15.413864),(108.181938, 15.288803),(108.179138, 15.161645),(108.176292, 15.031252),(108.173462, 14.900208),(108.170486, 14.768967),(108.167694, 14.64267),(108.164948, 14.517792),(108.162231, 14.388226),(108.159355, 14.262726),(108.156708, 14.138168),(108.154037, 14.011711),(108.151199, 13.881552),(108.148453, 13.75465),(108.145676, 13.626572),(108.142815, 13.498426),(108.139969, 13.367476),(108.136932, 13.237222),(108.133896, 13.110134),(108.130806, 12.980301),(108.127541, 12.850745),(108.124649, 12.725739),(108.121758, 12.599304),(108.119293, 12.472183),(108.116791, 12.34435),(108.112122, 12.269959),(108.110573, 12.263675),(108.108795, 12.257669),(108.106842, 12.251862),(108.104286, 12.24527),(108.101761, 12.239468),(108.098984, 12.23378),(108.096046, 12.228333),(108.093018, 12.22316),(108.089714, 12.217774),(108.086342, 12.212328),(108.082687, 12.206451),(108.079422, 12.201141),(108.076485, 12.196381),(108.013145, 12.087056),(107.948624, 11.976122),(107.882095, 11.866699),(107.804955, 11.760727),(107.728523, 11.654938),(107.649963, 11.546539),(107.576424, 11.445374),(107.505554, 11.347806),(107.467735, 11.295528),(107.434433, 11.249441),(107.401825, 11.204498),(107.367256, 11.156891),(107.33358, 11.110343),(107.319473, 11.09491),(107.315178, 11.09149),(107.311089, 11.088638),(107.308105, 11.086761),(107.302284, 11.083557),(107.29731, 11.081268),(107.292809, 11.079391),(107.287979, 11.077423),(107.283516, 11.075662),(107.279266, 11.073944),(107.274673, 11.072113),(107.269989, 11.07019),(107.265579, 11.068451),(107.261162, 11.066677),(107.243668, 11.059508),(107.226707, 11.052521),(107.210365, 11.045792),(107.194084, 11.039072),(107.177406, 11.03215),(107.161163, 11.02533),(107.14489, 11.018542),(107.128067, 11.011505),(107.111824, 11.00473),(107.095108, 10.997818),(107.078293, 10.990844),(107.061386, 10.983856),(107.044006, 10.976715),(107.02668, 10.969482),(107.010162, 10.962586),(106.993912, 10.955841),(106.977493, 10.949133),(106.962135, 10.942749),(106.947403, 10.936569),(106.932388, 10.930326),(106.918221, 10.9246),(106.904694, 10.919083),(106.891624, 10.913707),(106.878952, 10.908493),(106.873009, 10.906036),(106.86705, 10.903512),(106.861076, 10.900998),(106.855629, 10.898531),(106.849991, 10.895924),(106.843796, 10.893219),(106.837776, 10.890793),(106.832932, 10.888894),(106.829117, 10.887451),(106.826477, 10.886474),(106.82206, 10.884796),(106.815445, 10.882331),(106.809937, 10.880264),(106.804108, 10.878021),(106.799347, 10.876185),(106.793594, 10.874084),(106.789192, 10.872437),(106.783928, 10.87046),(106.778915, 10.868546),(106.772362, 10.866084),(106.767403, 10.864222),(106.762199, 10.862183),(106.757324, 10.86026),(106.753159, 10.858704),(106.750359, 10.857697),(106.744659, 10.855702),(106.739746, 10.853794),(106.735504, 10.852164),(106.732468, 10.851001),(106.727409, 10.849138),(106.723358, 10.847649),(106.718491, 10.845795),(106.715843, 10.844788),(106.710251, 10.842668),(106.70594, 10.841034),(106.702011, 10.839523),(106.697914, 10.837966),(106.693535, 10.836365),(106.689629, 10.834893),(106.685387, 10.833264),(106.681175, 10.83165),(106.676956, 10.830052),(106.672935, 10.828583),(106.66925, 10.827259),(106.665489, 10.825769),(106.661201, 10.824094),(106.657539, 10.822743),(106.653427, 10.821167),(106.650253, 10.819977),(106.647652, 10.819016),(106.645393, 10.818147),(106.644562, 10.817711),(106.644066, 10.817287),(106.643822, 10.817059),(106.64344, 10.816633),(106.642914, 10.815901),(106.642868, 10.815685),(106.643082, 10.814911),(106.643166, 10.814701),(106.643372, 10.814143),(106.643494, 10.813843),(106.643585, 10.813607),(106.643723, 10.813235),(106.643799, 10.813007),(106.643944, 10.812664),(106.644081, 10.812455),(106.644302, 10.812339),(106.644806, 10.812258),(106.645645, 10.812115),(106.64724, 10.812397),(106.647949, 10.812665),(106.648407, 10.81284),(106.649078, 10.813087),(106.649414, 10.813225),(106.649712, 10.813328),(106.650314, 10.813557),(106.650642, 10.813683),(106.65107, 10.813843),(106.651527, 10.814015),(106.652008, 10.814198),(106.652596, 10.814411),(106.653358, 10.814702),(106.653938, 10.814922),(106.654549, 10.815159),(106.655533, 10.815525),(106.656258, 10.815796),(106.656693, 10.81596),(106.657059, 10.816097),(106.65789, 10.81596),(106.657921, 10.815644),(106.65789, 10.815376),(106.657837, 10.814888),(106.657822, 10.814575),(106.657776, 10.814178),(106.657761, 10.813957),(106.657715, 10.813431),(106.657707, 10.813072),(106.658058, 10.812813),(106.658752, 10.812746),(106.65966, 10.812665),(106.660011, 10.812537),(106.660103, 10.812309),(106.660095, 10.812106),(106.660355, 10.811455),(106.661324, 10.81144),(106.661392, 10.811646),(106.661385, 10.811874)]
-flightpath_hanoi_to_bangkok = [(105.799934, 21.217346),(105.799728, 21.217405),(105.799522, 21.217461),(105.799355, 21.217672),(105.799339, 21.217907),(105.799286, 21.218147),(105.79908, 21.218348),(105.798851, 21.218433),(105.798576, 21.218525),(105.79834, 21.218594),(105.798119, 21.218662),(105.797867, 21.218731),(105.797485, 21.218847),(105.797028, 21.218975),(105.796631, 21.219097),(105.796082, 21.219257),(105.795471, 21.219429),(105.794991, 21.219566),(105.794594, 21.219681),(105.794357, 21.219755),(105.794083, 21.219837),(105.793724, 21.219931),(105.793335, 21.220047),(105.792976, 21.220152),(105.792488, 21.220291),(105.792046, 21.220425),(105.79171, 21.220516),(105.791451, 21.220592),(105.791298, 21.220848),(105.791336, 21.221058),(105.791389, 21.221283),(105.791451, 21.221489),(105.791512, 21.221699),(105.791588, 21.22192),(105.791672, 21.222153),(105.791725, 21.222363),(105.791809, 21.222599),(105.791878, 21.222816),(105.791946, 21.223034),(105.792046, 21.223328),(105.792145, 21.223619),(105.792259, 21.223991),(105.792366, 21.224306),(105.792511, 21.224716),(105.792603, 21.224958),(105.792824, 21.225128),(105.793045, 21.225128),(105.793266, 21.225086),(105.79361, 21.224979),(105.793869, 21.224911),(105.794144, 21.22484),(105.794373, 21.224771),(105.794579, 21.224716),(105.796127, 21.224272),(105.798012, 21.223721),(105.801239, 21.222794),(105.805206, 21.221628),(105.809624, 21.220367),(105.81517, 21.218719),(105.820412, 21.217207),(105.825859, 21.215485),(105.831352, 21.213638),(105.836739, 21.211853),(105.841522, 21.210318),(105.848381, 21.208191),(105.853569, 21.206635),(105.859711, 21.204803),(105.866005, 21.203018),(105.871178, 21.201565),(105.877937, 21.199703),(105.882782, 21.198395),(105.888313, 21.196909),(105.89357, 21.195419),(105.898743, 21.194023),(105.903984, 21.192673),(105.909698, 21.191208),(105.915344, 21.189651),(105.921188, 21.188004),(105.926483, 21.186493),(105.933571, 21.184387),(105.939995, 21.182478),(105.947052, 21.180359),(105.953545, 21.178436),(105.960083, 21.176519),(105.968422, 21.173494),(105.971375, 21.171911),(105.974174, 21.170002),(105.978416, 21.166397),(105.98114, 21.163345),(105.985054, 21.157526),(105.987053, 21.153534),(105.98877, 21.148775),(105.989998, 21.14328),(105.990395, 21.138206),(105.990044, 21.132481),(105.989403, 21.127945),(105.988869, 21.124008),(105.988312, 21.120098),(105.987701, 21.116089),(105.987106, 21.111511),(105.984756, 21.09549),(105.982361, 21.078573),(105.980263, 21.061935),(105.977936, 21.044916),(105.975822, 21.027739),(105.973923, 21.010712),(105.971825, 20.993849),(105.96917, 20.983337),(105.967133, 20.978487),(105.964752, 20.974045),(105.962387, 20.970387),(105.959038, 20.966105),(105.955246, 20.96196),(105.952095, 20.959028),(105.948761, 20.956192),(105.944855, 20.953348),(105.941109, 20.950974),(105.936371, 20.948368),(105.931793, 20.946259),(105.927475, 20.944611),(105.922035, 20.942688),(105.917595, 20.941153),(105.911896, 20.93915),(105.907402, 20.937567),(105.902664, 20.935913),(105.898262, 20.934402),(105.892509, 20.932434),(105.871346, 20.925323),(105.819412, 20.907961),(105.769073, 20.89311),(105.763435, 20.892738),(105.758141, 20.892691),(105.751945, 20.892975),(105.746155, 20.893621),(105.74115, 20.89444),(105.734924, 20.895905),(105.731071, 20.896975),(105.723984, 20.899347),(105.718689, 20.901443),(105.713196, 20.903824),(105.708153, 20.906004),(105.70314, 20.908127),(105.697266, 20.91066),(105.692169, 20.912802),(105.686417, 20.915314),(105.631546, 20.939243),(105.576164, 20.963217),(105.459335, 21.010345),(105.452469, 21.011719),(105.446335, 21.012634),(105.440109, 21.013229),(105.433296, 21.013588),(105.427063, 21.013641),(105.420486, 21.013458),(105.414703, 21.013092),(105.407928, 21.012423),(105.402229, 21.011679),(105.395523, 21.010483),(105.389702, 21.009352),(105.383064, 21.008057),(105.377083, 21.006821),(105.371223, 21.005672),(105.365425, 21.004509),(105.240295, 20.98114),(105.112343, 20.957491),(104.988831, 20.925476),(104.865486, 20.883636),(104.783279, 20.856079),(104.676437, 20.797585),(104.589111, 20.683868),(104.505196, 20.575066),(104.424446, 20.46981),(104.338089, 20.359818),(104.254761, 20.253754),(104.174561, 20.150974),(104.093102, 20.046478),(104.014908, 19.946283),(103.933311, 19.841635),(103.856804, 19.743223),(103.777344, 19.640945),(103.69516, 19.534903),(103.613289, 19.429138),(103.535255, 19.327011),(103.450401, 19.215591),(103.370262, 19.110392),(103.289513, 19.00416),(103.21241, 18.902536),(103.132195, 18.796646),(103.0522, 18.690903),(102.971222, 18.583694),(102.890152, 18.47612),(102.811005, 18.371002),(102.732124, 18.266006),(102.654091, 18.162077),(102.571877, 18.052322),(102.524269, 17.970282),(102.4739, 17.846825),(102.423721, 17.722111),(102.374382, 17.599678),(102.32473, 17.476318),(102.274284, 17.350754),(102.225082, 17.227982),(102.174637, 17.101868),(102.125244, 16.978317),(102.075348, 16.853306),(102.025932, 16.729477),(101.973602, 16.60675),(101.912941, 16.488007),(101.852676, 16.370466),(101.791519, 16.250734),(101.728195, 16.126694),(101.666466, 16.005661),(101.605682, 15.886324),(101.544319, 15.765793),(101.483269, 15.645493),(101.422249, 15.525265),(101.360634, 15.403473),(101.300255, 15.284363),(101.242691, 15.17035),(101.186394, 15.059006),(101.123703, 14.948181),(101.057152, 14.84481),(101.036926, 14.805101),(101.034462, 14.799096),(101.032005, 14.792625),(101.030518, 14.788436),(101.027817, 14.780196),(101.026085, 14.774283),(101.024445, 14.768325),(101.02285, 14.761901),(101.021133, 14.754456),(101.019577, 14.74747),(100.991005, 14.627272),(100.975197, 14.55986),(100.961754, 14.503443),(100.948456, 14.447394),(100.936073, 14.395116),(100.93206, 14.378128),(100.927795, 14.360092),(100.922348, 14.337296),(100.918388, 14.320493),(100.914146, 14.30257),(100.90976, 14.284042),(100.905869, 14.267303),(100.901939, 14.250687),(100.897911, 14.233486),(100.894081, 14.217453),(100.890633, 14.202762),(100.886581, 14.185631),(100.883263, 14.171665),(100.879211, 14.155232),(100.874855, 14.13739),(100.871536, 14.122147),(100.868652, 14.106949),(100.865234, 14.090711),(100.862206, 14.076978),(100.858521, 14.061218),(100.854683, 14.045334),(100.850929, 14.030239),(100.846779, 14.014645),(100.842735, 13.999747),(100.838394, 13.984726),(100.834251, 13.970187),(100.830292, 13.955521),(100.828278, 13.947935),(100.826408, 13.940964),(100.824669, 13.934062),(100.822952, 13.92746),(100.821198, 13.920562),(100.819656, 13.914324),(100.818077, 13.908051),(100.816521, 13.901941),(100.815025, 13.896122),(100.813675, 13.89093),(100.812088, 13.884996),(100.809364, 13.875137),(100.807709, 13.869003),(100.805969, 13.862465),(100.804428, 13.856646),(100.802925, 13.851013),(100.801147, 13.84431),(100.799515, 13.837875),(100.797806, 13.831512),(100.796333, 13.825735),(100.794823, 13.819702),(100.793213, 13.813843),(100.791794, 13.808762),(100.790276, 13.802856),(100.788864, 13.797432),(100.787437, 13.792007),(100.786118, 13.786864),(100.784737, 13.781754),(100.783516, 13.777041),(100.782227, 13.772324),(100.780899, 13.767197),(100.77977, 13.762756),(100.77858, 13.75827),(100.777489, 13.754138),(100.776169, 13.749161),(100.774651, 13.743338),(100.773201, 13.737891),(100.771904, 13.732819),(100.770531, 13.727737),(100.769348, 13.72332),(100.768166, 13.718811),(100.766747, 13.713358),(100.765556, 13.708832),(100.764244, 13.703861),(100.763237, 13.700043),(100.755318, 13.669979),(100.755112, 13.669227),(100.754654, 13.668133),(100.752892, 13.668011),(100.752991, 13.668354),(100.753105, 13.668812),(100.753227, 13.66927),(100.753426, 13.67003),(100.753571, 13.670565),(100.754005, 13.672234),(100.754532, 13.674208)]
-flightpath_bangkok_to_hcmc = [(100.753883, 13.664618),(100.752586, 13.65976),(100.750603, 13.652328),(100.749367, 13.647766),(100.74762, 13.641295),(100.74633, 13.636414),(100.74501, 13.631332),(100.742828, 13.622864),(100.741028, 13.615952),(100.740082, 13.612427),(100.738701, 13.60708),(100.736862, 13.599884),(100.735085, 13.592881),(100.734367, 13.587621),(100.734398, 13.584549),(100.734825, 13.581436),(100.735909, 13.577751),(100.736824, 13.575749),(100.739136, 13.571915),(100.740868, 13.569511),(100.745354, 13.563879),(100.747856, 13.560993),(100.750832, 13.55777),(100.753059, 13.555435),(100.756279, 13.552185),(100.759132, 13.549308),(100.7612, 13.547333),(100.764183, 13.544449),(100.766792, 13.541906),(100.777779, 13.531292),(100.790802, 13.52005),(100.794403, 13.517885),(100.797997, 13.516113),(100.802498, 13.514441),(100.806618, 13.513321),(100.810547, 13.512578),(100.813774, 13.512206),(100.817581, 13.512113),(100.822205, 13.512253),(100.826599, 13.512497),(100.830734, 13.512765),(100.835938, 13.513137),(100.840332, 13.513458),(100.844215, 13.513687),(100.847534, 13.513962),(100.8489, 13.514022),(100.853928, 13.514374),(100.872299, 13.51561),(100.888893, 13.516628),(100.909042, 13.517807),(100.927063, 13.518816),(100.947731, 13.519934),(100.996689, 13.522727),(101.054611, 13.525818),(101.108223, 13.523849),(101.162498, 13.521889),(101.217606, 13.52005),(101.329361, 13.516069),(101.356407, 13.512772),(101.363136, 13.51081),(101.367958, 13.50918),(101.374466, 13.506527),(101.378334, 13.504715),(101.384964, 13.501373),(101.390175, 13.498659),(101.395378, 13.495959),(101.400253, 13.493408),(101.405449, 13.490746),(101.410698, 13.488046),(101.41243, 13.487137),(101.415932, 13.485397),(101.525963, 13.430507),(101.636604, 13.375809),(101.753288, 13.320007),(101.867981, 13.264755),(101.984833, 13.208127),(102.107834, 13.148575),(102.232948, 13.087875),(102.36039, 13.025968),(102.483505, 12.966055),(102.603828, 12.895935),(102.718567, 12.835785),(102.832458, 12.777832),(102.946869, 12.718826),(103.059242, 12.660919),(103.179329, 12.598892),(103.291275, 12.54071),(103.404526, 12.482144),(103.516785, 12.424026),(103.632233, 12.364105),(103.74868, 12.303452),(103.865807, 12.242494),(103.979584, 12.183105),(104.092323, 12.124297),(104.205849, 12.064943),(104.319778, 12.005173),(104.435791, 11.944373),(104.548553, 11.885376),(104.660736, 11.82637),(104.773819, 11.766916),(104.884453, 11.708773),(104.994553, 11.650628),(105.10862, 11.590347),(105.223633, 11.529593),(105.341156, 11.467539),(105.454536, 11.407439),(105.566185, 11.348271),(105.673637, 11.291385),(105.784088, 11.232605),(105.888649, 11.177032),(105.986435, 11.124939),(106.084564, 11.072496),(106.176559, 11.022766),(106.189064, 11.012833),(106.192886, 11.009092),(106.196068, 11.00574),(106.199623, 11.001801),(106.202324, 10.998871),(106.20565, 10.995219),(106.20919, 10.991318),(106.212746, 10.987427),(106.216301, 10.983535),(106.282829, 10.911163),(106.350548, 10.837555),(106.38736, 10.79742),(106.4235, 10.757989),(106.460358, 10.717621),(106.492455, 10.682435),(106.527725, 10.643983),(106.560104, 10.609255),(106.566673, 10.604187),(106.57032, 10.6019),(106.573776, 10.600021),(106.577698, 10.598315),(106.580536, 10.597244),(106.58844, 10.59515),(106.593758, 10.594437),(106.598259, 10.594208),(106.601784, 10.594265),(106.606499, 10.594711),(106.611137, 10.595522),(106.615089, 10.596499),(106.620087, 10.598145),(106.623306, 10.599426),(106.628372, 10.601486),(106.631836, 10.602951),(106.635567, 10.604506),(106.638985, 10.605949),(106.643768, 10.607941),(106.648026, 10.609726),(106.664795, 10.616684),(106.679947, 10.622955),(106.696754, 10.629822),(106.714203, 10.636861),(106.729187, 10.642866),(106.746384, 10.64978),(106.761398, 10.655869),(106.777351, 10.662369),(106.791107, 10.667957),(106.805855, 10.673963),(106.819252, 10.679456),(106.834427, 10.68602),(106.841316, 10.690581),(106.843369, 10.692352),(106.845802, 10.694818),(106.848434, 10.698074),(106.850426, 10.701141),(106.852402, 10.705059),(106.853798, 10.708644),(106.854958, 10.712089),(106.85601, 10.715515),(106.856819, 10.718262),(106.857857, 10.721649),(106.859001, 10.725496),(106.860085, 10.729111),(106.861076, 10.732498),(106.862083, 10.735877),(106.866142, 10.749069),(106.870712, 10.763529),(106.872833, 10.770186),(106.874855, 10.776331),(106.876877, 10.782662),(106.879288, 10.790064),(106.881119, 10.795696),(106.88324, 10.802261),(106.885315, 10.808731),(106.887451, 10.815353),(106.889114, 10.820526),(106.891052, 10.826752),(106.893135, 10.833344),(106.895142, 10.839828),(106.896263, 10.844833),(106.896584, 10.848115),(106.896538, 10.851001),(106.895981, 10.854675),(106.895096, 10.857612),(106.893707, 10.860626),(106.891869, 10.86343),(106.88987, 10.865799),(106.888252, 10.867434),(106.885368, 10.869736),(106.882858, 10.871155),(106.880249, 10.872368),(106.877502, 10.873253),(106.874954, 10.873904),(106.871147, 10.874416),(106.867287, 10.874743),(106.865074, 10.874882),(106.861702, 10.875069),(106.858757, 10.875275),(106.855392, 10.875504),(106.851921, 10.875813),(106.84922, 10.876046),(106.846161, 10.876373),(106.841415, 10.876884),(106.834892, 10.877655),(106.829536, 10.878387),(106.82373, 10.878839),(106.820648, 10.878653),(106.818672, 10.878327),(106.815804, 10.877747),(106.813034, 10.877024),(106.809952, 10.876092),(106.807663, 10.875366),(106.805229, 10.874557),(106.802361, 10.873627),(106.800652, 10.87302),(106.797371, 10.871902),(106.793457, 10.870468),(106.791039, 10.869553),(106.787346, 10.868179),(106.782677, 10.866456),(106.778305, 10.864838),(106.773376, 10.862918),(106.767303, 10.860637),(106.762672, 10.858932),(106.755882, 10.856355),(106.751793, 10.854772),(106.745056, 10.852249),(106.739983, 10.850349),(106.736153, 10.848862),(106.732178, 10.847416),(106.727699, 10.845694),(106.723358, 10.844065),(106.718155, 10.84211),(106.713234, 10.840256),(106.70948, 10.838851),(106.706154, 10.837594),(106.703056, 10.836411),(106.698204, 10.834615),(106.693626, 10.832846),(106.688797, 10.831009),(106.684303, 10.829315),(106.682175, 10.828537),(106.675209, 10.825882),(106.669968, 10.823907),(106.663788, 10.821568),(106.660355, 10.820274),(106.657013, 10.819016),(106.654671, 10.818134),(106.652184, 10.817162),(106.651802, 10.816978),(106.651321, 10.816692),(106.650665, 10.81612),(106.650429, 10.815843),(106.650246, 10.815559),(106.650139, 10.81422),(106.651276, 10.813922),(106.651924, 10.814166),(106.652382, 10.814346),(106.652756, 10.814481),(106.653938, 10.814922),(106.654396, 10.815102),(106.656555, 10.815914),(106.657249, 10.816179),(106.658409, 10.816612),(106.65889, 10.816796),(106.659561, 10.817053),(106.660141, 10.817276),(106.661308, 10.817711),(106.661926, 10.81794),(106.664635, 10.818961),(106.664932, 10.819077),(106.665184, 10.819136),(106.665535, 10.818856),(106.665741, 10.81831),(106.665062, 10.819118),(106.665764, 10.818263)]
+# Flightpaths exported from https://www.flightradar24.com, one track file per route (see Routes.readTrack)
+route_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flightpaths")
+routes = Routes.RouteStore(route_directory)
 
 # Planes
-plane1 = Plane.Plane("Plane_ID", callSign="TUAN01", waypoints=flightpath_hcm_to_hanoi, position=saigonAirport.position)
-plane2 = Plane.Plane("Plane_ID_2", callSign="TUAN02", waypoints=flightpath_hanoi_to_bangkok + flightpath_bangkok_to_hcmc, position=hanoiAirport.position)
+plane1 = Plane.Plane("Plane_ID", callSign="TUAN01", waypoints=routes.route("hcm_to_hanoi"), position=saigonAirport.position)
+plane2 = Plane.Plane("Plane_ID_2", callSign="TUAN02", waypoints=routes.route("hanoi_to_bangkok", "bangkok_to_hcmc"), position=hanoiAirport.position)
 planes = [plane1, plane2]
\ No newline at end of file
@@ -1,18 +1,22 @@
 import geopy.distance
-import great_circle_calculator.great_circle_calculator as gcc
-from numpy import random
+import numpy as np
 
 import ADSB
+import Kinematics
 import Parameters
 import Transmission
 
+SQUITTER_TYPES = ('position', 'identification', 'velocity')
+KNOT = 1852 / 3600  # [m/s]
+
 
 class Plane:
     # id: aircraft id, position: lon-lat, height: [m], speed: [m/s], waypoints: lon-lat 
+    # squitterRates: [Hz] per message type overriding Parameters.squitter_rates for this aircraft, 0 to not send a type
     def __init__(self, id, position=(105.808817, 21.028511), height=1000, speed=250,
-                 waypoints=[(106.660172, 10.762622)], callSign="KLM123"):
+                 waypoints=[(106.660172, 10.762622)], callSign="KLM123", squitterRates=None):
         self.id = id
-        self.ICAO = hex(random.randint(1, 16777214))[2:]  # create random ICAO address up to FFFFFF
+        self.ICAO = hex(Parameters.rng.stream('plane', id).integers(1, 16777214))[2:]  # create random ICAO address up to FFFFFF
         self.callSign = callSign
         if(len(self.callSign) > 8):
             self.callSign = self.callSign[0:8]
@@ -20,61 +24,82 @@ class Plane:
         self.height = height
         self.speed = speed
         self.waypoints = waypoints
+        self.route = Kinematics.Route(position, waypoints, Parameters.kinematics_geodesic)  # waypoints as arc-length table
+        self.distanceFlown = 0.0  # [m] along the route
+        self.track = self.route.trackAt(0.0)  # [deg] clockwise from north
+        self.squitterRates = dict(Parameters.squitter_rates, **(squitterRates or {}))
+        for kind in self.squitterRates:
+            if kind not in SQUITTER_TYPES:
+                raise ValueError("Unknown squitter type: " + str(kind))
         self.adsb_coder = ADSB.ADSB_coder()
 
     # updates the position after x seconds
     def updatePos(self, timestep):
-        if (len(self.waypoints) < 1):
-            return self.position  # waypoints empty.
-        # always fly towards the first waypoint in the list; when it is reached, delete it
-        # determine distance
-        dist = geopy.distance.distance(self.position[::-1], self.waypoints[0][::-1]).m  # geopy expects lat-lon order
-        # determine fraction of distance that can be covered in timestep.
-        frac = self.speed * timestep / dist
-        # determine coordinates of new position
-        self.position = gcc.intermediate_point(self.position, self.waypoints[0], frac)
-        # if waypoint was reached (or overshot), remove
-        if (frac > 1.0):
-            self.waypoints.remove(self.waypoints[0])
-
+        if self.atDestination():
+            return self.position
+        self.distanceFlown += self.speed * timestep
+        self.position = self.route.positionAt(self.distanceFlown)
+        self.track = self.route.trackAt(self.distanceFlown)
         return self.position
 
-    def transmit(self, groundstations, commSat, data):
+    # position after t seconds of flight, without changing the plane
+    def positionAt(self, t):
+        return self.route.positionAt(self.speed * t)
+
+    # receivers: groundstations in range, commSat: satellite receiving the uplink, None if no satellite is in view,
+    # time: [s] start of the transmission
+    def transmit(self, receivers, commSat, data, time=None):
 
         transmission = []
 
-        for element in groundstations:
-            # Check Range
-            if self.inRange(element):
-                x = Transmission.Transmission(data, self.id, False, element.id, SNRdB=Parameters.plane_to_groundstation_SNRdB,
-                                              carrier_frequency=Parameters.adsb_freq)
-                transmission.append(x)
+        # slant range to every receiver
+        positions = np.array([element.position for element in receivers], dtype=float).reshape(-1, 2)
+        ground = Kinematics.EARTH_RADIUS * Kinematics.centralAngle(np.array([self.position]), positions)
+        distances = np.hypot(ground, self.height).tolist()
 
-        transmission.append(Transmission.Transmission(data, self.id, False, commSat.id, channel_model='bpsk-awgn-rice',
-                                                      SNRdB=Parameters.plane_to_satellite_SNRdB, carrier_frequency=Parameters.adsb_freq))
+        for element, distance in zip(receivers, distances):
+            x = Transmission.Transmission(data, self.id, False, element.id,
+                                          channel_model=Parameters.plane_to_groundstation_channel_model,
+                                          SNRdB=Parameters.plane_to_groundstation_SNRdB,
+                                          carrier_frequency=Parameters.adsb_freq,
+                                          seed=Parameters.rng.nextSeed('link', self.id, element.id),
+                                          K_factor=Parameters.plane_to_groundstation_K_factor, time=time,
+                                          distance=distance)
+            transmission.append(x)
 
-        return transmission
+        if commSat is not None:
+            transmission.append(Transmission.Transmission(data, self.id, False, commSat.id, channel_model=Parameters.plane_to_satellite_channel_model,
+                                                          SNRdB=Parameters.plane_to_satellite_SNRdB, carrier_frequency=Parameters.adsb_freq,
+                                                          seed=Parameters.rng.nextSeed('link', self.id, commSat.id),
+                                                          K_factor=Parameters.plane_to_satellite_K_factor, time=time))
 
-    def transmitPosition(self, groundstations, commSat):
-        # always send pairs of positions
-        transmission = self.transmit(groundstations, commSat,
-                                     self.adsb_coder.encodePosition(17, 5, self.ICAO, 0, 1, self.height,
-                                                                    self.position[1], self.position[0]))
-        transmission += self.transmit(groundstations, commSat,
-                                      self.adsb_coder.encodePosition(17, 5, self.ICAO, 0, 1, self.height,
-                                                                     self.position[1], self.position[0]))
         return transmission
 
-    def transmitIdentification(self, groundstations, commSat):
-        return self.transmit(groundstations, commSat,
-                             self.adsb_coder.encodeIdentification(17, 5, self.ICAO, 2, self.callSign, 4))
+    # frame of a squitter of the message type kind ('position' | 'identification' | 'velocity') at the current
+    # position and track, consecutive position squitters alternate between the even and odd format
+    def encodeSquitter(self, kind):
+        if kind == 'position':
+            return self.adsb_coder.encodePosition(17, 5, self.ICAO, 0, 1, self.height, self.position[1],
+                                                  self.position[0])
+        elif kind == 'identification':
+            return self.adsb_coder.encodeIdentification(17, 5, self.ICAO, 2, self.callSign, 4)
+        elif kind == 'velocity':
+            # level flight at constant speed
+            speed = self.speed / KNOT
+            return self.adsb_coder.encodeVelocity(17, 5, self.ICAO, speed * np.sin(np.radians(self.track)),
+                                                  speed * np.cos(np.radians(self.track)), 0)
+        else:
+            raise ValueError("Unknown squitter type: " + str(kind))
 
     def atDestination(self):
-        if len(self.waypoints) < 1:
+        if self.distanceFlown >= self.route.length:
             return True
         else:
             return False
 
+    def receiversInRange(self, groundstations):
+        return [element for element in groundstations if self.inRange(element)]
+
     def inRange(self, destination):
         dist = geopy.distance.distance(self.position[::-1], destination.position[::-1]).m
         if dist > destination.recRange:
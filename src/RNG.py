@@ -0,0 +1,254 @@
+import functools
+import itertools
+import zlib
+
+import numpy as np
+
+# increment of the SplitMix64 counters and the multipliers of its mixing function
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+# bits of the sample index in a counter, the draw number takes the bits above
+_INDEX_BITS = 40
+
+
+class RNGService:
+    """
+    Source of all random numbers of the simulation.
+
+    Every random stream is derived from the root seed and a key (e.g. the
+    plane id or the source and destination of a link), not from the order in
+    which the streams are requested. The same seed therefore reproduces the
+    same planes and transmissions. The channels draw every transmission from
+    the counter-based stream of its own seed (see CounterStreams), so a
+    transmission gets the same samples alone, batched, in any chunk and with
+    any execution backend.
+
+    Attributes
+    ----------
+    seed_sequence : np.random.SeedSequence
+        root of all streams
+    counters : dict
+        number of seeds handed out per key by nextSeed()
+
+    Methods
+    -------
+    seed(*key) -> np.random.SeedSequence
+        returns the seed of the stream identified by key
+    stream(*key) -> np.random.Generator
+        returns a new generator of the stream identified by key
+    nextSeed(*key) -> np.random.SeedSequence
+        returns the seed of the next stream of a sequence of streams, e.g. of
+        the next transmission over a link
+    reset(seed : int)
+        restarts all streams from a new root seed
+    """
+
+    def __init__(self, seed=None):
+        """
+        Parameters
+        ----------
+        seed : int
+            root seed, None for a random seed
+        """
+
+        self.reset(seed)
+
+    def seed(self, *key):
+        return np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=tuple(map(_keyWord, key)))
+
+    def stream(self, *key):
+        return np.random.default_rng(self.seed(*key))
+
+    def nextSeed(self, *key):
+        sequence = self.counters.get(key, 0)
+        self.counters[key] = sequence + 1
+        return self.seed(*key, sequence)
+
+    def reset(self, seed=None):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.counters = {}
+
+
+def _keyWord(part):
+    # maps one key part to the unsigned integer words of a SeedSequence spawn key
+    if isinstance(part, (int, np.integer)) and part >= 0:
+        return int(part)
+    return zlib.crc32(str(part).encode())
+
+
+class CounterStreams:
+    """
+    Counter-based random streams of many rows at once, one stream per key.
+
+    Sample j of the s-th draw of a row is the SplitMix64 hash of the row key
+    and the counter (s, j). It neither depends on the other rows nor on the
+    number of samples drawn, so a batch of rows draws exactly the samples of
+    every row drawn alone. All rows are hashed at once with vectorized
+    integer operations.
+    The draw methods follow np.random.Generator. The first dimension of a
+    shape are the rows and all others the samples of a row, with a single
+    key a shape may also be the samples of that row alone.
+
+    Attributes
+    ----------
+    keys : np.array
+        64 bit key of the stream of every row, see streamKeys()
+    stage : int
+        number of draws so far
+
+    Methods
+    -------
+    random(shape : tuple) -> np.array
+        uniform samples in [0, 1)
+    standard_normal(shape : tuple, out : np.array) -> np.array
+        standard normal samples (Box-Muller)
+    standard_exponential(shape : tuple) -> np.array
+        exponential samples with unit mean
+    integers(low : int, high : int, shape : tuple) -> np.array
+        integers uniform in [low, high)
+    rows(index : slice) -> CounterStreams
+        streams of some of the rows, continuing at the same draw
+    """
+
+    def __init__(self, keys, stage=0):
+        """
+        Parameters
+        ----------
+        keys : np.array
+            64 bit key of the stream of every row, see streamKeys()
+        stage : int
+            number of draws of the streams so far
+        """
+
+        self.keys = np.asarray(keys, dtype=np.uint64)
+        self.stage = stage
+
+    def random(self, shape=None):
+        return self._uniforms(shape)
+
+    def standard_normal(self, shape=None, out=None):
+        shape = out.shape if out is not None else shape
+        samples = _rowSamples(self.keys.size, shape)
+        # one hash per pair of samples, its upper and lower 32 bits are the uniforms of the Box-Muller transform
+        z = self._hashes((samples + 1) // 2)
+        radius = ((z >> np.uint64(32)).astype(np.float64) + 0.5) * 2.0 ** -32
+        np.sqrt(-2 * np.log(radius, out=radius), out=radius)
+        # single precision angles, the vectorized float32 sine and cosine are an order of magnitude faster
+        angle = (z & np.uint64(0xFFFFFFFF)).astype(np.float32)
+        angle *= np.float32(2 * np.pi * 2.0 ** -32)
+        # even samples are the cosine and odd samples the sine of a pair, so sample j only depends on pair j // 2
+        normal = np.empty((self.keys.size, samples))
+        np.multiply(radius, np.cos(angle), out=normal[:, 0::2])
+        np.multiply(radius[:, :samples // 2], np.sin(angle[:, :samples // 2]), out=normal[:, 1::2])
+        if out is None:
+            return normal.reshape(_shape(shape))
+        np.copyto(out, normal.reshape(out.shape))
+        return out
+
+    def standard_exponential(self, shape=None):
+        u = self._uniforms(shape)
+        np.negative(np.log1p(-u, out=u), out=u)
+        return u
+
+    def integers(self, low, high, shape=None):
+        if high - low > 2 ** 32:
+            return low + (self._uniforms(shape) * (high - low)).astype(np.int64)
+        # the 32 bit halves of the hashes scaled to the range by a multiplication instead of a division
+        words = self._words(shape)
+        words *= np.uint64(high - low)
+        words >>= np.uint64(32)
+        return low + words.astype(np.int64)
+
+    def rows(self, index):
+        return CounterStreams(self.keys[index], self.stage)
+
+    def _uniforms(self, shape):
+        # uniform doubles from the upper 53 bits of the hashes
+        u = (self._hashes(_rowSamples(self.keys.size, shape)) >> np.uint64(11)).astype(np.float64)
+        u *= 2.0 ** -53
+        return u.reshape(_shape(shape))
+
+    def _words(self, shape):
+        # 32 bit words of the next draw, the upper and lower half of one hash per pair of samples
+        samples = _rowSamples(self.keys.size, shape)
+        z = self._hashes((samples + 1) // 2)
+        words = np.empty((self.keys.size, samples), dtype=np.uint64)
+        np.right_shift(z, np.uint64(32), out=words[:, 0::2])
+        np.bitwise_and(z[:, :samples // 2], np.uint64(0xFFFFFFFF), out=words[:, 1::2])
+        return words.reshape(_shape(shape))
+
+    def _hashes(self, count):
+        # hashes of the next draw, count per row
+        counters = np.arange(1, count + 1, dtype=np.uint64) + np.uint64(self.stage << _INDEX_BITS)
+        self.stage += 1
+        return _mix(counters * _GOLDEN_GAMMA + self.keys[:, np.newaxis])
+
+
+def streamKeys(seeds):
+    """
+    Derives the key of the counter-based stream of every seed.
+
+    The key hashes the entropy and the spawn key of the SeedSequence, the
+    spawn keys of all seeds are hashed at once.
+
+    Parameters
+    ----------
+    seeds : list(np.random.SeedSequence)
+        seeds of the streams, e.g. from RNGService.nextSeed()
+
+    Returns
+    -------
+    np.array
+        64 bit key of every seed, see CounterStreams
+    """
+
+    entropies = (seed.entropy if isinstance(seed.entropy, int) else tuple(seed.entropy) for seed in seeds)
+    keys = np.fromiter(map(_entropyKey, entropies), np.uint64, len(seeds))
+    spawnKeys = [seed.spawn_key for seed in seeds]
+    lengths = np.fromiter(map(len, spawnKeys), np.intp, len(seeds))
+    words = np.fromiter((word & 0xFFFFFFFFFFFFFFFF for word in itertools.chain.from_iterable(spawnKeys)), np.uint64)
+    offsets = np.cumsum(lengths) - lengths
+    for depth in range(lengths.max(initial=0)):
+        rows = np.flatnonzero(lengths > depth)
+        keys[rows] = _mix(keys[rows] ^ words[offsets[rows] + depth])
+    return keys
+
+
+@functools.lru_cache(maxsize=None)
+def _entropyKey(entropy):
+    # hashes the 64 bit words of the entropy of a SeedSequence
+    key = np.zeros(1, dtype=np.uint64)
+    for word in (entropy if isinstance(entropy, tuple) else (entropy,)):
+        word = int(word)
+        while True:
+            key = _mix(key ^ np.uint64(word & 0xFFFFFFFFFFFFFFFF))
+            word >>= 64
+            if not word:
+                break
+    return int(key[0])
+
+
+def _mix(z):
+    # mixing function of SplitMix64, in place on an array of unsigned 64 bit integers
+    shifted = z >> np.uint64(30)
+    z ^= shifted
+    z *= _MIX_1
+    np.right_shift(z, np.uint64(27), out=shifted)
+    z ^= shifted
+    z *= _MIX_2
+    np.right_shift(z, np.uint64(31), out=shifted)
+    z ^= shifted
+    return z
+
+
+def _shape(shape):
+    return () if shape is None else tuple(np.atleast_1d(shape))
+
+
+def _rowSamples(rows, shape):
+    # number of samples per row of a shape
+    size = int(np.prod(_shape(shape)))
+    if size % rows:
+        raise ValueError("Shape does not match the number of streams: " + str(shape))
+    return size // rows
@@ -0,0 +1,78 @@
+import glob
+import os
+
+import numpy as np
+
+# columns of the recorded tables
+TABLES = {
+    # real positions of the planes
+    'truth': [('time', float), ('icao', 'U6'), ('lon', float), ('lat', float)],
+    # positions decoded by the receivers, local: decoded from a single message with a reference position
+    'fix': [('time', float), ('receiver', 'U32'), ('icao', 'U6'), ('lon', float), ('lat', float), ('local', bool)],
+    # messages that failed the CRC check
+    'crc': [('time', float), ('receiver', 'U32'), ('src', 'U32'), ('fromSatellite', bool)],
+    # every transmission arriving at a receiver, garbled: lost to overlapping frames
+    'link': [('time', float), ('src', 'U32'), ('dest', 'U32'), ('SNRdB', float), ('channel', 'U32'),
+             ('garbled', bool)],
+    # messages forwarded by a satellite, latency: from the transmission by the plane to the downlink
+    'relay': [('time', float), ('satellite', 'U32'), ('dest', 'U32'), ('latency', float)],
+}
+
+
+class Recorder:
+    # records the outputs of a simulation as rows of the TABLES. The rows of every table are buffered in a
+    # fixed-size chunk of columns, a full chunk is written to the file <table>-<segment>.npz in directory with one
+    # array per column. Memory therefore stays bounded however long the simulation runs, chunks() iterates over the
+    # recorded segments one at a time.
+    # chunkSize: number of rows per segment
+    def __init__(self, directory, chunkSize=65536):
+        self.directory = directory
+        self.chunkSize = chunkSize
+        os.makedirs(directory, exist_ok=True)
+        self.buffers = {table: np.empty(chunkSize, dtype=columns) for table, columns in TABLES.items()}
+        self.counts = dict.fromkeys(TABLES, 0)
+        # a new recording replaces the segments of an earlier one in the same directory, so reading the directory
+        # never mixes two runs. Other files are left alone
+        for table in TABLES:
+            for path in segments(directory, table):
+                os.remove(path)
+        self.segments = dict.fromkeys(TABLES, 0)
+
+    # appends one row, values in the order of the columns of the table
+    def record(self, table, *values):
+        count = self.counts[table]
+        self.buffers[table][count] = values
+        self.counts[table] = count + 1
+        if count + 1 == self.chunkSize:
+            self._write(table)
+
+    # writes the buffered rows of all tables
+    def flush(self):
+        for table in TABLES:
+            if self.counts[table] > 0:
+                self._write(table)
+
+    # iterates over the recorded rows of table as dicts of column arrays, one segment at a time
+    def chunks(self, table, columns=None):
+        self.flush()
+        return readChunks(self.directory, table, columns)
+
+    def _write(self, table):
+        rows = self.buffers[table][:self.counts[table]]
+        path = os.path.join(self.directory, "%s-%06d.npz" % (table, self.segments[table]))
+        np.savez(path, **{name: rows[name] for name in rows.dtype.names})
+        self.segments[table] += 1
+        self.counts[table] = 0
+
+
+# recorded segment files of table in directory in recording order
+def segments(directory, table):
+    return sorted(glob.glob(os.path.join(glob.escape(directory), table + "-*.npz")))
+
+
+# iterates over the rows of table recorded in directory as dicts of column arrays, one segment at a time.
+# columns: names of the columns to load, None for all columns
+def readChunks(directory, table, columns=None):
+    for path in segments(directory, table):
+        with np.load(path) as segment:
+            yield {name: segment[name] for name in (columns or segment.files)}
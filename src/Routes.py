@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+# route files read by RouteStore
+TRACK_EXTENSIONS = (".csv", ".json")
+
+
+class RouteStore:
+    # lon-lat routes [deg] of the track files in a directory, e.g. flightradar24 exports (see readTrack), named after
+    # their file without extension. The tracks are parsed once and cached as one float64 array of all points plus
+    # an offsets index in cacheDirectory. Later stores memory-map the cache, so loading does not depend on the
+    # number or size of the tracks. The cache is rebuilt when a track file is added, removed or modified.
+    def __init__(self, directory, cacheDirectory=None):
+        self.directory = directory
+        self.cacheDirectory = cacheDirectory or os.path.join(directory, "cache")
+        sources = self._sources()
+        if not self._loadCache(sources):
+            self._buildCache(sources)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    # lon-lat array of the route name, several names are concatenated into one route
+    def route(self, *names):
+        parts = []
+        for name in names:
+            if name not in self.index:
+                raise KeyError("Unknown route: " + str(name))
+            i = self.index[name]
+            parts.append(self.points[self.offsets[i]:self.offsets[i + 1]])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    # track files by route name with their modification time and size
+    def _sources(self):
+        sources = {}
+        for file in sorted(os.listdir(self.directory)):
+            name, extension = os.path.splitext(file)
+            if extension.lower() in TRACK_EXTENSIONS:
+                stat = os.stat(os.path.join(self.directory, file))
+                sources[name] = [file, stat.st_mtime_ns, stat.st_size]
+        return sources
+
+    def _loadCache(self, sources):
+        try:
+            with open(os.path.join(self.cacheDirectory, "index.json")) as file:
+                index = json.load(file)
+            if index["sources"] != sources:
+                return False
+            self.points = np.load(os.path.join(self.cacheDirectory, "points.npy"), mmap_mode='r')
+            self.offsets = np.load(os.path.join(self.cacheDirectory, "offsets.npy"))
+        except (OSError, ValueError, KeyError):
+            return False
+        self._setNames(index["names"])
+        return True
+
+    def _buildCache(self, sources):
+        names = list(sources)
+        tracks = [readTrack(os.path.join(self.directory, sources[name][0])) for name in names]
+        self.points = np.concatenate(tracks) if tracks else np.zeros((0, 2))
+        self.offsets = np.concatenate([[0], np.cumsum([len(track) for track in tracks], dtype=np.int64)])
+        self._setNames(names)
+        try:
+            os.makedirs(self.cacheDirectory, exist_ok=True)
+            np.save(os.path.join(self.cacheDirectory, "points.npy"), self.points)
+            np.save(os.path.join(self.cacheDirectory, "offsets.npy"), self.offsets)
+            # the index is written last, an interrupted write leaves an invalid cache
+            with open(os.path.join(self.cacheDirectory, "index.json"), "w") as file:
+                json.dump({"names": names, "sources": sources}, file)
+        except OSError:
+            pass  # read-only directory, the tracks are parsed again next time
+
+    def _setNames(self, names):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+
+
+# lon-lat array [deg] of the points of a track file in time order:
+# .csv: flightradar24 export with a "Position" column "lat,lon" or with "Longitude" and "Latitude" columns
+# .json: list of [lon, lat] pairs, or flightradar24 trail: list of objects with "lat", "lng" and optionally
+# "ts" (or such a list as "trail" of an object)
+def readTrack(path):
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        if rows and "Position" in rows[0]:
+            points = [[float(value) for value in row["Position"].split(",")][::-1] for row in rows]
+        else:
+            points = [[float(row["Longitude"]), float(row["Latitude"])] for row in rows]
+        if rows and "Timestamp" in rows[0]:
+            order = np.argsort([int(row["Timestamp"]) for row in rows], kind='stable')
+            points = [points[i] for i in order]
+    else:
+        with open(path) as file:
+            track = json.load(file)
+        if isinstance(track, dict):
+            track = track["trail"]
+        if track and isinstance(track[0], dict):
+            if "ts" in track[0]:
+                track = sorted(track, key=lambda point: point["ts"])  # trails are exported newest first
+            points = [[point["lng"], point["lat"]] for point in track]
+        else:
+            points = track
+    return np.array(points, dtype=float).reshape(-1, 2)
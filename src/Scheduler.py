@@ -0,0 +1,33 @@
+import heapq
+import itertools
+
+
+class EventScheduler:
+    # discrete event queue ordered by time, a binary heap of (time, sequence number, event).
+    # The sequence number keeps events with the same time in the order they were scheduled
+    def __init__(self):
+        self.queue = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.queue)
+
+    # time: [s] of the event, event: any object, e.g. (message type, plane index)
+    def schedule(self, time, event):
+        heapq.heappush(self.queue, (time, next(self.counter), event))
+
+    # returns the next event as (time, event) and removes it
+    def pop(self):
+        time, _, event = heapq.heappop(self.queue)
+        return time, event
+
+    # returns all events before time as list of (time, event) in time order and removes them
+    def popUntil(self, time):
+        events = []
+        while self.queue and self.queue[0][0] < time:
+            events.append(self.pop())
+        return events
+
+    # time of the next event, None if there is none
+    def nextTime(self):
+        return self.queue[0][0] if self.queue else None
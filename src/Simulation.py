@@ -1,67 +1,196 @@
-import matplotlib.pyplot as plt
+import argparse
+import json
+import os
 
+import numpy as np
+
+import Capture
 import CommSat
+import Constellation
 import Groundstation
+import Kinematics
 import Parameters
 import Plane
+import Recorder
+import Scheduler
+import SpatialIndex
+import Trajectory
+import Transmission
 
 
 class Simulation:
 
-    def __init__(self):
-        self.realFlightpaths = []
+    # planes: planes to simulate, defaults to the planes of Parameters
+    # recorder: Recorder.Recorder that stores the real and received positions on disk instead of in memory
+    # capture: Capture.FrameWriter of all transmitted frames
+    def __init__(self, planes=None, recorder=None, capture=None):
+        self.realFlightpaths = Trajectory.Trajectories()  # real positions per ICAO address
         self.timeStep = Parameters.sim_timestep
         self.groundstations = Parameters.groundstations
-        self.planes = Parameters.planes
+        self.planes = Parameters.planes if planes is None else planes
+        self.recorder = recorder
+        self.capture = capture
+        self.satellites = []  # satellites of the last run at their final positions
+
+    # duration: [s] of simulated time, None to run until all planes arrived
+    def run(self, duration=None):
+
+        # positions of all planes along their routes
+        fleet = Kinematics.Fleet(self.planes)
+
+        # a single satellite in view of every plane, or a constellation relaying each uplink by the visible
+        # satellite with the highest elevation
+        constellation = None
+        visibility = None
+        if Parameters.satellite_constellation:
+            constellation = Constellation.Constellation(Parameters.constellation_orbits,
+                                                        Parameters.constellation_satellites_per_orbit,
+                                                        Parameters.satellite_altitude,
+                                                        Parameters.constellation_inclination,
+                                                        Parameters.constellation_raan_spread,
+                                                        Parameters.satellite_min_elevation)
+            visibility = Constellation.VisibilityCache(constellation, fleet, self.groundstations,
+                                                       Parameters.visibility_timestep)
+            self.satellites = constellation.satellites
+        else:
+            self.satellites = [CommSat.CommSat()]
+        for satellite in self.satellites:
+            satellite.recorder = self.recorder
+        for gs in self.groundstations:
+            gs.recorder = self.recorder
 
-    def run(self):
+        # transmissions of one timestep, routed to their receivers
+        executor = Transmission.ChannelExecutor(Parameters.execution_backend, Parameters.execution_workers,
+                                                Parameters.execution_chunk_size)
+        dispatcher = Transmission.TransmissionDispatcher([satellite.id for satellite in self.satellites]
+                                                         + [gs.id for gs in self.groundstations], executor)
 
-        commSat = CommSat.CommSat()
+        # satellites with queued messages and a groundstation in view
+        def forwarding():
+            if visibility is not None:
+                return any(len(satellite.queue) > 0 and gs is not None
+                           for satellite, gs in zip(self.satellites, visibility.downlinkStations(timePassed)))
+            return self.satellites[0].canForward(self.groundstations)
+        # groundstations in range of the planes
+        receiverIndex = SpatialIndex.ReceiverIndex(self.groundstations, geodesic=Parameters.kinematics_geodesic)
 
-        allPlanesArrived = False
+        # squitters of all planes, every plane schedules its own messages at its own rates with random phase and jitter
+        scheduler = Scheduler.EventScheduler()
+        jitter = [Parameters.rng.stream('squitter', plane.id) for plane in self.planes]
+        for i, plane in enumerate(self.planes):
+            for kind, rate in plane.squitterRates.items():
+                if rate > 0:
+                    scheduler.schedule(jitter[i].uniform(0, 1 / rate), (kind, i))
 
         timePassed = 0.0
-        while not allPlanesArrived:
+        while len(scheduler) > 0 or forwarding():
             # Clear transmission
-            transmission = []
-
-            # Update the position of planes
-            allPlanesArrived = True
-            for plane in self.planes:
-                if not plane.atDestination():
-                    newPos = plane.updatePos(self.timeStep)
-                    self.realFlightpaths.append((newPos[0], newPos[1], plane.ICAO))
-                    # Transmission
-                    transmission += plane.transmitPosition(self.groundstations,
-                                                           commSat)  # Transmission[data, transmitTo, from]
-                    # identification messages are published at a frequency of 0.2Hz
-                    if (timePassed % 5 == 0):
-                        transmission += plane.transmitIdentification(self.groundstations, commSat)
-                    # not all planes arrived yet
-                    allPlanesArrived = False
-
-            # Satellite transmits to all groundstations - this happens with a delay of one timestep
-            transmission += commSat.transmit(
-                self.groundstations)  # Transmission[commSat.data, groundstations, from]
-
-            commSat.receive(transmission)  # data.mod, data.noise, data.demod ... -> commSat.data
+            dispatcher.clear()
+
+            # jump to the next squitter, unless a satellite still has to forward messages
+            if not forwarding():
+                timePassed = max(timePassed, scheduler.nextTime())
+            if duration is not None and timePassed >= duration:
+                timePassed = duration
+                break
+            if constellation is not None:
+                constellation.update(timePassed)
+            # all squitters within one window are received together
+            events = scheduler.popUntil(timePassed + self.timeStep)
+            times = np.array([t for t, _ in events], dtype=float)
+            indices = np.array([i for _, (_, i) in events], dtype=np.intp)
+            # planes stop transmitting once they arrived
+            flying = ~fleet.arrivedAt(times, indices)
+            events = [event for event, f in zip(events, flying) if f]
+            positions = fleet.positionsAt(times[flying], indices[flying])
+            tracks = fleet.tracksAt(times[flying], indices[flying])
+            receivers = receiverIndex.receiversInRange(positions)
+            if visibility is not None:
+                uplinks = visibility.uplinkSatellites(times[flying], indices[flying]).tolist()
+            else:
+                uplinks = [0] * len(events)
+            for (t, (kind, i)), position, track, inRange, uplink in zip(events, positions.tolist(), tracks.tolist(),
+                                                                         receivers, uplinks):
+                plane = self.planes[i]
+                plane.position = tuple(position)
+                plane.track = track
+                if kind == 'position':
+                    if self.recorder is not None:
+                        self.recorder.record('truth', t, plane.ICAO, position[0], position[1])
+                    else:
+                        self.realFlightpaths.append(position[0], position[1], plane.ICAO)
+                # Transmission
+                data = plane.encodeSquitter(kind)
+                dispatcher.add(plane.transmit(inRange, self.satellites[uplink] if uplink >= 0 else None, data,
+                                              t))  # Transmission[data, transmitTo, from]
+                if self.capture is not None:
+                    self.capture.write(t, data)
+                # the next squitter of the same type
+                interval = (1 + Parameters.squitter_jitter * jitter[i].uniform(-1, 1)) / plane.squitterRates[kind]
+                scheduler.schedule(t + interval, (kind, i))
 
+            # Satellites forward the messages of earlier windows to a groundstation, as many as their downlink can
+            if visibility is not None:
+                for satellite, gs in zip(self.satellites, visibility.downlinkStations(timePassed)):
+                    if gs is not None:
+                        dispatcher.add(satellite.transmit([gs], timePassed, self.timeStep))
+            else:
+                dispatcher.add(self.satellites[0].transmit(self.groundstations, timePassed,
+                                                           self.timeStep))  # Transmission[commSat.queue, groundstation, from]
+
+            # the channels of all transmissions to the receivers are simulated at once on the first delivery
+            for satellite in self.satellites:
+                satellite.receive(dispatcher.deliver(satellite.id), timePassed)  # data.mod, data.noise, data.demod ... -> commSat.queue
 
             # Save received position
             for gs in self.groundstations:
-                gs.receive(transmission)  # data.mod, data.noise, data.demod ... -> return pos
+                gs.receive(dispatcher.deliver(gs.id), timePassed)  # element.received -> return pos
 
             timePassed += self.timeStep
+        executor.close()
+        if self.recorder is not None:
+            self.recorder.flush()
         print("Total time passed in Simulation (min): ", timePassed / 60.0)
+        if constellation is not None:
+            constellation.printRelayStats()
+        else:
+            self.satellites[0].printRelayStats()
         for gs in self.groundstations:
             gs.printCorruptedMessageRate()
+            gs.printFixRate(timePassed)
+
+    # reads the real and the received flightpaths from the recorder into memory, e.g. to plot them
+    def loadRecorded(self):
+        for chunk in self.recorder.chunks('truth', ['lon', 'lat', 'icao']):
+            self.realFlightpaths.extend(chunk['lon'], chunk['lat'], chunk['icao'])
+        receivers = {gs.id: gs for gs in self.groundstations}
+        for chunk in self.recorder.chunks('fix', ['receiver', 'lon', 'lat', 'icao']):
+            for receiver in np.unique(chunk['receiver']).tolist():
+                rows = chunk['receiver'] == receiver
+                receivers[receiver].receivedPositions.extend(chunk['lon'][rows], chunk['lat'][rows], chunk['icao'][rows])
+
+    # writes the real and the received flightpaths as lon, lat and ICAO arrays to a .npz file
+    def save(self, path):
+        arrays = {}
+        for name, trajectories in [("real", self.realFlightpaths)] + \
+                [("received_" + gs.name, gs.receivedPositions) for gs in self.groundstations]:
+            positions, icaos = trajectories.arrays()
+            arrays[name + "_lon"] = positions[:, 0]
+            arrays[name + "_lat"] = positions[:, 1]
+            arrays[name + "_icao"] = icaos
+        np.savez_compressed(path, **arrays)
+
+    # maxPoints: number of points plotted per flightpath at most, None to plot every point
+    def plot(self, maxPoints=10000):
+        # imported on use, so headless runs start without a plotting backend
+        import matplotlib.pyplot as plt
 
-    def plot(self):
         img = plt.imread("img/map.JPG")
         fig, ax = plt.subplots()
         ax.imshow(img, extent=[99.4, 116.5, 9.4, 23.2])
-        # Add Comm Sat to plot
-        ax.scatter(x=110, y=18, c='r', marker='x', label='Communication Satellite')
+        # Add Comm Sats to plot
+        satellites = np.array([satellite.position for satellite in self.satellites] or [Parameters.satellite_position])
+        ax.scatter(x=satellites[:, 0], y=satellites[:, 1], c='r', marker='x', label='Communication Satellite')
         # Add range of groundstation
         for gs in self.groundstations:
             rangepatch = plt.Circle(gs.position, gs.recRange * 0.0000093, color='g',
@@ -69,40 +198,25 @@ class Simulation:
             ax.add_patch(rangepatch)
 
         # Add real flight paths to plot
-        lons, lats, icaos = zip(*self.realFlightpaths)
-        icaoset = set(icaos)
         scatterPlots = []
-        for icao in icaoset:
-            lonsnew = ()
-            latsnew = ()
-            for element in self.realFlightpaths:
-                if element[2] == icao:
-                    lonsnew += (element[0],)
-                    latsnew += (element[1],)
+        for icao in self.realFlightpaths.icaos():
+            path = self.realFlightpaths.trajectory(icao, maxPoints)
             label = "Real Flightpath of " + icao
             color = hex(int(icao, 16))[2:8]
             while(len(color) < 6):
                 color = "0" + color
-            scatterPlot = ax.scatter(lonsnew, latsnew, s=1.0, c="#" + color, alpha=0.2, label=label)
+            scatterPlot = ax.scatter(path[:, 0], path[:, 1], s=1.0, c="#" + color, alpha=0.2, label=label)
             scatterPlots.append(scatterPlot)
 
         # Add received flight paths to plot
-        # first identify number of planes
         for gs in self.groundstations:
-            lons, lats, icaos = zip(*gs.receivedPositions)
-            icaoset = set(icaos)
-            for icao in icaoset:
-                lonsnew = ()
-                latsnew = ()
-                for element in gs.receivedPositions:
-                    if (element[2] == icao):
-                        lonsnew += (element[0],)
-                        latsnew += (element[1],)
+            for icao in gs.receivedPositions.icaos():
+                path = gs.receivedPositions.trajectory(icao, maxPoints)
                 label = "Received Flightpaths of " + icao + " in " + gs.name
                 color = hex(int(icao, 16) + int(gs.name.lower(), 36))[2:8]
                 while(len(color) < 6):
                     color = "0" + color
-                scatterPlot = ax.scatter(lonsnew, latsnew, s=1.0, marker=',', c="#" + color, label=label)
+                scatterPlot = ax.scatter(path[:, 0], path[:, 1], s=1.0, marker=',', c="#" + color, label=label)
                 scatterPlots.append(scatterPlot)
 
         # Add groundstations to plot
@@ -115,7 +229,8 @@ class Simulation:
         leg = ax.legend(fontsize=8)
 
         # Enable legend picking
-        for legEntry in leg.legendHandles:
+        # legendHandles was renamed to legend_handles in matplotlib 3.7
+        for legEntry in getattr(leg, 'legend_handles', None) or leg.legendHandles:
             legEntry.set_picker(5)
 
         def on_pick(event):
@@ -134,7 +249,66 @@ class Simulation:
         plt.show()
 
 
+# planes of a JSON fleet file: a list of objects with the arguments of Plane, e.g.
+# {"id": "Plane_ID", "callSign": "TUAN01", "position": [lon, lat], "height": 1000, "speed": 250,
+#  "waypoints": [[lon, lat], ...]}
+# instead of waypoints, "route" names a route of Parameters.routes or a list of routes flown one after the other
+def loadFleet(path):
+    with open(path) as file:
+        entries = json.load(file)
+    planes = []
+    for entry in entries:
+        entry = dict(entry)
+        if "position" in entry:
+            entry["position"] = tuple(entry["position"])
+        if "waypoints" in entry:
+            entry["waypoints"] = [tuple(waypoint) for waypoint in entry["waypoints"]]
+        if "route" in entry:
+            route = entry.pop("route")
+            entry["waypoints"] = Parameters.routes.route(*([route] if isinstance(route, str) else route))
+        planes.append(Plane.Plane(**entry))
+    return planes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation of ADS-B transmissions between planes, a communication "
+                                                 "satellite and groundstations")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="simulated time in seconds, default: until all planes arrived")
+    parser.add_argument("--fleet", default=None, help="JSON fleet file, default: the planes of Parameters.py")
+    parser.add_argument("--output", default=None, help=".npz file for the real and received flightpaths")
+    parser.add_argument("--record", default=None,
+                        help="directory for .npz segments of the real and received positions, CRC failures and links, "
+                             "keeps memory bounded for long runs")
+    parser.add_argument("--capture", default=None,
+                        help="directory for the transmitted frames (transmitted.<format>) and the frames demodulated "
+                             "by every groundstation (<id>.<format>)")
+    parser.add_argument("--capture-format", choices=["avr", "beast"], default="avr", help="format of the captures")
+    parser.add_argument("--headless", action="store_true", help="do not plot the flightpaths")
+    args = parser.parse_args(argv)
+
+    recorder = Recorder.Recorder(args.record) if args.record else None
+    capture = None
+    if args.capture:
+        os.makedirs(args.capture, exist_ok=True)
+        capture = Capture.FrameWriter(os.path.join(args.capture, "transmitted." + args.capture_format),
+                                      args.capture_format)
+        for gs in Parameters.groundstations:
+            gs.capture = Capture.FrameWriter(os.path.join(args.capture, gs.id + "." + args.capture_format),
+                                             args.capture_format)
+    simulation = Simulation(loadFleet(args.fleet) if args.fleet else None, recorder, capture)
+    simulation.run(args.duration)
+    if capture is not None:
+        for writer in [capture] + [gs.capture for gs in simulation.groundstations]:
+            writer.close()
+    if recorder is not None and (args.output or not args.headless):
+        simulation.loadRecorded()
+    if args.output:
+        simulation.save(args.output)
+    if not args.headless:
+        simulation.plot()
+    return simulation
+
+
 if __name__ == "__main__":
-    simulation = Simulation()
-    simulation.run()
-    simulation.plot()
+    main()
@@ -0,0 +1,93 @@
+import math
+
+import geopy.distance
+import numpy as np
+
+import Kinematics
+
+# the geodesic distance on the WGS-84 ellipsoid differs less than this fraction from the spherical distance
+GEODESIC_TOLERANCE = 0.01
+
+
+class ReceiverIndex:
+    # grid of lat-lon cells over the coverage of the receivers (e.g. groundstations with position and recRange),
+    # every cell lists the receivers whose range reaches into it. The positions of many planes are bucketed into
+    # their cells in one call and only the receivers of the cell are tested, with vectorized distances.
+    # cellSize: [deg], defaults to the largest range.
+    # geodesic: decide pairs close to the range limit with the WGS-84 distance of geopy (as Plane.inRange)
+    # instead of the spherical distance
+    def __init__(self, receivers, cellSize=None, geodesic=False):
+        self.receivers = receivers
+        self.geodesic = geodesic
+        self.positions = np.array([receiver.position for receiver in receivers], dtype=float).reshape(-1, 2)
+        self.ranges = np.array([receiver.recRange for receiver in receivers], dtype=float)
+        # angular radius [deg] of the coverage, with a margin for the ellipsoid
+        radii = np.degrees(self.ranges * (1 + GEODESIC_TOLERANCE) / Kinematics.EARTH_RADIUS)
+        self.cellSize = cellSize or max(float(np.max(radii, initial=0.0)), 0.1)
+        self.numLatCells = math.ceil(180 / self.cellSize)
+        self.numLonCells = math.ceil(360 / self.cellSize)
+
+        cells = []
+        owners = []
+        for i, ((lon, lat), radius) in enumerate(zip(self.positions.tolist(), radii.tolist())):
+            rows = range(self._row(lat - radius), self._row(lat + radius) + 1)
+            maxLat = min(abs(lat) + radius, 90.0)
+            if maxLat >= 89.0 or radius / math.cos(math.radians(maxLat)) >= 180:
+                cols = range(self.numLonCells)  # the coverage reaches around the pole
+            else:
+                lonRadius = radius / math.cos(math.radians(maxLat))
+                first = math.floor((lon - lonRadius + 180) / self.cellSize)
+                last = math.floor((lon + lonRadius + 180) / self.cellSize)
+                cols = sorted({col % self.numLonCells for col in range(first, last + 1)})
+            for row in rows:
+                for col in cols:
+                    cells.append(row * self.numLonCells + col)
+                    owners.append(i)
+
+        # receivers sorted by cell, cellStart[k]:cellStart[k + 1] are the receivers of cellIds[k]
+        cells = np.array(cells, dtype=np.int64)
+        order = np.argsort(cells, kind='stable')
+        self.cellIds, counts = np.unique(cells[order], return_counts=True)
+        self.cellStart = np.concatenate([[0], np.cumsum(counts)])
+        self.cellReceivers = np.array(owners, dtype=np.intp)[order]
+
+    # returns the pairs (position index, receiver index) of all positions within range of a receiver,
+    # ordered by position and receiver
+    def query(self, positions):
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if len(self.cellIds) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        cells = self._row(positions[:, 1]) * self.numLonCells + self._col(positions[:, 0])
+        slot = np.minimum(np.searchsorted(self.cellIds, cells), len(self.cellIds) - 1)
+        start = self.cellStart[slot]
+        counts = np.where(self.cellIds[slot] == cells, self.cellStart[slot + 1] - start, 0)
+
+        # candidate pairs of every position with the receivers of its cell
+        positionIdx = np.repeat(np.arange(len(positions)), counts)
+        offsets = np.arange(len(positionIdx)) - np.repeat(np.cumsum(counts) - counts, counts)
+        receiverIdx = self.cellReceivers[np.repeat(start, counts) + offsets]
+
+        ranges = self.ranges[receiverIdx]
+        dist = Kinematics.EARTH_RADIUS * Kinematics.centralAngle(positions[positionIdx], self.positions[receiverIdx])
+        if self.geodesic:
+            # only pairs close to the range limit can be decided differently on the ellipsoid
+            unsure = np.flatnonzero(np.abs(dist - ranges) <= GEODESIC_TOLERANCE * ranges)
+            dist[unsure] = [geopy.distance.distance(p[::-1], r[::-1]).m  # geopy expects lat-lon order
+                            for p, r in zip(positions[positionIdx[unsure]].tolist(),
+                                            self.positions[receiverIdx[unsure]].tolist())]
+        inRange = dist <= ranges
+        return positionIdx[inRange], receiverIdx[inRange]
+
+    # returns the list of receivers in range of every position
+    def receiversInRange(self, positions):
+        positionIdx, receiverIdx = self.query(positions)
+        receivers = [[] for _ in range(len(np.asarray(positions).reshape(-1, 2)))]
+        for i, j in zip(positionIdx.tolist(), receiverIdx.tolist()):
+            receivers[i].append(self.receivers[j])
+        return receivers
+
+    def _row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cellSize), 0, self.numLatCells - 1).astype(np.int64)
+
+    def _col(self, lon):
+        return (np.floor((np.asarray(lon) + 180) / self.cellSize).astype(np.int64)) % self.numLonCells
@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+
+class Trajectories:
+    # lon-lat positions [deg] recorded per ICAO address. Every trajectory is an array whose capacity is doubled
+    # when it is full, so appending is amortized constant time and a trajectory is read as a slice.
+    # capacity: initial number of positions per trajectory
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.buffers = {}  # ICAO address -> array of shape (capacity, 2)
+        self.counts = {}  # ICAO address -> number of recorded positions
+
+    # total number of recorded positions
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def append(self, lon, lat, icao):
+        buffer, count = self._reserve(icao, 1)
+        buffer[count] = (lon, lat)
+        self.counts[icao] = count + 1
+
+    # appends the positions of arrays, e.g. of a recorded chunk (see Recorder.readChunks)
+    def extend(self, lons, lats, icaos):
+        icaos = np.asarray(icaos)
+        order = np.argsort(icaos, kind='stable')
+        addresses, first = np.unique(icaos[order], return_index=True)
+        for icao, rows in zip(addresses.tolist(), np.split(order, first[1:])):
+            buffer, count = self._reserve(icao, len(rows))
+            buffer[count:count + len(rows), 0] = np.asarray(lons)[rows]
+            buffer[count:count + len(rows), 1] = np.asarray(lats)[rows]
+            self.counts[icao] = count + len(rows)
+
+    # buffer of icao with space for n more positions and its number of positions
+    def _reserve(self, icao, n):
+        buffer = self.buffers.get(icao)
+        count = self.counts.get(icao, 0)
+        if buffer is None or count + n > len(buffer):
+            grown = np.empty((max(2 * count, count + n, self.capacity), 2))
+            if buffer is not None:
+                grown[:count] = buffer[:count]
+            self.buffers[icao] = buffer = grown
+        return buffer, count
+
+    # ICAO addresses in the order of their first position
+    def icaos(self):
+        return list(self.buffers)
+
+    # lon-lat array of the trajectory of icao, a view that is valid until the next append.
+    # maxPoints: keep only every n-th position so at most maxPoints are returned, None for all positions
+    def trajectory(self, icao, maxPoints=None):
+        count = self.counts.get(icao, 0)
+        if count == 0:
+            return np.zeros((0, 2))
+        step = 1 if maxPoints is None else max(math.ceil(count / maxPoints), 1)
+        return self.buffers[icao][:count:step]
+
+    # all positions as lon-lat array and the ICAO address of every position, grouped by ICAO address
+    def arrays(self):
+        icaos = self.icaos()
+        positions = np.concatenate([self.trajectory(icao) for icao in icaos]) if icaos else np.zeros((0, 2))
+        addresses = np.repeat(np.array(icaos, dtype=str), [self.counts[icao] for icao in icaos])
+        return positions, addresses
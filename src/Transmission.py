@@ -1,10 +1,20 @@
+import concurrent.futures
+import functools
+import math
+import os
+
 import numpy as np
-from matplotlib import pyplot as plt
-from numpy.random import standard_normal
-from scipy.stats import rice
 
+import RNG
 import utils
 
+# random number generator of the channels if none is given
+default_rng = np.random.default_rng()
+# root of the seeds of transmissions created without a seed
+default_seed_sequence = np.random.SeedSequence()
+# samples of the waveform channels simulated at once by BPSK_Batch_Channel
+WAVEFORM_BLOCK_SAMPLES = 2 ** 14
+
 class Transmission:
     """
     A class used to represent a Transmission between transmitter and receiver
@@ -21,14 +31,28 @@ class Transmission:
         id of the destination / receiver
     SNRdB : int
         signal to noise ratio in [dB] indicating the quality of the transmission
+    K_factor : float
+        Rician K-factor, power of the line of sight over the scattered power
+    seed : np.random.SeedSequence
+        seed of the random stream of the fading and noise samples
+    time : float
+        start of the transmission in [s] of simulation time, None if unknown
+    origin_time : float
+        time the aircraft sent the message in [s] of simulation time, differs from
+        time for a message relayed by a satellite. None if it is time
+    distance : float
+        distance between transmitter and receiver in [m], None if unknown
     channel : Channel
         Channel class that has to be implemented inside the Transmission class.
-        Currently implemented: BPSK_AWGN_Rayleigh_Channel | BPSK_AWGN_Rician_Channel
+        Currently implemented: BPSK_AWGN_Rayleigh_Channel | BPSK_AWGN_Rician_Channel | BPSK_Symbol_Channel
     
     Methods
     -------
     transmit()
         performs modulation, channel simulation (fading + noise) and demodulation
+    getReceived() -> str
+        returns the demodulated hexadecimal string, transmitting only if
+        transmitBatch() has not already done so
     getData() -> str
         returns the input hexadecimal string
     getSrc() -> str
@@ -47,7 +71,12 @@ class Transmission:
                 dest,
                 SNRdB=9, 
                 channel_model='bpsk-awgn-rayleigh',
-                carrier_frequency=1616000000) -> None:
+                carrier_frequency=1616000000,
+                seed=None,
+                K_factor=0.5,
+                time=None,
+                distance=None,
+                origin_time=None) -> None:
         """
         Parameters
         ----------
@@ -63,12 +92,29 @@ class Transmission:
             signal to noise ratio in [dB] indicating the quality of the transmission
         channel_model : str
             chooses the used fading channel model.
-            'bpsk-awgn-rayleigh' | 'bpsk-awgn-rice'
+            'bpsk-awgn-rayleigh' | 'bpsk-awgn-rice' | 'bpsk-symbol-rayleigh' |
+            'bpsk-symbol-rice' | 'bpsk-ber-rayleigh' | 'bpsk-ber-rice'
         carrier_frequency : int
             Carrier frequency of the modulation in [Hz]
+        seed : np.random.SeedSequence
+            seed of the random stream of the fading and noise samples, see RNG.RNGService.
+            transmit() and transmitBatch() draw from the same counter-based stream of the seed
+            (see RNG.CounterStreams), so they receive the same data.
+            None for an unreproducible seed
+        K_factor : float
+            Rician K-factor of the '*-rice' channel models, power of the line of sight
+            over the scattered power
+        time : float
+            start of the transmission in [s] of simulation time, None if unknown
+        distance : float
+            distance between transmitter and receiver in [m], None if unknown.
+            Gives the propagation delay and path loss of the collision model
+        origin_time : float
+            time the aircraft sent the message in [s] of simulation time, e.g. of a
+            message relayed by a satellite. None if it is time
         channel : Channel
             Modulator class that has to be implemented inside the Transmission class.
-            Currently implemented: BPSK_AWGN_Rayleigh_Channel | BPSK_AWGN_Rician_Channel
+            Currently implemented: BPSK_AWGN_Rayleigh_Channel | BPSK_AWGN_Rician_Channel | BPSK_Symbol_Channel
         """
 
         self.data = data
@@ -76,7 +122,22 @@ class Transmission:
         self.src_is_satellite = src_is_satellite
         self.dest = dest  # destination id
         self.SNRdB = SNRdB  # signal to noise ratio in dB
-        self.channel = self._getChannel(channel_model, carrier_frequency)  # modulator
+        self.channel_model = channel_model
+        self.carrier_frequency = carrier_frequency
+        self.seed = seed if seed is not None else default_seed_sequence.spawn(1)[0]
+        self.K_factor = K_factor
+        self.time = time  # start of the transmission [s]
+        self.distance = distance  # [m]
+        self.origin_time = origin_time  # sent by the aircraft [s], None if it is time
+        self._channel = None  # modulator, built on the first use
+        self.received = None  # demodulated data, filled by transmitBatch()
+
+    @property
+    def channel(self):
+        # transmitBatch() does not need the channel of a single transmission
+        if self._channel is None:
+            self._channel = self._getChannel(self.channel_model, self.carrier_frequency)
+        return self._channel
 
     def transmit(self):
         """
@@ -89,6 +150,11 @@ class Transmission:
         demodulated_data = self.channel.demodulate(noisy_data)
         return utils.bit_array_to_hex_string(demodulated_data)
 
+    def getReceived(self) -> str:
+        if self.received is None:
+            self.received = self.transmit()
+        return self.received
+
     def getData(self) -> str:
         return self.data
 
@@ -114,14 +180,71 @@ class Transmission:
             Implemented Channel model
         """
 
+        rng = RNG.CounterStreams(RNG.streamKeys([self.seed]))
         if channel_model == 'bpsk-awgn-rayleigh':
-            return BPSK_AWGN_Rayleigh_Channel(utils.hex_string_to_bit_array(self.data), self.SNRdB, carrier_frequency)
+            return BPSK_AWGN_Rayleigh_Channel(utils.hex_string_to_bit_array(self.data), self.SNRdB, carrier_frequency, rng)
         elif channel_model == 'bpsk-awgn-rice':
-            return BPSK_AWGN_Rician_Channel(utils.hex_string_to_bit_array(self.data), self.SNRdB, carrier_frequency)
+            return BPSK_AWGN_Rician_Channel(utils.hex_string_to_bit_array(self.data), self.SNRdB, carrier_frequency, rng,
+                                            self.K_factor)
+        elif channel_model.startswith('bpsk-symbol-') or channel_model.startswith('bpsk-ber-'):
+            return BPSK_Symbol_Channel(utils.hex_string_to_bit_array(self.data), self.SNRdB, carrier_frequency,
+                                       channel_model, rng, self.K_factor)
         else:
             return None
 
 
+class CarrierTable:
+    """
+    Read-only reference waveforms of one carrier frequency and sample rate.
+    Instances are shared by all channels, use carrier_table() to get one.
+
+    Attributes
+    ----------
+    t : np.array
+        time steps of one sine cycle
+    l : np.array
+        three time steps
+    sine_0_phase : np.array
+        sampled sine phase with 0° phase
+    sine_180_phase : np.array
+        sampled sine phase with 180° phase
+    symbol_templates : np.array
+        sampled sine phases of the bits 0 and 1, indexed by the bit.
+        symbol_templates[bits].reshape(-1) is the modulated frame.
+    """
+
+    def __init__(self, carrier_frequency, sample_rate):
+        self.t = np.arange(0, 3 / carrier_frequency, 3 / (carrier_frequency * sample_rate))
+        self.l = np.arange(0, 3 * 3 / carrier_frequency, 3 / (carrier_frequency * sample_rate))
+        self.sine_0_phase = np.sin(2 * np.pi * carrier_frequency * self.t)
+        self.sine_180_phase = -self.sine_0_phase
+        self.symbol_templates = np.stack([self.sine_180_phase, self.sine_0_phase])
+        for array in (self.t, self.l, self.sine_0_phase, self.sine_180_phase, self.symbol_templates):
+            array.setflags(write=False)
+
+
+@functools.lru_cache(maxsize=8)
+def carrier_table(carrier_frequency, sample_rate):
+    """
+    Returns the shared CarrierTable of a carrier frequency and sample rate.
+    The least recently used tables are evicted.
+
+    Parameters
+    ----------
+    carrier_frequency : int
+        Carrier frequency of the modulation in [Hz]
+    sample_rate : int
+        Resolution of the sampled sine wave
+
+    Returns
+    -------
+    CarrierTable
+        read-only reference waveforms
+    """
+
+    return CarrierTable(carrier_frequency, sample_rate)
+
+
 class BPSK_AWGN_Rayleigh_Channel:
     """
     Implemented Channel class model using Binary Phase Shift Keying modulation,
@@ -141,10 +264,14 @@ class BPSK_AWGN_Rayleigh_Channel:
         time steps of one sine cycle
     l : np.array
         three time steps
-    sine_0_phase : list
+    sine_0_phase : np.array
         sampled sine phase with 0° phase
-    sine_180_phase : list
+    sine_180_phase : np.array
         sampled sine phase with 180° phase
+    symbol_templates : np.array
+        sampled sine phases of the bits 0 and 1, indexed by the bit
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator of the fading and noise samples
 
     Methods
     -------
@@ -159,7 +286,7 @@ class BPSK_AWGN_Rayleigh_Channel:
         Small helper function for faster plotting.
     """
 
-    def __init__(self, data, SNRdB, carrier_frequency):
+    def __init__(self, data, SNRdB, carrier_frequency, rng=None):
         """
         Parameters
         ----------
@@ -169,16 +296,22 @@ class BPSK_AWGN_Rayleigh_Channel:
             signal to noise ratio in [dB] indicating the quality of the transmission
         carrier_frequency : int
             Carrier frequency of the modulation in [Hz]
+        rng : np.random.Generator or RNG.CounterStreams
+            random number generator of the fading and noise samples,
+            defaults to the module generator
         """
 
         self.data = data
         self.SNRdB = SNRdB
         self.carrier_frequency = carrier_frequency
         self.sample_rate = 48
-        self.t = np.arange(0, 3 / self.carrier_frequency, 3 / (self.carrier_frequency * self.sample_rate))
-        self.l = np.arange(0, 3 * 3 / self.carrier_frequency, 3 / (self.carrier_frequency * self.sample_rate))
-        self.sine_0_phase = [np.sin(2 * np.pi * self.carrier_frequency * ts) for ts in self.t]
-        self.sine_180_phase = [-np.sin(2 * np.pi * self.carrier_frequency * ts) for ts in self.t]
+        carrier = carrier_table(self.carrier_frequency, self.sample_rate)
+        self.t = carrier.t
+        self.l = carrier.l
+        self.sine_0_phase = carrier.sine_0_phase
+        self.sine_180_phase = carrier.sine_180_phase
+        self.symbol_templates = carrier.symbol_templates
+        self.rng = rng if rng is not None else default_rng
 
     def modulate(self):
         """
@@ -190,13 +323,7 @@ class BPSK_AWGN_Rayleigh_Channel:
             list of floats of the modulated signal
         """
 
-        modulated_signal = []
-        for n in range(0, len(self.data)):
-            if self.data[n] == 1:
-                modulated_signal.extend(self.sine_0_phase)
-            else:
-                modulated_signal.extend(self.sine_180_phase)
-        return np.array(list(modulated_signal), dtype=float)
+        return self.symbol_templates[self.data].reshape(-1)
 
     def simulateChannel(self, signal):
         """
@@ -214,9 +341,11 @@ class BPSK_AWGN_Rayleigh_Channel:
             list of floats of the faded noisy signal
         """
 
-        h_abs = rayleigh(len(signal)) # Rayleigh flat fading samples
+        h_abs = rayleigh(len(signal), self.rng) # Rayleigh flat fading samples
         hs = h_abs * signal # fading effect on modulated symbols
-        return awgn(self.SNRdB, hs) / h_abs # return signal with added awg noise
+        awgn(self.SNRdB, hs, rng=self.rng, out=hs) # add awg noise in place
+        hs /= h_abs
+        return hs
 
     def demodulate(self, signal):
         """
@@ -233,22 +362,15 @@ class BPSK_AWGN_Rayleigh_Channel:
             list of ints / bits of the demodulated signal
         """
 
-        corr1 = 0
-        corr2 = 0
-        demodulated_data = []
-        for n in range(0, len(self.data)):
-            for i in range(0, self.sample_rate):
-                corr1 += self.sine_0_phase[i] * signal[self.sample_rate * n + i]
-                corr2 += self.sine_180_phase[i] * signal[self.sample_rate * n + i]
-            if corr1 > corr2:
-                demodulated_data.append(1)
-            else:
-                demodulated_data.append(0)
-            corr1 = 0
-            corr2 = 0
-        return demodulated_data
+        bits = np.reshape(signal, (len(self.data), self.sample_rate))
+        corr1 = bits @ self.sine_0_phase
+        corr2 = bits @ self.sine_180_phase
+        return (corr1 > corr2).astype(int).tolist()
 
     def _plot(self, signal, title, x_lbl, y_lbl):
+        # imported on use, so the simulation runs without a plotting backend
+        from matplotlib import pyplot as plt
+
         plt.title(title)
         plt.xlabel(x_lbl)
         plt.ylabel(y_lbl)
@@ -259,7 +381,10 @@ class BPSK_AWGN_Rayleigh_Channel:
 class BPSK_AWGN_Rician_Channel:
     """
     Implemented Channel class model using Binary Phase Shift Keying modulation,
-    Rician fading channel and Additive White Gaussian Noise
+    Rician block fading channel and Additive White Gaussian Noise.
+    The whole message is faded with one gain. SNRdB is the ratio of the transmitted
+    signal, so a deep fade buries the whole message in the noise. The K-factor
+    shapes how often that happens, equalizing the gain does not change the decisions.
 
     Attributes
     ----------
@@ -275,10 +400,16 @@ class BPSK_AWGN_Rician_Channel:
         time steps of one sine cycle
     l : np.array
         three time steps
-    sine_0_phase : list
+    sine_0_phase : np.array
         sampled sine phase with 0° phase
-    sine_180_phase : list
+    sine_180_phase : np.array
         sampled sine phase with 180° phase
+    symbol_templates : np.array
+        sampled sine phases of the bits 0 and 1, indexed by the bit
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator of the fading and noise samples
+    K_factor : float
+        Rician K-factor, power of the line of sight over the scattered power
 
     Methods
     -------
@@ -293,7 +424,7 @@ class BPSK_AWGN_Rician_Channel:
         Small helper function for faster plotting.
     """
 
-    def __init__(self, data, SNRdB, carrier_frequency):
+    def __init__(self, data, SNRdB, carrier_frequency, rng=None, K_factor=0.5):
         """
         Parameters
         ----------
@@ -303,16 +434,25 @@ class BPSK_AWGN_Rician_Channel:
             signal to noise ratio in [dB] indicating the quality of the transmission
         carrier_frequency : int
             Carrier frequency of the modulation in [Hz]
+        rng : np.random.Generator or RNG.CounterStreams
+            random number generator of the fading and noise samples,
+            defaults to the module generator
+        K_factor : float
+            Rician K-factor, power of the line of sight over the scattered power
         """
 
         self.data = data
         self.SNRdB = SNRdB
         self.carrier_frequency = carrier_frequency
         self.sample_rate = 48
-        self.t = np.arange(0, 3 / self.carrier_frequency, 3 / (self.carrier_frequency * self.sample_rate))
-        self.l = np.arange(0, 3 * 3 / self.carrier_frequency, 3 / (self.carrier_frequency * self.sample_rate))
-        self.sine_0_phase = [np.sin(2 * np.pi * self.carrier_frequency * ts) for ts in self.t]
-        self.sine_180_phase = [-np.sin(2 * np.pi * self.carrier_frequency * ts) for ts in self.t]
+        carrier = carrier_table(self.carrier_frequency, self.sample_rate)
+        self.t = carrier.t
+        self.l = carrier.l
+        self.sine_0_phase = carrier.sine_0_phase
+        self.sine_180_phase = carrier.sine_180_phase
+        self.symbol_templates = carrier.symbol_templates
+        self.rng = rng if rng is not None else default_rng
+        self.K_factor = K_factor
 
     def modulate(self):
         """
@@ -324,13 +464,7 @@ class BPSK_AWGN_Rician_Channel:
             list of floats of the modulated signal
         """
 
-        modulated_signal = []
-        for n in range(0, len(self.data)):
-            if self.data[n] == 1:
-                modulated_signal.extend(self.sine_0_phase)
-            else:
-                modulated_signal.extend(self.sine_180_phase)
-        return np.array(list(modulated_signal), dtype=float)
+        return self.symbol_templates[self.data].reshape(-1)
 
     def simulateChannel(self, signal):
         """
@@ -348,9 +482,12 @@ class BPSK_AWGN_Rician_Channel:
             list of floats of the faded noisy signal
         """
 
-        h_abs = rice.rvs(1, len(signal)) # Rice flat fading samples
+        h_abs = rician(1, self.K_factor, self.rng)[0] # Rician block fading, one gain per message
         hs = h_abs * signal # fading effect on modulated symbols
-        return awgn(self.SNRdB, hs) / h_abs # return signal with added awg noise
+        # the noise refers to the transmitted power, the faded message has the SNR SNRdB + 20 log10(h_abs)
+        awgn(self.SNRdB + 20 * np.log10(h_abs), hs, rng=self.rng, out=hs) # add awg noise in place
+        hs /= h_abs
+        return hs
 
     def demodulate(self, signal):
         """
@@ -367,22 +504,14 @@ class BPSK_AWGN_Rician_Channel:
             list of ints / bits of the demodulated signal
         """
 
-        corr1 = 0
-        corr2 = 0
-        demodulated_data = []
-        for n in range(0, len(self.data)):
-            for i in range(0, self.sample_rate):
-                corr1 += self.sine_0_phase[i] * signal[self.sample_rate * n + i]
-                corr2 += self.sine_180_phase[i] * signal[self.sample_rate * n + i]
-            if corr1 > corr2:
-                demodulated_data.append(1)
-            else:
-                demodulated_data.append(0)
-            corr1 = 0
-            corr2 = 0
-        return demodulated_data
+        bits = np.reshape(signal, (len(self.data), self.sample_rate))
+        corr1 = bits @ self.sine_0_phase
+        corr2 = bits @ self.sine_180_phase
+        return (corr1 > corr2).astype(int).tolist()
+
+    def _plot(self, signal, title, x_lbl, y_lbl):
+        from matplotlib import pyplot as plt
 
-    def plot(self, signal, title, x_lbl, y_lbl):
         plt.title(title)
         plt.xlabel(x_lbl)
         plt.ylabel(y_lbl)
@@ -390,49 +519,573 @@ class BPSK_AWGN_Rician_Channel:
         plt.show()
 
 
-def awgn(SNRdB, signal, L=1):
+class BPSK_Symbol_Channel:
+    """
+    Implemented Channel class model simulating Binary Phase Shift Keying at
+    symbol level, i.e. without sampling the carrier.
+    Uses the symbol-level modes of BPSK_Batch_Channel with a single message.
+
+    Attributes
+    ----------
+    data : list(int)
+        list of bits, converted hexadecimal string using ref(utils.hex_string_to_bit_array(...))
+    SNRdB : int
+        signal to noise ratio in [dB] indicating the quality of the transmission
+    carrier_frequency : int
+        Carrier frequency of the modulation in [Hz]
+    batch_channel : BPSK_Batch_Channel
+        channel engine simulating the message
+
+    Methods
+    -------
+    modulate() -> np.array
+        Maps the data to antipodal baseband symbols.
+    simulateChannel(signal : np.array) -> np.array
+        Simulates the transmission over a channel.
+        Adds fading and noise per symbol or flips bits with the bit error rate.
+    demodulate(signal : np.array) -> list(int)
+        Decides the bits from the received symbols.
+    """
+
+    def __init__(self, data, SNRdB, carrier_frequency, channel_model, rng=None, K_factor=0.5):
+        """
+        Parameters
+        ----------
+        data : list(int)
+            list of bits, converted hexadecimal string using ref(utils.hex_string_to_bit_array(...))
+        SNRdB : int
+            signal to noise ratio in [dB] indicating the quality of the transmission
+        carrier_frequency : int
+            Carrier frequency of the modulation in [Hz]
+        channel_model : str
+            'bpsk-symbol-rayleigh' | 'bpsk-symbol-rice' | 'bpsk-ber-rayleigh' | 'bpsk-ber-rice'
+        rng : np.random.Generator or RNG.CounterStreams
+            random number generator of the fading and noise samples,
+            defaults to the module generator
+        K_factor : float
+            Rician K-factor of the '*-rice' channel models
+        """
+
+        self.data = data
+        self.SNRdB = SNRdB
+        self.carrier_frequency = carrier_frequency
+        self.batch_channel = BPSK_Batch_Channel(channel_model, carrier_frequency, rng, K_factor)
+
+    def modulate(self):
+        return self.batch_channel.modulate(np.array([self.data]))
+
+    def simulateChannel(self, signal):
+        return self.batch_channel.simulateChannel(signal, np.array([self.SNRdB], dtype=float),
+                                                  np.array([len(self.data)]))
+
+    def demodulate(self, signal):
+        return self.batch_channel.demodulate(signal)[0].tolist()
+
+
+class BPSK_Batch_Channel:
+    """
+    Vectorized channel engine simulating many transmissions at once.
+    Every transmission is one row of a 2-D array (messages x samples), so
+    modulation, fading, noise and demodulation run as matrix operations.
+    Rows shorter than the longest message are zero padded at the end.
+
+    Besides the sampled waveform ('bpsk-awgn-*') two symbol-level modes skip
+    the waveform synthesis:
+    'bpsk-symbol-*' draws one baseband sample per bit with an effective
+    fading gain (see effective_fading) and in-phase matched-filter noise,
+    'bpsk-ber-*' flips bits with the BPSK bit error rate of the same effective
+    fading (see bit_error_rates).
+    Both reproduce the corruption rates of the waveform path. Rayleigh fading
+    draws a gain per bit, Rician block fading one gain per message.
+
+    Attributes
+    ----------
+    channel_model : str
+        fading channel model applied to every row.
+        'bpsk-awgn-rayleigh' | 'bpsk-awgn-rice' | 'bpsk-symbol-rayleigh' |
+        'bpsk-symbol-rice' | 'bpsk-ber-rayleigh' | 'bpsk-ber-rice'
+    level : str
+        simulation level of the channel model. 'awgn' | 'symbol' | 'ber'
+    fading : str
+        fading of the channel model. 'rayleigh' | 'rice'
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator of the fading and noise samples,
+        the counter-based streams draw every row from its own stream
+    K_factor : float
+        Rician K-factor of the '*-rice' channel models
+    carrier_frequency : int
+        Carrier frequency of the modulation in [Hz]
+    sample_rate : int
+        Resolution of the sampled sine wave
+    t : np.array
+        time steps of one sine cycle
+    sine_0_phase : np.array
+        sampled sine phase with 0° phase
+    sine_180_phase : np.array
+        sampled sine phase with 180° phase
+    symbol_templates : np.array
+        sampled sine phases of the bits 0 and 1, indexed by the bit
+
+    Methods
+    -------
+    modulate(data : np.array) -> np.array
+        Modulate a bit matrix with Binary phase shift keying.
+        Symbol-level modes produce one symbol per bit.
+    simulateChannel(signal : np.array, SNRdB : np.array, lengths : np.array) -> np.array
+        Applies fading and noise to every row of the modulated signal.
+    demodulate(signal : np.array) -> np.array
+        Demodulates every row of the received signal into a bit matrix.
+    """
+
+    def __init__(self, channel_model, carrier_frequency, rng=None, K_factor=0.5):
+        """
+        Parameters
+        ----------
+        channel_model : str
+            chooses the used fading channel model.
+            'bpsk-awgn-rayleigh' | 'bpsk-awgn-rice' | 'bpsk-symbol-rayleigh' |
+            'bpsk-symbol-rice' | 'bpsk-ber-rayleigh' | 'bpsk-ber-rice'
+        carrier_frequency : int
+            Carrier frequency of the modulation in [Hz]
+        rng : np.random.Generator or RNG.CounterStreams
+            random number generator of the fading and noise samples, or the
+            streams of the rows, defaults to the module generator
+        K_factor : float
+            Rician K-factor of the '*-rice' channel models, power of the line of sight
+            over the scattered power
+        """
+
+        modulation, level, fading = (channel_model.split('-') + ['', '', ''])[:3]
+        if modulation != 'bpsk' or level not in ('awgn', 'symbol', 'ber') or fading not in ('rayleigh', 'rice'):
+            raise ValueError("Unknown channel model: " + str(channel_model))
+        self.channel_model = channel_model
+        self.level = level
+        self.fading = fading
+        self.rng = rng if rng is not None else default_rng
+        self.K_factor = K_factor
+        self.carrier_frequency = carrier_frequency
+        self.sample_rate = 48
+        carrier = carrier_table(self.carrier_frequency, self.sample_rate)
+        self.t = carrier.t
+        self.sine_0_phase = carrier.sine_0_phase
+        self.sine_180_phase = carrier.sine_180_phase
+        self.symbol_templates = carrier.symbol_templates
+
+    def modulate(self, data):
+        """
+        Modulates the bit matrix with the implemented modulation technique => BPSK
+
+        Parameters
+        ----------
+        data : np.array
+            bit matrix of shape (messages, bits)
+
+        Returns
+        -------
+        np.array
+            modulated signal of shape (messages, bits * sample_rate)
+            or (messages, bits) for symbol-level modes
+        """
+
+        if self.level != 'awgn':
+            return 2.0 * data - 1.0  # antipodal baseband symbols
+        return self.symbol_templates[data].reshape(data.shape[0], -1)
+
+    def simulateChannel(self, signal, SNRdB, lengths):
+        """
+        Simulates the transmission of every row over the channel.
+        Adds fading and noise, the noise power is normalized per row.
+        All rows are drawn at once from the channel generator. With counter-based
+        streams every row draws the same samples as alone, e.g. in the single
+        transmission channels.
+
+        Parameters
+        ----------
+        signal : np.array
+            modulated signal of shape (messages, samples)
+        SNRdB : np.array
+            signal to noise ratio in [dB] of every row
+        lengths : np.array
+            number of bits of every row, samples past this are padding
+
+        Returns
+        -------
+        np.array
+            faded noisy signal of the same shape
+        """
+
+        gamma = 10 ** (np.asarray(SNRdB, dtype=float) / 10)
+        if self.level == 'symbol':
+            return self._simulateSymbols(signal, gamma)
+        if self.level == 'ber':
+            SNRdBs, rows = np.unique(SNRdB, return_inverse=True)
+            if self.fading == 'rice':
+                # block fading, all bits of a message have the error rate of one fading sample
+                rates = np.array([bit_error_rates(self.fading, snr, self.sine_0_phase, self.K_factor) for snr in SNRdBs])
+                p = rates[rows, self.rng.integers(0, rates.shape[1], signal.shape[0])]
+            else:
+                p = np.array([bit_error_rate(self.fading, snr, self.sine_0_phase) for snr in SNRdBs])[rows]
+            # 32 bit uniform integers, the counter-based streams draw two per hash
+            flip = self.rng.integers(0, 2 ** 32, signal.shape)
+            return np.where(flip < p[:, np.newaxis] * 2 ** 32, -signal, signal)
+
+        sample_lengths = lengths * self.sample_rate
+        if np.any(sample_lengths != signal.shape[1]):
+            signal = signal * (np.arange(signal.shape[1]) < sample_lengths[:, np.newaxis])
+        # blocks of rows small enough to stay in the CPU cache during the passes over the samples
+        rows = max(1, WAVEFORM_BLOCK_SAMPLES // signal.shape[1])
+        hs = np.empty(signal.shape)
+        rng = self.rng
+        for first in range(0, signal.shape[0], rows):
+            block = slice(first, first + rows)
+            if isinstance(self.rng, RNG.CounterStreams):
+                # the streams of every block continue at the same draw as if all rows were drawn at once
+                rng = self.rng.rows(block)
+            hs[block] = self._simulateWaveform(signal[block], SNRdB[block], sample_lengths[block], rng)
+        if isinstance(self.rng, RNG.CounterStreams):
+            self.rng.stage = rng.stage
+        return hs
+
+    def _simulateWaveform(self, signal, SNRdB, sample_lengths, rng):
+        if self.channel_model == 'bpsk-awgn-rayleigh':
+            # Rayleigh flat fading samples
+            h_abs = rayleigh(signal.shape, rng)
+        else:
+            # Rician block fading, one gain per message like BPSK_AWGN_Rician_Channel,
+            # the noise refers to the transmitted power
+            h_abs = rician((signal.shape[0], 1), self.K_factor, rng)
+            SNRdB = SNRdB + 20 * np.log10(h_abs[:, 0])
+        hs = h_abs * signal  # fading effect on modulated symbols
+        awgn(SNRdB, hs, rng=rng, out=hs, lengths=sample_lengths)  # in place
+        hs /= h_abs
+        return hs
+
+    def _simulateSymbols(self, signal, gamma):
+        sigma = _symbol_noise_std(gamma, self.sine_0_phase)[:, np.newaxis]
+        table = effective_fading(self.fading, self.sine_0_phase, self.K_factor)
+        # one fading sample per bit, or per message for Rician block fading
+        shape = signal.shape if self.fading == 'rayleigh' else (signal.shape[0], 1)
+        h = table[self.rng.integers(0, table.size, shape)]
+        # only the in-phase noise affects the BPSK decision, the quadrature noise is not drawn
+        n = sigma * self.rng.standard_normal(signal.shape)
+        n += h * signal  # faded noisy baseband samples, equalizing by h > 0 would not change their sign
+        return n
+
+    def demodulate(self, signal):
+        """
+        Demodulates every row with implemented modulation technique => BPSK
+
+        Parameters
+        ----------
+        signal : np.array
+            received signal of shape (messages, samples)
+
+        Returns
+        -------
+        np.array
+            bit matrix of shape (messages, bits)
+        """
+
+        if self.level != 'awgn':
+            return (signal.real > 0).astype(np.uint8)
+        corr = signal.reshape(signal.shape[0], -1, self.sample_rate) @ self.sine_0_phase
+        # correlation with the 180° phase is exactly -corr, so a 1 is detected when corr > -corr
+        return (corr > 0).astype(np.uint8)
+
+
+def simulateBatch(channel_model, carrier_frequency, data, SNRdB, lengths, keys=None, K_factor=0.5):
+    """
+    Modulates, simulates the channel and demodulates a bit matrix with one
+    BPSK_Batch_Channel.
+
+    Parameters
+    ----------
+    channel_model : str
+        name of the channel model of all rows
+    carrier_frequency : int
+        Carrier frequency of the modulation in [Hz]
+    data : np.array
+        bit matrix of shape (messages, bits)
+    SNRdB : np.array
+        signal to noise ratio in [dB] of every row
+    lengths : np.array
+        number of bits of every row
+    keys : np.array
+        key of the random stream of every row (see RNG.streamKeys), every row
+        draws the same samples in any batch. None to draw all rows from the
+        module generator
+    K_factor : float
+        Rician K-factor of the '*-rice' channel models
+
+    Returns
+    -------
+    np.array
+        demodulated bit matrix of shape (messages, bits)
+    """
+
+    rng = None if keys is None else RNG.CounterStreams(keys)
+    channel = BPSK_Batch_Channel(channel_model, carrier_frequency, rng, K_factor)
+    modulated_data = channel.modulate(data)
+    noisy_data = channel.simulateChannel(modulated_data, SNRdB, lengths)
+    return channel.demodulate(noisy_data)
+
+
+def _simulateChunk(args):
+    # worker entry point of ChannelExecutor
+    return simulateBatch(*args)
+
+
+class ChannelExecutor:
+    """
+    Runs the channel simulations of transmission batches serially or in a
+    thread or process pool. Batches are split into chunks of rows and the
+    results are gathered in the order of the rows. Every row draws from the
+    random stream of its own key, so all backends and chunk sizes produce the
+    same results.
+
+    Attributes
+    ----------
+    backend : str
+        'serial' | 'thread' | 'process'
+    workers : int
+        number of worker threads or processes
+    chunk_size : int
+        number of messages simulated by one worker call
+
+    Methods
+    -------
+    simulate(channel_model : str, carrier_frequency : int, data : np.array, SNRdB : np.array, lengths : np.array, keys : np.array, K_factor : float) -> np.array
+        Simulates a bit matrix chunk by chunk and returns the demodulated bit matrix.
+    close()
+        Shuts the worker pool down.
+    """
+
+    def __init__(self, backend='serial', workers=None, chunk_size=256):
+        """
+        Parameters
+        ----------
+        backend : str
+            'serial' | 'thread' | 'process'
+        workers : int
+            number of worker threads or processes, defaults to the number of CPUs
+        chunk_size : int
+            number of messages simulated by one worker call
+        """
+
+        if backend not in ('serial', 'thread', 'process'):
+            raise ValueError("Unknown execution backend: " + str(backend))
+        self.backend = backend
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.pool = None
+
+    def simulate(self, channel_model, carrier_frequency, data, SNRdB, lengths, keys, K_factor=0.5):
+        chunks = [(channel_model, carrier_frequency, data[i:i + self.chunk_size], SNRdB[i:i + self.chunk_size],
+                   lengths[i:i + self.chunk_size], keys[i:i + self.chunk_size], K_factor)
+                  for i in range(0, data.shape[0], self.chunk_size)]
+        if self.backend == 'serial' or len(chunks) < 2:
+            results = [_simulateChunk(chunk) for chunk in chunks]
+        else:
+            results = list(self._getPool().map(_simulateChunk, chunks))
+        return np.concatenate(results) if results else np.zeros(data.shape, dtype=np.uint8)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def _getPool(self):
+        if self.pool is None:
+            if self.backend == 'thread':
+                self.pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+            else:
+                self.pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+        return self.pool
+
+
+def transmitBatch(transmissions, executor=None):
+    """
+    Performs the transmission cycle of many transmissions at once.
+    Transmissions are grouped by channel model, carrier frequency and K-factor and
+    every group is simulated by one BPSK_Batch_Channel, or chunk by chunk
+    by the executor. Every transmission draws from the counter-based stream of
+    its seed (see RNG.CounterStreams), so the results equal transmit() and do
+    not depend on the grouping, the chunk size or the executor.
+    The demodulated data is also stored in the received attribute of
+    every transmission.
+
+    Parameters
+    ----------
+    transmissions : list(Transmission)
+        transmissions of one simulation timestep
+    executor : ChannelExecutor
+        runs the channel simulations, None to simulate every group at once
+
+    Returns
+    -------
+    list
+        demodulated hexadecimal strings in the order of transmissions
+    """
+
+    # one pass over the transmissions per attribute, the channels only see arrays
+    groups = {}
+    for element in transmissions:
+        groups.setdefault((element.channel_model, element.carrier_frequency, element.K_factor), []).append(element)
+
+    for (channel_model, carrier_frequency, K_factor), elements in groups.items():
+        data, lengths = utils.hex_strings_to_bit_matrix([element.data for element in elements])
+        SNRdB = np.fromiter([element.SNRdB for element in elements], float, len(elements))
+        keys = RNG.streamKeys([element.seed for element in elements])
+
+        if executor is None:
+            demodulated_data = simulateBatch(channel_model, carrier_frequency, data, SNRdB, lengths, keys, K_factor)
+        else:
+            demodulated_data = executor.simulate(channel_model, carrier_frequency, data, SNRdB, lengths, keys,
+                                                 K_factor)
+
+        for element, hex_string in zip(elements, utils.bit_matrix_to_hex_strings(demodulated_data, lengths)):
+            element.received = hex_string
+    return [element.received for element in transmissions]
+
+
+class TransmissionDispatcher:
+    """
+    Buffer of the transmissions of one simulation timestep, indexed by the
+    destination id so every receiver only gets the transmissions addressed
+    to it. The channels are simulated lazily on the first delivery, and only
+    for transmissions with a registered receiver.
+
+    Attributes
+    ----------
+    receivers : set(str)
+        ids of the registered receivers
+    batches : dict(str, list(Transmission))
+        buffered transmissions per destination id
+    pending : list(Transmission)
+        transmissions to registered receivers not simulated yet
+    executor : ChannelExecutor
+        runs the channel simulations, None to simulate in this process
+
+    Methods
+    -------
+    add(transmissions : list(Transmission))
+        buffers transmissions
+    deliver(dest : str) -> list(Transmission)
+        returns and removes the simulated transmissions addressed to dest
+    clear()
+        drops all buffered transmissions
+    """
+
+    def __init__(self, receivers, executor=None):
+        """
+        Parameters
+        ----------
+        receivers : list(str)
+            ids of the receivers transmissions are delivered to
+        executor : ChannelExecutor
+            runs the channel simulations, None to simulate in this process
+        """
+
+        self.receivers = set(receivers)
+        self.batches = {}
+        self.pending = []
+        self.executor = executor
+
+    def add(self, transmissions):
+        for element in transmissions:
+            self.batches.setdefault(element.dest, []).append(element)
+            if element.dest in self.receivers:
+                self.pending.append(element)
+
+    def deliver(self, dest):
+        if self.pending:
+            transmitBatch(self.pending, self.executor)
+            self.pending = []
+        return self.batches.pop(dest, [])
+
+    def clear(self):
+        self.batches = {}
+        self.pending = []
+
+
+def awgn(SNRdB, signal, L=1, rng=None, out=None, lengths=None):
     """
     Additive White Gaussian Noise (AWGN) channel
 
-    Add AWGN noise to input signal.
+    Add AWGN noise to input signal. A 2-D signal is a batch of messages, one
+    per row, and the noise of every row is normalized to the power of that row.
+    The noise of all rows is drawn at once from rng.
+    The noise is drawn into one scratch buffer per call and added in place, so
+    with out=signal no array is allocated per message.
 
     Parameters
     ----------
-    SNRdB : int
-        desired signal to noise ratio in [dB] for the received signal
-    signal : list(float)
-        input / transmitted signal vector
+    SNRdB : int or np.array
+        desired signal to noise ratio in [dB] for the received signal,
+        per row for a 2-D signal
+    signal : np.array
+        input / transmitted signal vector, or matrix of shape (messages, samples)
     L : int
         oversampling factor (applicable for waveform simulation)
         default L = 1
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator, defaults to the module generator
+    out : np.array
+        array the noisy signal is written to, may be signal itself.
+        None to allocate a new array
+    lengths : np.array
+        number of samples of every row of a 2-D signal, samples past this are
+        padding and excluded from the power. None if all rows are complete
     
     Returns
     -------
-    list
-        list of floats with the added noise
+    np.array
+        signal with the added noise (out if given)
     """
 
-    gamma = 10 ** (SNRdB / 10)
-    if signal.ndim == 1:
-        P = L*10 * sum(abs(signal) ** 2) / len(signal)
-    else:
-        P = L*10 * sum(sum(abs(signal) ** 2)) / len(signal)
-    N0 = P / gamma  # noise spectral density
-    if np.isrealobj(signal):
-        n = np.sqrt(N0 / 2) * standard_normal(signal.shape)
-    else:
-        n = np.sqrt(N0 / 2) * (standard_normal(signal.shape) + 1j * standard_normal(signal.shape))
-    return signal + n
+    rng = rng if rng is not None else default_rng
+    signal = np.asarray(signal)
+    gamma = 10 ** (np.asarray(SNRdB, dtype=float) / 10)
+    P = L*10 * _row_power(signal, lengths)
+    N0 = P / gamma  # noise spectral density (of every row)
+    std = np.sqrt(N0 / 2)
 
+    if out is None:
+        out = np.array(signal, dtype=np.result_type(signal.dtype, np.float64))
+    elif out is not signal:
+        np.copyto(out, signal)
 
-def rayleigh(N):
+    noise = np.empty(out.shape)
+    for part in _real_parts(out):
+        rng.standard_normal(out=noise)
+        noise *= std[..., np.newaxis]
+        part += noise
+    return out
+
+
+def _row_power(signal, lengths=None):
+    # mean power of a message or of every row of a batch, over the first lengths samples.
+    # Complete rows of a batch give exactly the power of the same message alone
+    if lengths is not None and np.any(lengths != signal.shape[-1]):
+        return np.array([_row_power(row[:length]) for row, length in zip(signal, lengths)])
+    return sum(np.einsum('...i,...i->...', part, part) for part in _real_parts(signal)) / signal.shape[-1]
+
+
+def _real_parts(signal):
+    # views of the real and imaginary part of a complex signal, the signal itself if real
+    return (signal.real, signal.imag) if np.iscomplexobj(signal) else (signal,)
+
+
+def rayleigh(N, rng=None):
     """
     Generate Rayleigh flat-fading channel samples.
 
     Parameters
     ----------
-    N : int
-        number of samples to generate
+    N : int or tuple
+        number of samples or shape of the sample array to generate
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator, defaults to the module generator
     
     Returns
     -------
@@ -440,6 +1093,155 @@ def rayleigh(N):
         Rayleigh flat fading samples
     """
 
-    # 1 tap complex gaussian filter
-    h = 1 / np.sqrt(2) * (standard_normal(N) + 1j * standard_normal(N))
-    return abs(h)
+    # magnitude of a 1 tap complex gaussian filter with unit power. Its squared magnitude is
+    # exponentially distributed, one exponential sample is drawn instead of two gaussian ones
+    rng = rng if rng is not None else default_rng
+    h = rng.standard_exponential(N)
+    np.sqrt(h, out=h)
+    return h
+
+
+def rician(N, K, rng=None):
+    """
+    Generate Rician flat-fading channel samples with unit mean power.
+
+    The channel is a line of sight component with the power K / (K + 1) plus
+    a scattered complex gaussian component with the power 1 / (K + 1).
+    K = 0 is Rayleigh fading, K -> inf no fading.
+
+    Parameters
+    ----------
+    N : int or tuple
+        number of samples or shape of the sample array to generate,
+        e.g. (messages, samples) for many messages at once
+    K : float
+        Rician K-factor, power of the line of sight over the scattered power
+    rng : np.random.Generator or RNG.CounterStreams
+        random number generator, defaults to the module generator
+
+    Returns
+    -------
+    abs_h
+        Rician flat fading samples
+    """
+
+    # |sqrt(2K) + x + jy| with standard normal x and y, scaled to unit mean power.
+    # Computed in place, this is as fast as drawing the gaussian samples
+    rng = rng if rng is not None else default_rng
+    h = rng.standard_normal(N)
+    h += np.sqrt(2 * K)
+    h *= h
+    y = rng.standard_normal(N)
+    y *= y
+    h += y
+    np.sqrt(h, out=h)
+    h *= np.sqrt(1 / (2 * (K + 1)))
+    return h
+
+
+
+_effective_fading_tables = {}
+_bit_error_rates = {}
+
+
+def effective_fading(fading, sine, K_factor=0.5, N=2 ** 17):
+    """
+    Sampled distribution of the effective fading gain of one bit.
+
+    The Rayleigh waveform path fades every sample of a bit independently and
+    equalizes it before the correlation, so conditioned on the fading the
+    correlator output is gaussian with the variance sum(sine²/h²). One bit is
+    therefore equivalent to a single baseband sample with the fading gain
+    sqrt(sum(sine²) / sum(sine²/h²)). The samples are drawn once and cached,
+    from a fixed seed so every process uses the same samples.
+    The Rician waveform path fades a whole message with one gain against the
+    noise of the transmitted power, so its effective gain is the Rician gain
+    itself, shared by all bits of a message.
+
+    Parameters
+    ----------
+    fading : str
+        fading of the waveform path. 'rayleigh' | 'rice'
+    sine : np.array
+        sampled sine phase of one bit
+    K_factor : float
+        Rician K-factor, ignored for Rayleigh fading
+    N : int
+        number of samples of the distribution
+
+    Returns
+    -------
+    np.array
+        effective fading samples
+    """
+
+    key = (fading, sine.size, float(K_factor) if fading == 'rice' else 0.0)
+    if key not in _effective_fading_tables:
+        if fading == 'rayleigh':
+            weights = sine ** 2
+            h_abs = rayleigh((N, sine.size), np.random.default_rng(0))
+            _effective_fading_tables[key] = np.sqrt(np.sum(weights) / ((1 / h_abs ** 2) @ weights))
+        else:
+            _effective_fading_tables[key] = rician(N, K_factor, np.random.default_rng(0))
+    return _effective_fading_tables[key]
+
+
+def bit_error_rates(fading, SNRdB, sine, K_factor=0.5):
+    """
+    BPSK bit error rates Q(h / sigma) of every effective fading sample.
+
+    Parameters
+    ----------
+    fading : str
+        fading of the waveform path. 'rayleigh' | 'rice'
+    SNRdB : float
+        signal to noise ratio in [dB]
+    sine : np.array
+        sampled sine phase of one bit
+    K_factor : float
+        Rician K-factor, ignored for Rayleigh fading
+
+    Returns
+    -------
+    np.array
+        probability of a bit error for every sample of effective_fading()
+    """
+
+    key = (fading, float(SNRdB), sine.size, float(K_factor) if fading == 'rice' else 0.0)
+    if key not in _bit_error_rates:
+        sigma = _symbol_noise_std(10 ** (SNRdB / 10), sine)
+        table = effective_fading(fading, sine, K_factor)
+        _bit_error_rates[key] = np.array([0.5 * math.erfc(h / (sigma * math.sqrt(2))) for h in table])
+    return _bit_error_rates[key]
+
+
+def bit_error_rate(fading, SNRdB, sine, K_factor=0.5):
+    """
+    BPSK bit error rate Q(h / sigma) averaged over the effective fading.
+
+    Parameters
+    ----------
+    fading : str
+        fading of the waveform path. 'rayleigh' | 'rice'
+    SNRdB : float
+        signal to noise ratio in [dB]
+    sine : np.array
+        sampled sine phase of one bit
+    K_factor : float
+        Rician K-factor, ignored for Rayleigh fading
+
+    Returns
+    -------
+    float
+        probability of a bit error
+    """
+
+    return float(np.mean(bit_error_rates(fading, SNRdB, sine, K_factor)))
+
+
+def _symbol_noise_std(gamma, sine):
+    # the waveform path normalizes the noise to 10 times the mean power of the transmitted
+    # samples, the matched filter then averages it over the energy of one bit
+    weights = sine ** 2
+    P = 10 * np.mean(weights)
+    return np.sqrt(P / (2 * gamma) / np.sum(weights))
@@ -1,8 +1,9 @@
+import numpy as np
+
+
 def hex_string_to_bit_array(hex_string):
-    result = []
     bits = bin(int(hex_string, 16))[2:]
-    result.extend([int(b) for b in bits])
-    return result
+    return list(map(int, bits))
 
 
 def bit_array_to_hex_string(bit_arr):
@@ -90,3 +91,39 @@ def adsb_char_to_int(char):
     if char == '8': return 56
     if char == '9': return 57
     return 32
+
+
+def bit_arrays_to_bit_matrix(bit_arrs):
+    lengths = np.array([len(bit_arr) for bit_arr in bit_arrs], dtype=np.int64)
+    matrix = np.zeros((len(bit_arrs), lengths.max(initial=0)), dtype=np.uint8)
+    for row, bit_arr in zip(matrix, bit_arrs):
+        row[:len(bit_arr)] = bit_arr
+    return matrix, lengths
+
+
+def hex_strings_to_bit_matrix(hex_strings):
+    # bit matrix of the hex_string_to_bit_array() of every string, strings of the same even length with the highest
+    # bit set (e.g. all 112 bit frames) are unpacked at once
+    if hex_strings and len(hex_strings[0]) % 2 == 0 and len(set(map(len, hex_strings))) == 1:
+        data = np.frombuffer(bytes.fromhex(''.join(hex_strings)), dtype=np.uint8).reshape(len(hex_strings), -1)
+        matrix = np.unpackbits(data, axis=1)
+        if matrix.shape[1] > 0 and matrix[:, 0].all():
+            return matrix, np.full(len(hex_strings), matrix.shape[1], dtype=np.int64)
+    return bit_arrays_to_bit_matrix([hex_string_to_bit_array(hex_string) for hex_string in hex_strings])
+
+
+def bit_matrix_to_hex_strings(bit_matrix, lengths):
+    packed = np.packbits(bit_matrix, axis=1)
+    padding = packed.shape[1] * 8
+    if bit_matrix.shape[1] == padding and np.all(lengths == padding):
+        # rows without padding are converted at once, leading zeros are stripped like hex() does
+        digits = packed.tobytes().hex().upper()
+        width = 2 * packed.shape[1]
+        return [digits[i:i + width].lstrip('0') or '0' for i in range(0, len(digits), width)]
+    return [hex(int.from_bytes(row.tobytes(), 'big') >> (padding - int(length)))[2:].upper()
+            for row, length in zip(packed, lengths)]
+
+
+def hex_strings_to_byte_matrix(hex_strings, num_bytes):
+    data = b''.join(int(hex_string, 16).to_bytes(num_bytes, 'big') for hex_string in hex_strings)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(hex_strings), num_bytes)
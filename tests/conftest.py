@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the modules of the simulation import each other by their names from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import Parameters  # first, it imports Groundstation and Plane to create the configured instances
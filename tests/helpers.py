@@ -0,0 +1,31 @@
+import numpy as np
+
+import ADSB
+import Groundstation
+import Plane
+
+
+# position messages of one plane at random positions over the simulated region
+def positionMessages(numMessages, rng):
+    coder = ADSB.ADSB_coder()
+    lats = rng.uniform(9.4, 23.2, numMessages)
+    lons = rng.uniform(99.4, 116.5, numMessages)
+    return [coder.encodePosition(17, 5, "ABC123", 0, 1, 1000, lat, lon) for lat, lon in zip(lats, lons)]
+
+
+# planes flying random routes over the simulated region
+def randomPlanes(numPlanes, rng, numWaypoints=20):
+    planes = []
+    for i in range(numPlanes):
+        lons = rng.uniform(100.0, 116.0, numWaypoints + 1)
+        lats = rng.uniform(10.0, 23.0, numWaypoints + 1)
+        planes.append(Plane.Plane("Plane_" + str(i), position=(lons[0], lats[0]), speed=rng.uniform(150, 300),
+                                  waypoints=list(zip(lons[1:].tolist(), lats[1:].tolist()))))
+    return planes
+
+
+# groundstations spread over the simulated region with ranges between 50 and 370 km
+def randomGroundstations(numGroundstations, rng):
+    return [Groundstation.Groundstation("GS_" + str(i), (rng.uniform(100.0, 116.0), rng.uniform(10.0, 23.0)),
+                                        "GS_" + str(i), rng.uniform(50000, 370000))
+            for i in range(numGroundstations)]
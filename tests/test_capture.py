@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pytest
+
+import ADSB
+import Capture
+import Groundstation
+
+
+# a replayed capture decodes the same positions and CRC failures as decoding the frames one by one
+@pytest.mark.parametrize("format", ['avr', 'beast'])
+def testReplayMatchesDecodingFrames(tmp_path, format, numFrames=20000, numPlanes=100):
+    rng = np.random.default_rng(0)
+    coders = [ADSB.ADSB_coder() for _ in range(numPlanes)]
+    icaos = ["%06X" % icao for icao in rng.integers(1, 16777214, numPlanes)]
+    planes = rng.integers(0, numPlanes, numFrames).tolist()
+    frames = [coders[i].encodePositionFrame(17, 5, icaos[i], 0, 1, 10000, lat, lon)
+              for i, lat, lon in zip(planes, rng.uniform(20, 22, numFrames).tolist(),
+                                     rng.uniform(105, 107, numFrames).tolist())]
+    # every second frame with a flipped bit
+    flips = rng.integers(0, 112, numFrames).tolist()
+    frames = [frame ^ (1 << bit) * (i % 2) for i, (frame, bit) in enumerate(zip(frames, flips))]
+    times = np.arange(numFrames) * 0.5 / numPlanes
+
+    reference = Groundstation.Groundstation("Replay_ID", (106.0, 21.0), "Replay", 370000)
+    for frame, t in zip(frames, times.tolist()):
+        reference._process(reference.adsb_coder.decodeFrame(frame, True, t), t, "", False)
+
+    path = os.path.join(str(tmp_path), "capture." + format)
+    with Capture.FrameWriter(path) as writer:
+        for frame, t in zip(frames, times.tolist()):
+            writer.write(t, frame)
+    replayedTimes, replayedFrames = Capture.readFrames(path)
+    np.testing.assert_allclose(replayedTimes, times, atol=1 / Capture.CLOCK)
+    assert [int.from_bytes(row.tobytes(), 'big') for row in replayedFrames] == frames
+
+    groundstation = Groundstation.Groundstation("Replay_ID", (106.0, 21.0), "Replay", 370000)
+    Capture.replay(path, groundstation)
+    assert groundstation.numCorruptedMessagesFromPlane == reference.numCorruptedMessagesFromPlane == numFrames // 2
+    assert groundstation.numGlobalFixes == reference.numGlobalFixes
+    assert groundstation.numLocalFixes == reference.numLocalFixes
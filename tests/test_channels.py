@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import Parameters
+import Transmission
+from helpers import positionMessages
+
+
+def corruptionRate(messages, channel_model, SNRdB, K_factor=0.5):
+    seeds = np.random.SeedSequence(1).spawn(len(messages))
+    transmissions = [Transmission.Transmission(msg, "src", False, "dest", SNRdB=SNRdB, channel_model=channel_model,
+                                               carrier_frequency=Parameters.adsb_freq, K_factor=K_factor, seed=seed)
+                     for msg, seed in zip(messages, seeds)]
+    received = Transmission.transmitBatch(transmissions)
+    return np.mean([rec != element.data for rec, element in zip(received, transmissions)])
+
+
+# the symbol-level modes reproduce the message corruption rates of the sampled waveform
+@pytest.mark.parametrize("fading", ['rayleigh', 'rice'])
+@pytest.mark.parametrize("SNRdB", [6.1, 12, 20])
+def testSymbolLevelCorruptionMatchesWaveform(fading, SNRdB):
+    messages = positionMessages(2000, np.random.default_rng(0))
+    reference = corruptionRate(messages, 'bpsk-awgn-' + fading, SNRdB)
+    for level in ('symbol', 'ber'):
+        assert abs(corruptionRate(messages, 'bpsk-' + level + '-' + fading, SNRdB) - reference) <= 0.04
+
+
+# a stronger line of sight means fewer deep fades, so fewer corrupted messages
+@pytest.mark.parametrize("level", ['awgn', 'symbol', 'ber'])
+def testRicianCorruptionDecreasesWithKFactor(level):
+    messages = positionMessages(2000, np.random.default_rng(0))
+    rates = [corruptionRate(messages, 'bpsk-' + level + '-rice', 6.1, K_factor) for K_factor in (0, 2, 10)]
+    assert rates[0] > rates[1] > rates[2]
+    assert rates[0] - rates[2] > 0.1
+
+
+def testCarrierTablesAreSharedAndReadOnly():
+    table = Transmission.carrier_table(Parameters.adsb_freq, 48)
+    assert Transmission.carrier_table(Parameters.adsb_freq, 48) is table
+    with pytest.raises(ValueError):
+        table.sine_0_phase[0] = 1.0
+
+
+def testUnknownChannelModel():
+    with pytest.raises(ValueError):
+        Transmission.BPSK_Batch_Channel('bpsk-symbol-nakagami', Parameters.adsb_freq)
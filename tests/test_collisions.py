@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import Collision
+
+
+# every frame against every other frame
+def pairwiseCollisions(times, levels, frameDuration, captureRatio):
+    clear = []
+    for i in range(len(times)):
+        others = [levels[j] for j in range(len(times)) if j != i and abs(times[j] - times[i]) < frameDuration]
+        clear.append(not others or (captureRatio is not None and levels[i] >= max(others) + captureRatio))
+    return np.array(clear, dtype=bool)
+
+
+def randomFrames(rng, numFrames=3000, frameRate=2000.0):
+    return np.sort(rng.uniform(0, numFrames / frameRate, numFrames)), rng.normal(0, 6, numFrames)
+
+
+# the collision model matches the comparison of all frame pairs, with the frames of every reception window shuffled
+@pytest.mark.parametrize("captureRatio", [None, 3.0])
+def testModelMatchesPairwiseComparison(captureRatio, frameDuration=120e-6, window=0.5):
+    rng = np.random.default_rng(0)
+    times, levels = randomFrames(rng)
+    model = Collision.CollisionModel(frameDuration, captureRatio)
+    windows = np.floor(times / window)
+    clear = np.empty(len(times), dtype=bool)
+    for w in np.unique(windows):
+        frames = rng.permutation(np.flatnonzero(windows == w))
+        clear[frames] = model.resolve(times[frames], levels[frames])
+    np.testing.assert_array_equal(clear, pairwiseCollisions(times.tolist(), levels.tolist(), frameDuration,
+                                                             captureRatio))
+
+
+# without capture, the share of frames without overlap is the pure ALOHA value exp(-2 * frameRate * frameDuration)
+def testShareWithoutOverlapIsAloha(frameRate=2000.0, frameDuration=120e-6):
+    times, levels = randomFrames(np.random.default_rng(0), 200000, frameRate)
+    clear = Collision.CollisionModel(frameDuration, None).resolve(times, levels)
+    assert np.mean(clear) == pytest.approx(np.exp(-2 * frameRate * frameDuration), abs=0.01)
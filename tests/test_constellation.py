@@ -0,0 +1,52 @@
+import numpy as np
+
+import Constellation
+import Kinematics
+import Parameters
+from helpers import randomGroundstations, randomPlanes
+
+
+# satellite with the highest elevation above every receiver (objects with a position) at time t, -1 if none is
+# above Parameters.satellite_min_elevation, from the elevation of every satellite-receiver pair
+def bestByElevation(constellation, receivers, t):
+    constellation.update(t)
+    elevations = np.array([satellite.elevations(receivers) for satellite in constellation.satellites])
+    best = np.argmax(elevations, axis=0)
+    return np.where(elevations[best, np.arange(len(receivers))] >= Parameters.satellite_min_elevation, best, -1)
+
+
+def newConstellation():
+    return Constellation.Constellation(altitude=Parameters.satellite_altitude,
+                                       minElevation=Parameters.satellite_min_elevation)
+
+
+# the cached visibility equals the elevation of every satellite-plane and satellite-groundstation pair on the grid
+def testCachedVisibilityMatchesElevations(numPlanes=500, numSteps=60, timestep=10.0):
+    rng = np.random.default_rng(0)
+    planes = randomPlanes(numPlanes, rng)
+    fleet = Kinematics.Fleet(planes)
+    groundstations = randomGroundstations(20, rng)
+    constellation = newConstellation()
+    visibility = Constellation.VisibilityCache(constellation, fleet, groundstations, timestep, blockSize=numSteps // 3)
+    stations = {gs.id: i for i, gs in enumerate(groundstations)}
+    for step in range(numSteps):
+        t = step * timestep
+        for plane, position in zip(planes, fleet.positionsAt(t).tolist()):
+            plane.position = tuple(position)
+        cached = visibility.uplinkSatellites(np.full(numPlanes, t), np.arange(numPlanes))
+        np.testing.assert_array_equal(cached, bestByElevation(constellation, planes, t))
+        downlinks = [-1 if gs is None else stations[gs.id] for gs in visibility.downlinkStations(t)]
+        expected = [-1 if satellite.downlinkStation(groundstations) is None
+                    else stations[satellite.downlinkStation(groundstations).id]
+                    for satellite in constellation.satellites]
+        assert downlinks == expected
+
+
+# the satellites are back at their start above a rotated earth after one period
+def testOrbitalPeriod():
+    constellation = newConstellation()
+    period = 2 * np.pi / constellation.meanMotion
+    turned = Constellation.toPositions(constellation.directionsAt(0.0)) + [np.degrees(-Constellation.EARTH_ROTATION
+                                                                                      * period), 0]
+    deviation = Kinematics.centralAngle(Constellation.toPositions(constellation.directionsAt(period)), turned)
+    assert np.abs(deviation).max() < 1e-9
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+import ADSB
+import Kinematics
+
+
+def positionFrame(cprFormat, lon, lat):
+    coder = ADSB.ADSB_coder()
+    coder.encCprFormats["ABC123"] = 1 - cprFormat
+    return coder.encodePositionFrame(17, 5, "ABC123", 0, 1, 10000, lat, lon)
+
+
+# a single even message 7 s after the last fix is decoded relative to that fix, but only if the aircraft can have
+# flown there. 400 km is more than half a CPR zone from the fix, so the local solution is a zone off
+@pytest.mark.parametrize("distance, kept", [(2000, True), (400000, False)])
+def testLocalDecodingIsBoundedByTheFlightSinceTheLastFix(distance, kept):
+    decoder = ADSB.ADSB_coder()
+    lon, lat = 106.0, 21.0
+    decoder.decodeFrame(positionFrame(0, lon, lat), True, 105.0)
+    assert decoder.decodeFrame(positionFrame(1, lon, lat), True, 106.0).latLonDecoded
+    assert decoder.decodeFrame(positionFrame(0, lon, lat), True, 110.0).latLonDecoded
+
+    # the odd message of 106 s is too old to pair with
+    lon += math.degrees(distance / (Kinematics.EARTH_RADIUS * math.cos(math.radians(lat))))
+    msg = decoder.decodeFrame(positionFrame(0, lon, lat), True, 117.0)
+    assert msg.latLonDecoded == kept
+    if kept:
+        assert msg.decodedLocally
+        assert abs(msg.decodedLon - lon) < 1e-4
+
+
+# pairs decode to the position of the later message, also where NL(lat - 1) differs from NL(lat) - 1 zones
+@pytest.mark.parametrize("laterFormat", [0, 1])
+def testGlobalDecodingReturnsTheLaterPosition(laterFormat, numPairs=500):
+    rng = np.random.default_rng(0)
+    failures = 0
+    for lat, lon in zip(rng.uniform(-80, 80, numPairs).tolist(), rng.uniform(-179, 179, numPairs).tolist()):
+        earlier, later = positionFrame(1 - laterFormat, lon, lat - 0.002), positionFrame(laterFormat, lon, lat)
+        decoder = ADSB.ADSB_coder()
+        decoder.decodeFrame(earlier, True, 0.0)
+        msg = decoder.decodeFrame(later, True, 1.0)
+        # 20 m covers the CPR resolution but not the 220 m to the earlier position
+        if not msg.latLonDecoded or Kinematics.EARTH_RADIUS * Kinematics.centralAngle(
+                (msg.decodedLon, msg.decodedLat), (lon, lat)) > 20:
+            failures += 1
+    # pairs straddling a longitude zone transition cannot be decoded
+    assert failures <= numPairs // 100
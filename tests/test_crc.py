@@ -0,0 +1,39 @@
+import numpy as np
+
+import ADSB
+import utils
+
+
+# bit by bit polynomial division of the 88 data bits, the reference of the table-driven CRC-24
+def bitwiseCRC(msg):
+    generator = "1111111111111010000001001"
+    binMSG = bin(int(msg, 16))[2:].ljust(112, '0')
+    for i in range(88):
+        if binMSG[i] == '1':
+            xor = bin(int(binMSG[i:i + 25], 2) ^ int(generator, 2))[2:].zfill(25)
+            binMSG = binMSG[0:i] + xor + binMSG[i + 25:]
+    return "%06X" % int(binMSG[-24:], 2)
+
+
+# random 88 data bits with the first bit set (as in every DF17 frame) plus their parity
+def randomFrames(numFrames, rng):
+    coder = ADSB.ADSB_coder()
+    data = ["%X" % ((1 << 87) | int.from_bytes(rng.bytes(11), 'big')) for _ in range(numFrames)]
+    return [msg + coder.calculateCRC(msg) for msg in data]
+
+
+def testTableCRCMatchesBitwiseDivision():
+    coder = ADSB.ADSB_coder()
+    for frame in randomFrames(2000, np.random.default_rng(0)):
+        assert coder.calculateCRC(frame[:-6]) == bitwiseCRC(frame[:-6])
+
+
+def testBatchCheckDetectsSingleBitErrors():
+    rng = np.random.default_rng(0)
+    coder = ADSB.ADSB_coder()
+    # one random bit flipped in every second frame
+    frames = ["%X" % (int(frame, 16) ^ (1 << int(rng.integers(112))) * (i % 2))
+              for i, frame in enumerate(randomFrames(2000, rng))]
+    batch = coder.checkCRCBatch(utils.hex_strings_to_byte_matrix(frames, 14))
+    assert batch.tolist() == [coder.calculateCRC(frame[:-6]) == frame[-6:] for frame in frames]
+    assert batch[::2].all() and not batch[1::2].any()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import Parameters
+import RNG
+import Transmission
+from helpers import positionMessages
+
+
+def seededTransmissions(messages, seed, channel_model='bpsk-awgn-rayleigh'):
+    rng = RNG.RNGService(seed)
+    return [Transmission.Transmission(msg, "src", False, "dest", SNRdB=6.1, channel_model=channel_model,
+                                      carrier_frequency=Parameters.adsb_freq, seed=rng.nextSeed('link', "src", "dest"))
+            for msg in messages]
+
+
+# the thread and process pools receive the same data as the serial execution of the same chunks
+@pytest.mark.parametrize("backend", ['thread', 'process'])
+def testBackendsAreBitIdentical(backend):
+    messages = positionMessages(600, np.random.default_rng(0))
+    serial = Transmission.transmitBatch(seededTransmissions(messages, 1), Transmission.ChannelExecutor('serial',
+                                                                                                      chunk_size=100))
+    executor = Transmission.ChannelExecutor(backend, 2, 100)
+    try:
+        assert Transmission.transmitBatch(seededTransmissions(messages, 1), executor) == serial
+    finally:
+        executor.close()
+
+
+# every transmission draws from its own stream, so neither the batch nor its chunks change the received data
+@pytest.mark.parametrize("channel_model", ['bpsk-awgn-rayleigh', 'bpsk-awgn-rice', 'bpsk-symbol-rayleigh',
+                                           'bpsk-symbol-rice', 'bpsk-ber-rayleigh', 'bpsk-ber-rice'])
+def testBatchesReceiveTheDataOfSingleTransmissions(channel_model):
+    messages = positionMessages(300, np.random.default_rng(0))
+    messages[::3] = [msg[:14] for msg in messages[::3]]  # short 56 bit frames are padded in the batch
+    single = [element.transmit() for element in seededTransmissions(messages, 1, channel_model)]
+    assert single != [element.data for element in seededTransmissions(messages, 1, channel_model)]
+    assert Transmission.transmitBatch(seededTransmissions(messages, 1, channel_model)) == single
+    for chunk_size in (1, 7, 100):
+        executor = Transmission.ChannelExecutor('serial', chunk_size=chunk_size)
+        assert Transmission.transmitBatch(seededTransmissions(messages, 1, channel_model), executor) == single
+
+
+def testSeedsReproduceTheReceivedData():
+    messages = positionMessages(200, np.random.default_rng(0))
+    first = Transmission.transmitBatch(seededTransmissions(messages, 1))
+    assert Transmission.transmitBatch(seededTransmissions(messages, 1)) == first
+    assert Transmission.transmitBatch(seededTransmissions(messages, 2)) != first
+
+
+def testUnknownBackend():
+    with pytest.raises(ValueError):
+        Transmission.ChannelExecutor('gpu')
@@ -0,0 +1,39 @@
+import numpy as np
+
+import Kinematics
+import Parameters
+from helpers import randomPlanes
+
+
+# planes stepped one by one with Plane.updatePos, stepped as a fleet and looked up at the same time on the
+# arc-length tables are at the same positions on the same tracks, and the waypoint lists are unchanged
+def testFleetMatchesPlanes():
+    planes = randomPlanes(20, np.random.default_rng(0))
+    waypoints = [list(plane.waypoints) for plane in planes]
+    fleet = Kinematics.Fleet(planes)
+    reference = Kinematics.Fleet(planes)
+    for step in range(1, 2001):
+        fleet.updatePos(Parameters.sim_timestep)
+        for plane in planes:
+            plane.updatePos(Parameters.sim_timestep)
+        positions = np.array([plane.position for plane in planes])
+        np.testing.assert_allclose(fleet.positions, positions, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(reference.positionsAt(step * Parameters.sim_timestep), positions, rtol=0, atol=1e-9)
+        flying = ~fleet.atDestination()
+        np.testing.assert_allclose(reference.tracksAt(step * Parameters.sim_timestep)[flying],
+                                   np.array([plane.track for plane in planes])[flying], rtol=0, atol=1e-6)
+    assert [plane.waypoints for plane in planes] == waypoints
+    assert [plane.atDestination() for plane in planes] == fleet.atDestination().tolist()
+
+
+# geodesic segment lengths only change the timing, the path between the waypoints is the same great circle
+def testGeodesicRoutesOnlyChangeTheTiming():
+    waypoints = [(110.0, 15.0), (116.0, 22.0), (100.5, 10.5)]
+    spherical = Kinematics.Route((101.0, 11.0), waypoints)
+    geodesic = Kinematics.Route((101.0, 11.0), waypoints, geodesic=True)
+    assert 0 < abs(geodesic.length - spherical.length) < 0.005 * spherical.length
+    # the same fraction of every segment flown
+    segments = np.linspace(0, 3, 301)
+    np.testing.assert_allclose(geodesic.positionAt(np.interp(segments, range(4), geodesic.distances)),
+                               spherical.positionAt(np.interp(segments, range(4), spherical.distances)),
+                               rtol=0, atol=1e-9)
@@ -0,0 +1,13 @@
+import numpy as np
+
+import ADSB
+
+
+# the table lookup of the number of longitude zones (scalar and vectorized) equals the trigonometric definition on a
+# latitude sweep and directly at and next to every transition latitude
+def testNLTableMatchesTrigonometricDefinition():
+    lats = np.concatenate([np.linspace(-90, 90, 200001), ADSB.NL_TRANSITIONS_NP, -ADSB.NL_TRANSITIONS_NP,
+                           np.nextafter(ADSB.NL_TRANSITIONS_NP, 0), np.nextafter(ADSB.NL_TRANSITIONS_NP, 90)])
+    reference = [ADSB._trigonometricNL(lat) for lat in lats.tolist()]
+    assert [ADSB.calculateNL(lat) for lat in lats.tolist()] == reference
+    assert ADSB.calculateNLArray(lats).tolist() == reference
@@ -0,0 +1,15 @@
+import numpy as np
+
+import SpatialIndex
+from helpers import randomGroundstations, randomPlanes
+
+
+# the spatial index with geodesic refinement finds the same groundstations as Plane.inRange
+def testIndexMatchesPlaneInRange():
+    rng = np.random.default_rng(0)
+    groundstations = randomGroundstations(100, rng)
+    planes = randomPlanes(500, rng, 1)
+    index = SpatialIndex.ReceiverIndex(groundstations, geodesic=True)
+    receivers = index.receiversInRange([plane.position for plane in planes])
+    for plane, found in zip(planes, receivers):
+        assert found == plane.receiversInRange(groundstations)
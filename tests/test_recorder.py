@@ -0,0 +1,34 @@
+import numpy as np
+
+import Recorder
+
+
+def recordTruth(directory, numRows, chunkSize):
+    rng = np.random.default_rng(0)
+    rows = list(zip(np.arange(numRows, dtype=float).tolist(), ["%06x" % (i % 100) for i in range(numRows)],
+                    rng.uniform(99.4, 116.5, numRows).tolist(), rng.uniform(9.4, 23.2, numRows).tolist()))
+    recorder = Recorder.Recorder(directory, chunkSize)
+    for row in rows:
+        recorder.record('truth', *row)
+    recorder.flush()
+    return rows
+
+
+def readTruth(directory):
+    chunks = list(Recorder.readChunks(directory, 'truth'))
+    return list(zip(*(np.concatenate([chunk[column] for chunk in chunks]).tolist() for column in
+                      ('time', 'icao', 'lon', 'lat'))))
+
+
+# every recorded row is read back unchanged, over several segments
+def testRowsAreReadBackUnchanged(tmp_path):
+    rows = recordTruth(str(tmp_path), 10000, 4096)
+    assert len(Recorder.segments(str(tmp_path), 'truth')) == 3
+    assert readTruth(str(tmp_path)) == rows
+
+
+# a new recording replaces an earlier one in the same directory
+def testRecordingReplacesEarlierSegments(tmp_path):
+    recordTruth(str(tmp_path), 10000, 4096)
+    rows = recordTruth(str(tmp_path), 1000, 4096)
+    assert readTruth(str(tmp_path)) == rows
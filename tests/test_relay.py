@@ -0,0 +1,33 @@
+import pytest
+
+import ADSB
+import CommSat
+import Groundstation
+import Parameters
+import Transmission
+
+
+def testDecodingNeedsTheTimestamp():
+    frame = ADSB.ADSB_coder().encodePositionFrame(17, 5, "ABC123", 0, 1, 1000, 21.0, 106.0)
+    with pytest.raises(ValueError):
+        ADSB.ADSB_coder().decodeFrame(frame, True)
+
+
+# relayed frames are paired at the times the aircraft sent them, however late the downlink is
+def testRelayedFramesKeepTheTransmitTime(monkeypatch):
+    monkeypatch.setattr(Parameters, 'satellite_to_groundstation_channel_model', 'bpsk-ber-rayleigh')
+    monkeypatch.setattr(Parameters, 'satellite_to_groundstation_SNRdB', 100)
+    satellite = CommSat.CommSat("Sat_ID", position=(106.0, 21.0))
+    groundstation = Groundstation.Groundstation("GS_ID", (106.5, 21.5), "GS", 370000)
+    coder = ADSB.ADSB_coder()
+    for sent in (1.0, 2.0):
+        frame = coder.encodePosition(17, 5, "ABC123", 0, 1, 1000, 21.0, 106.0)
+        satellite.receive([Transmission.Transmission(frame, "Plane_ID", False, satellite.id, SNRdB=100,
+                                                     channel_model='bpsk-ber-rayleigh', time=sent)])
+
+    first = satellite.transmit([groundstation], 30.0, 0.01)
+    second = satellite.transmit([groundstation], 60.0)
+    assert [(element.time, element.origin_time) for element in first + second] == [(30.0, 1.0), (60.0, 2.0)]
+    groundstation.receive(first, 30.0)
+    groundstation.receive(second, 60.0)
+    assert groundstation.numGlobalFixes == 1
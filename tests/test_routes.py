@@ -0,0 +1,30 @@
+import os
+
+import numpy as np
+
+import Routes
+
+
+def writeTracks(directory, rng, numTracks=50, numPoints=100):
+    tracks = {}
+    for i in range(numTracks):
+        points = rng.uniform((99.4, 9.4), (116.5, 23.2), (numPoints, 2))
+        with open(os.path.join(directory, "track%d.csv" % i), "w") as file:
+            file.write("Timestamp,UTC,Callsign,Position,Altitude,Speed,Direction\n")
+            for t, (lon, lat) in enumerate(points.tolist()):
+                file.write('%d,,TEST,"%r,%r",10000,450,0\n' % (t, lat, lon))
+        tracks["track%d" % i] = points
+    return tracks
+
+
+# flightradar24 CSV tracks give the same routes parsed and memory-mapped from the cache
+def testCachedRoutesEqualParsedTracks(tmp_path):
+    tracks = writeTracks(str(tmp_path), np.random.default_rng(0))
+    parsed = Routes.RouteStore(str(tmp_path))
+    cached = Routes.RouteStore(str(tmp_path))
+    assert sorted(parsed.names) == sorted(tracks)
+    for name, points in tracks.items():
+        np.testing.assert_array_equal(parsed.route(name), points)
+        np.testing.assert_array_equal(cached.route(name), points)
+    np.testing.assert_array_equal(cached.route("track0", "track1"), np.concatenate([tracks["track0"],
+                                                                                    tracks["track1"]]))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import Parameters
+import Plane
+import Scheduler
+
+
+# squitters scheduled with the configured rates and jitter and popped one reception window at a time arrive in time
+# order at the mean rate of their type
+def testSquittersArriveAtTheirRates(numPlanes=1000, duration=20.0, window=0.5):
+    rng = np.random.default_rng(0)
+    scheduler = Scheduler.EventScheduler()
+    for i in range(numPlanes):
+        for kind, rate in Parameters.squitter_rates.items():
+            scheduler.schedule(rng.uniform(0, 1 / rate), (kind, i))
+
+    counts = dict.fromkeys(Parameters.squitter_rates, 0)
+    t = 0.0
+    while t < duration:
+        times = []
+        for eventTime, (kind, i) in scheduler.popUntil(t + window):
+            assert eventTime < t + window
+            times.append(eventTime)
+            counts[kind] += 1
+            interval = (1 + Parameters.squitter_jitter * rng.uniform(-1, 1)) / Parameters.squitter_rates[kind]
+            scheduler.schedule(eventTime + interval, (kind, i))
+        assert times == sorted(times)
+        t += window
+    for kind, rate in Parameters.squitter_rates.items():
+        assert counts[kind] / (numPlanes * duration) == pytest.approx(rate, rel=0.02)
+
+
+# the squitter rates of a plane override the configured rates of their types, unknown types are rejected
+def testPlanesOverrideTheSquitterRates():
+    plane = Plane.Plane("Plane_ID", squitterRates={'position': 1.0, 'velocity': 0.0})
+    assert plane.squitterRates == dict(Parameters.squitter_rates, position=1.0, velocity=0.0)
+    assert Plane.Plane("Plane_ID_2").squitterRates == Parameters.squitter_rates
+    with pytest.raises(ValueError):
+        Plane.Plane("Plane_ID_3", squitterRates={'surface': 1.0})
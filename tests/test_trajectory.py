@@ -0,0 +1,33 @@
+import numpy as np
+
+import Trajectory
+
+
+# the trajectories hold the positions of every ICAO address in the order they were appended
+def testTrajectoriesGroupPositionsPerICAO(numPlanes=50, numPoints=500):
+    rng = np.random.default_rng(0)
+    icaos = ["%06x" % icao for icao in rng.integers(1, 16777214, numPlanes)]
+    positions = rng.uniform(0, 1, (numPoints, numPlanes, 2))
+    trajectories = Trajectory.Trajectories(capacity=4)
+    for step in positions.tolist():
+        for (lon, lat), icao in zip(step, icaos):
+            trajectories.append(lon, lat, icao)
+    assert len(trajectories) == numPlanes * numPoints
+    assert trajectories.icaos() == icaos
+    for i, icao in enumerate(icaos):
+        np.testing.assert_array_equal(trajectories.trajectory(icao), positions[:, i])
+        assert len(trajectories.trajectory(icao, 120)) <= 120
+
+
+def testExtendEqualsAppend():
+    rng = np.random.default_rng(0)
+    lons, lats = rng.uniform(0, 1, (2, 1000))
+    icaos = rng.choice(["A", "B", "C"], 1000)
+    appended = Trajectory.Trajectories()
+    for lon, lat, icao in zip(lons.tolist(), lats.tolist(), icaos.tolist()):
+        appended.append(lon, lat, icao)
+    extended = Trajectory.Trajectories()
+    extended.extend(lons[:300], lats[:300], icaos[:300])
+    extended.extend(lons[300:], lats[300:], icaos[300:])
+    for icao in "ABC":
+        np.testing.assert_array_equal(extended.trajectory(icao), appended.trajectory(icao))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import ADSB
+import Plane
+
+
+# airborne velocity frame of the ICAO / pyModeS examples: 159 kt at 182.88 deg, descending at 832 ft/min
+def testReferenceVelocityFrame():
+    msg = ADSB.ADSB_coder().decode("8D485020994409940838175B284F", True, 0.0)
+    assert isinstance(msg, ADSB.ADSB_velocity_msg)
+    assert (msg.subtype, msg.velocityEW, msg.velocityNS, msg.verticalRate) == (1, -8, -159, -832)
+    assert msg.groundSpeed() == pytest.approx(159.2, abs=0.01)
+    assert msg.track() == pytest.approx(182.88, abs=0.01)
+
+
+# the velocity squitter of a plane decodes to its speed and its track along the route, to the 1 kt resolution
+@pytest.mark.parametrize("waypoint, track", [((106.0, 22.0), 0.0), ((108.0, 21.0), 89.64), ((105.0, 20.0), 223.3)])
+def testVelocitySquittersCarryTheTrack(waypoint, track):
+    plane = Plane.Plane("Plane_ID", position=(106.0, 21.0), speed=250, waypoints=[waypoint])
+    msg = ADSB.ADSB_coder().decode(plane.encodeSquitter('velocity'), True, 0.0)
+    assert msg.ICAOaddress == plane.ICAO.upper()
+    assert msg.groundSpeed() == pytest.approx(250 / Plane.KNOT, abs=1.5)
+    assert msg.track() == pytest.approx(track, abs=0.5)
+    assert msg.verticalRate == 0
+
+
+# supersonic ground speeds use subtype 2 with 4 kt steps
+def testSupersonicVelocity():
+    coder = ADSB.ADSB_coder()
+    msg = coder.decodeFrame(coder.encodeVelocityFrame(17, 5, "ABC123", 1200, -400, 3000), True, 0.0)
+    assert (msg.subtype, msg.velocityEW, msg.velocityNS, msg.verticalRate) == (2, 1200, -400, 3008)
+
+
+def testVelocitiesAreForgottenLikeThePositions():
+    coder = ADSB.ADSB_coder(cprTTL=10.0)
+    coder.decode(coder.encodeVelocity(17, 5, "ABC123", 100, 200), True, 0.0)
+    assert "ABC123" in coder.velocities
+    coder.decode(coder.encodeVelocity(17, 5, "DEF456", 100, 200), True, 20.0)
+    assert list(coder.velocities) == ["DEF456"]